@@ -0,0 +1,312 @@
+"""
+date 2026.10.19
+branch master
+file allpairs.py
+
+全デマンド(またはデマンドのリスト)についてdirected_link.directed_pathsを
+複数のプロセスで並列に計算する
+
+GraphSet.set_universeはプロセス全体で共有される状態なので、
+ワーカープロセスごとに初期化時に1回だけユニバースを設定する
+
+
+# 動作概要
+1. 各デマンドの計算量をestimateで見積もり、大きいものから順にワーカーに渡す
+   デフォルトではスタートノードからターゲットノードへの最小ホップ数を見積もりとする
+2. ワーカーはinit_workerでedgelistを読み込みユニバースを設定する
+3. 結果は以下のいずれかの形式で返す
+   * "count"
+     パスの本数
+   * "dumps"
+     GraphSet.dumps()で直列化したパス集合
+     親プロセスで同じユニバースを設定してGraphSet.loads()で復元する
+   * "topk"
+     重みの小さい順にk本のパスを元のグラフのパスに変換したもの
+
+## 対称性の利用
+"count"と"topk"では対称なデマンドの計算を省略する
+* 逆向きの対称性
+  すべてのリンク(i,j,cost)に対して(j,i,cost)が存在するとき、t->sのパスはs->tのパスを逆にたどったものとなる
+* グラフの自己同型(use_automorphisms=True)
+  重みを保存するノードの置き換えgに対して、g(s)->g(t)のパスはs->tのパスのノードを置き換えたものとなる
+デマンドを対称性で移りあう軌道に分け、軌道ごとに代表のデマンドだけを計算する
+残りのデマンドの結果はパスのノードを置き換え、必要なら逆にたどって求める
+"topk"で重みが等しいパスの順序は直接計算した場合と異なることがある
+"dumps"では対称性を利用しない
+
+
+# 使い方
+results = all_pairs(edgelist, traffic, mode="count", processes=4)
+"""
+
+from collections import defaultdict, deque
+from functools import partial
+from itertools import permutations
+from multiprocessing import Pool
+
+from graphillion import GraphSet
+import networkx as nx
+from networkx.algorithms import isomorphism
+import proposal_packages.directed_link as dl
+from proposal_packages.protection import ordered_path
+
+# ワーカープロセスで使う辺の重み
+_metric = None
+
+def init_worker(edgelist):
+    """
+    edgelistを読み込んでユニバースを設定する
+    プロセスプールの初期化関数として使う
+
+    arguments:
+    * edgelist(list)
+    """
+    global _metric
+    dl.read_edgelist(edgelist)
+    GraphSet.set_universe(dl.append_virtual_nodes())
+    _metric = {(i,j): cost for i,j,cost in dl.append_virtual_nodes()}
+
+def count_paths(start_node, target_node):
+    """
+    有向パスの本数を返す
+    """
+    return dl.directed_paths(start_node, target_node).len()
+
+def dump_paths(start_node, target_node):
+    """
+    有向パスのグラフセットをGraphSet.dumps()で直列化して返す
+    """
+    return dl.directed_paths(start_node, target_node).dumps()
+
+def top_paths(start_node, target_node, k):
+    """
+    重みの小さい順にk本の有向パスを返す
+
+    returns:
+    * paths(list)
+      タプル(path, cost)を要素とするリスト
+      pathは元のグラフの辺をスタートノードから順に並べたリスト
+    """
+    paths = []
+    for path in dl.directed_paths(start_node, target_node).min_iter(_metric):
+        if len(paths) == k:
+            break
+        paths.append((ordered_path(dl.original_path(path), start_node),
+                      dl.total_cost(_metric, path)))
+    return paths
+
+MODES = {"count": count_paths, "dumps": dump_paths, "topk": top_paths}
+
+def is_symmetric(edgelist):
+    """
+    すべてのリンク(i,j,cost)に対して同じ重みの逆向きのリンク(j,i,cost)が存在するかを返す
+    """
+    costs = {(i,j): cost for i,j,cost in edgelist}
+    return all(costs.get((j,i)) == cost for (i,j),cost in costs.items())
+
+def automorphisms(edgelist, limit=None):
+    """
+    リンクの重みを保存するグラフの自己同型を返す
+
+    arguments:
+    * edgelist(list)
+    * limit(int, optional)
+      求める自己同型の数の上限
+
+    returns:
+    * mappings(list)
+      ノードの置き換えを表す辞書を要素とするリスト
+    """
+    G = nx.DiGraph()
+    G.add_weighted_edges_from(edgelist)
+    matcher = isomorphism.DiGraphMatcher(G, G,
+                                         edge_match=isomorphism.numerical_edge_match("weight", 0))
+    mappings = []
+    for mapping in matcher.isomorphisms_iter():
+        mappings.append(mapping)
+        if limit is not None and len(mappings) >= limit:
+            break
+    return mappings
+
+def orbits(traffic, mappings, reverse):
+    """
+    デマンドを対称性で移りあう軌道に分ける
+
+    arguments:
+    * traffic(list)
+    * mappings(list)
+      ノードの置き換えを表す辞書を要素とするリスト
+    * reverse(bool)
+      逆向きの対称性を使うかどうか
+
+    returns:
+    * orbit(dict)
+      key: 代表のデマンド(s,t)
+      value: タプル(demand, mapping, reversed)を要素とするリスト
+             demandは代表のパスをmappingで置き換え、reversedならば逆にたどって得られる
+    """
+    demands = set(traffic)
+    assigned = set()
+    orbit = {}
+    for s,t in traffic:
+        if (s,t) in assigned:
+            continue
+        orbit[(s,t)] = []
+        for mapping in mappings:
+            images = [((mapping[s], mapping[t]), False)]
+            if reverse:
+                images.append(((mapping[t], mapping[s]), True))
+            for demand, reversed_ in images:
+                if demand in demands and demand not in assigned:
+                    assigned.add(demand)
+                    orbit[(s,t)].append((demand, mapping, reversed_))
+    return orbit
+
+def transform_path(path, mapping, reversed_):
+    """
+    元のグラフのパスのノードをmappingで置き換え、reversed_ならば逆にたどったパスを返す
+    """
+    path = [(mapping[i], mapping[j]) for i,j in path]
+    if reversed_:
+        path = [(j,i) for i,j in reversed(path)]
+    return path
+
+def hop_estimate(edgelist):
+    """
+    デマンドの計算量の見積もりとして最小ホップ数を返す関数を作る
+
+    arguments:
+    * edgelist(list)
+
+    returns:
+    * estimate(function)
+      estimate(s, t)で最小ホップ数を返す。到達できないときは0
+    """
+    succ = defaultdict(list)
+    for i,j,cost in edgelist:
+        succ[i].append(j)
+    distances = {}
+
+    def estimate(start_node, target_node):
+        if start_node not in distances:
+            dist = {start_node: 0}
+            queue = deque([start_node])
+            while queue:
+                u = queue.popleft()
+                for v in succ[u]:
+                    if v not in dist:
+                        dist[v] = dist[u] + 1
+                        queue.append(v)
+            distances[start_node] = dist
+        return distances[start_node].get(target_node, 0)
+
+    return estimate
+
+def schedule(traffic, estimate):
+    """
+    見積もりの大きい順にデマンドを並べる
+    """
+    return sorted(traffic, key=lambda demand: estimate(demand[0], demand[1]), reverse=True)
+
+def _call(task):
+    func, s, t = task
+    return (s,t), func(s, t)
+
+def run(edgelist, traffic, func, processes=None, estimate=None):
+    """
+    すべてのデマンドについてfunc(s, t)を計算し、終わった順に結果を返すジェネレータ
+
+    arguments:
+    * edgelist(list)
+    * traffic(list)
+      タプル(s,t)を要素とするリスト
+    * func(function)
+      func(s, t)の形で呼び出す関数
+      processesを指定するときはpickleできる関数(モジュールのトップレベルの関数かそのpartial)とする
+    * processes(int, optional)
+      2以上を指定するとプロセスプールで計算する
+      指定しないときはこのプロセスでinit_workerを実行してユニバースを設定し直す
+      funcが例外を出したときやジェネレータを途中で閉じたときは、残りのデマンドを待たずに
+      ワーカープロセスを終了する
+    * estimate(function, optional)
+      estimate(s, t)でデマンドの計算量の見積もりを返す関数
+      指定しないときはhop_estimate(edgelist)を使う
+
+    yields:
+    * ((s,t), result)(tuple)
+    """
+    if estimate is None:
+        estimate = hop_estimate(edgelist)
+    tasks = [(func, s, t) for s,t in schedule(traffic, estimate)]
+    if processes is None or processes < 2:
+        init_worker(edgelist)
+        for task in tasks:
+            yield _call(task)
+        return
+
+    # 初期化関数が例外を出すとPoolはワーカーを作り直し続けるので、親プロセスで先に確かめる
+    dl.read_edgelist(edgelist)
+    dl.append_virtual_nodes()
+    pool = Pool(processes, initializer=init_worker, initargs=(edgelist,))
+    try:
+        for result in pool.imap_unordered(_call, tasks, chunksize=1):
+            yield result
+    except BaseException:
+        # 例外や途中で打ち切られたとき(GeneratorExit)は残りのデマンドを待たずに終了する
+        pool.terminate()
+        pool.join()
+        raise
+    pool.close()
+    pool.join()
+
+def all_pairs(edgelist, traffic=None, mode="count", k=10, processes=None, estimate=None,
+              symmetry=True, use_automorphisms=False, automorphisms_limit=None):
+    """
+    すべてのデマンドの有向パスを求める
+
+    arguments:
+    * edgelist(list)
+    * traffic(list, optional)
+      指定しないときはすべてのノードの組(s,t)とする
+    * mode(string, optional)
+      "count", "dumps", "topk"のいずれか
+    * k(int, optional)
+      mode="topk"のときに返すパスの本数
+    * processes(int, optional)
+    * estimate(function, optional)
+    * symmetry(bool, optional)
+      Trueのとき逆向きの対称性を検出して利用する
+    * use_automorphisms(bool, optional)
+      Trueのときグラフの自己同型も利用する
+    * automorphisms_limit(int, optional)
+      利用する自己同型の数の上限
+
+    returns:
+    * results(dict)
+      key: (s,t)
+      value: modeに応じた結果
+    """
+    if traffic is None:
+        nodes = sorted({i for i,j,cost in edgelist} | {j for i,j,cost in edgelist})
+        traffic = list(permutations(nodes, 2))
+    func = MODES[mode]
+    if mode == "topk":
+        func = partial(func, k=k)
+    if mode == "dumps" or not (symmetry or use_automorphisms):
+        return dict(run(edgelist, traffic, func, processes, estimate))
+
+    nodes = {i for i,j,cost in edgelist} | {j for i,j,cost in edgelist}
+    mappings = [{node: node for node in nodes}]
+    if use_automorphisms:
+        mappings += automorphisms(edgelist, automorphisms_limit)
+    orbit = orbits(traffic, mappings, symmetry and is_symmetric(edgelist))
+
+    results = {}
+    for (s,t), result in run(edgelist, list(orbit.keys()), func, processes, estimate):
+        for demand, mapping, reversed_ in orbit[(s,t)]:
+            if mode == "topk":
+                results[demand] = [(transform_path(path, mapping, reversed_), cost)
+                                   for path,cost in result]
+            else:
+                results[demand] = result
+    return results
@@ -0,0 +1,289 @@
+"""
+date 2026.10.19
+branch master
+file block_cut.py
+
+2連結成分分解(ブロック・カット木)を使って有向パスを列挙する
+
+スタートノードsからターゲットノードtへの単純パスは、ブロック・カット木でsのブロックから
+tのブロックまでの経路上にあるすべての関節点を通り、経路上のブロックの外には出ない
+したがってs,t間のパス集合は、経路上の各ブロックで入口の関節点から出口の関節点までの
+パス集合の直積となる
+directed_link.directed_pathsはユニバース全体で1個のZDDを作るが、このモジュールでは
+経路上のブロックごとに小さいユニバースでパスを列挙する
+
+
+# 動作概要
+1. 元のグラフを無向グラフとみなしてブロック・カット木を求める(トポロジーごとに1回)
+2. ブロック・カット木上のsからtへの経路からブロックと入口、出口の組の列を求める
+3. 各ブロックの辺だけを使ったユニバースでdirected_pathsを実行する
+   ブロックのパス集合はdumps()で直列化してキャッシュし、ユニバースはtraversal="as-is"で設定し直す
+   本数はパス集合のlen()で求めるので、パスを1本も取り出さない
+   2ノードのブロック(橋)ではユニバースを設定せずにリンクの有無だけを調べる
+4. 元のグラフのユニバースへの変換
+   ブロックの辺は元のグラフのユニバースの辺と同じタプル(仮想ノードも同じラベル)になる
+   元のグラフのユニバースの辺の順序をブロックの辺だけに制限したユニバース(traversal="as-is")で
+   パス集合を求めると、dumps()の各ZDDノードの変数の番号を元のユニバースでの番号に
+   置き換えるだけで、パスを取り出さずに元のユニバースのグラフセットにできる
+5. 結果は以下の形式で返す
+   * count(s, t)
+     ブロックごとのパスの本数の積
+   * graphset(s, t)
+     ブロックごとのグラフセットを元のユニバースに変換してGraphSet.joinで合成したグラフセット
+   * iter_paths(s, t)
+     ブロックごとのグラフセットを入れ子のジェネレータで1本ずつ取り出して連結するイテレータ
+     内側のブロックのグラフセットは外側のパスごとに先頭から取り出し直す
+graphset, iter_pathsの呼び出し時のユニバースはdirected_link.append_virtual_nodes()で設定したものとする
+各メソッドは終了時に呼び出し前のユニバースとdirected_link.edgelistを設定し直す
+
+
+# 使い方
+1. directed_link.read_edgelist(edgelist)を実行する
+2. GraphSet.set_universe(directed_link.append_virtual_nodes())を実行する
+3. tree = BlockCutTree(edgelist)を作成する
+4. tree.count(s, t), tree.iter_paths(s, t), tree.graphset(s, t)を実行する
+"""
+
+from contextlib import contextmanager
+from functools import reduce
+import operator
+
+import networkx as nx
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+from proposal_packages.protection import ordered_path
+
+@contextmanager
+def _preserve_universe():
+    universe = GraphSet.universe()
+    edgelist = getattr(dl, "edgelist", None)
+    try:
+        yield
+    finally:
+        if universe:
+            GraphSet.set_universe(universe, traversal="as-is")
+        if edgelist is not None:
+            dl.read_edgelist(edgelist)
+
+class BlockCutTree:
+    """
+    BlockCutTreeクラスは以下の属性を持つ
+    * edgelist
+    * blocks
+      各ブロックのノードの集合を要素とするリスト
+    * cut_nodes
+      関節点の集合
+    * tree
+      ブロック・カット木(networkx.Graph)
+      ノードはブロックを表す("B", k)と関節点を表す("C", node)
+    """
+
+    def __init__(self, edgelist):
+        self.edgelist = edgelist
+        G = nx.Graph()
+        G.add_edges_from((i, j) for i,j,cost in edgelist)
+        self.blocks = [set(block) for block in nx.biconnected_components(G)]
+        self.cut_nodes = set(nx.articulation_points(G))
+        self.tree = nx.Graph()
+        self.__block_of = {}
+        for k, block in enumerate(self.blocks):
+            self.tree.add_node(("B", k))
+            for node in block:
+                if node in self.cut_nodes:
+                    self.tree.add_edge(("B", k), ("C", node))
+                else:
+                    self.__block_of[node] = k
+        self.__edgelists = [[] for _ in self.blocks]
+        block_index = {}
+        for k, block in enumerate(self.blocks):
+            for i in block:
+                for j in G[i]:
+                    if j in block:
+                        block_index[(i,j)] = k
+        for i,j,cost in edgelist:
+            self.__edgelists[block_index[(i,j)]].append((i, j, cost))
+        self.__universes = {}
+        self.__dumped = {}
+        self.__aligned = {}
+        self.__counts = {}
+
+    def _tree_node(self, node):
+        if node in self.cut_nodes:
+            return ("C", node)
+        return ("B", self.__block_of[node])
+
+    def chain(self, start_node, target_node):
+        """
+        sからtへのパスが通るブロックと入口、出口の組の列を返す
+
+        returns:
+        * chain(list)
+          タプル(k, entry, exit)を要素とするリスト
+          sとtが連結でないときはNone
+        """
+        try:
+            route = nx.shortest_path(self.tree, self._tree_node(start_node),
+                                     self._tree_node(target_node))
+        except nx.NetworkXNoPath:
+            return None
+        blocks = [k for kind,k in route if kind == "B"]
+        cuts = [node for kind,node in route if kind == "C" and node not in (start_node, target_node)]
+        entries = [start_node] + cuts
+        exits = cuts + [target_node]
+        return list(zip(blocks, entries, exits))
+
+    def block_edgelist(self, k):
+        """
+        ブロックkの辺のリストを返す
+        """
+        return self.__edgelists[k]
+
+    def _activate(self, k):
+        dl.read_edgelist(self.__edgelists[k])
+        if k not in self.__universes:
+            GraphSet.set_universe(dl.append_virtual_nodes())
+            self.__universes[k] = GraphSet.universe()
+        else:
+            GraphSet.set_universe(self.__universes[k], traversal="as-is")
+
+    def _block_graphset(self, k, entry, exit_):
+        """
+        ブロックkのユニバースを設定して入口から出口までの有向パスのグラフセットを返す
+        グラフセットはdumps()で直列化してキャッシュする
+        """
+        key = (k, entry, exit_)
+        self._activate(k)
+        if key not in self.__dumped:
+            self.__dumped[key] = dl.directed_paths(entry, exit_).dumps()
+        return GraphSet.loads(self.__dumped[key])
+
+    def _bridge_paths(self, k, entry, exit_):
+        """
+        2ノードのブロック(橋)kの入口から出口までの有向パスを元のグラフのパスのリストで返す
+        """
+        return [[(i,j)] for i,j,cost in self.__edgelists[k] if (i,j) == (entry, exit_)]
+
+    def _block_count(self, k, entry, exit_):
+        """
+        ブロックkの入口から出口までの有向パスの本数を返す
+        """
+        key = (k, entry, exit_)
+        if key not in self.__counts:
+            if len(self.blocks[k]) == 2:
+                self.__counts[key] = len(self._bridge_paths(k, entry, exit_))
+            else:
+                self.__counts[key] = self._block_graphset(k, entry, exit_).len()
+        return self.__counts[key]
+
+    def _aligned_dump(self, k, entry, exit_, universe):
+        """
+        ブロックkの入口から出口までの有向パスのグラフセットを、universeのZDDの変数の番号で
+        直列化した文字列を返す
+
+        arguments:
+        * universe(list)
+          呼び出し時のGraphSet.universe()
+        """
+        dl.read_edgelist(self.__edgelists[k])
+        position = {e[:2]: p for p,e in enumerate(universe, 1)}
+        edges = {e[:2] for e in dl.append_virtual_nodes()}
+        order = tuple(e for e in universe if e[:2] in edges)
+        key = (k, entry, exit_, order)
+        if key not in self.__aligned:
+            GraphSet.set_universe(order, traversal="as-is")
+            variables = [position[e[:2]] for e in order]
+            lines = []
+            for line in dl.directed_paths(entry, exit_).dumps().splitlines():
+                fields = line.split()
+                if len(fields) == 4:
+                    fields[1] = str(variables[int(fields[1]) - 1])
+                lines.append(" ".join(fields))
+            self.__aligned[key] = "\n".join(lines) + "\n"
+        return self.__aligned[key]
+
+    def _universe_families(self, chain):
+        """
+        chainの各ブロックの有向パスを呼び出し時のユニバースのグラフセットのリストで返す
+        """
+        universe = GraphSet.universe()
+        primary = set(dl.edges_table().keys())
+
+        def universe_edges(path):
+            edges = []
+            for i,j in path:
+                if (i,j) in primary:
+                    edges.append((i,j))
+                else:
+                    v = dl.virtual_node_expression(i, j)
+                    edges += [(i,v), (v,j)]
+            return edges
+
+        dumps = []
+        with _preserve_universe():
+            for k,entry,exit_ in chain:
+                if len(self.blocks[k]) == 2:
+                    dumps.append([universe_edges(path) for path in self._bridge_paths(k, entry, exit_)])
+                else:
+                    dumps.append(self._aligned_dump(k, entry, exit_, universe))
+        return [GraphSet(d) if isinstance(d, list) else GraphSet.loads(d) for d in dumps]
+
+    def count(self, start_node, target_node):
+        """
+        sからtへの有向パスの本数をブロックごとの本数の積で返す
+        """
+        chain = self.chain(start_node, target_node)
+        if chain is None:
+            return 0
+        with _preserve_universe():
+            counts = [self._block_count(k, entry, exit_) for k,entry,exit_ in chain]
+        return reduce(operator.mul, counts, 1)
+
+    def iter_paths(self, start_node, target_node):
+        """
+        sからtへの有向パスを返すイテレータ
+        ブロックごとのグラフセットから1本ずつ取り出して連結する
+        イテレーションの間は呼び出し時のユニバースを変更しないこと
+
+        yields:
+        * path(list)
+          スタートノードから順に並べた元のグラフの辺のリスト
+        """
+        chain = self.chain(start_node, target_node)
+        if chain is None:
+            return
+        families = self._universe_families(chain)
+        links = {v: link for link,v in dl.virtual_node_table().items()}
+
+        def original_path(path, entry):
+            o_path = []
+            for i,j in path:
+                if i in links:
+                    continue
+                o_path.append(links.get(j, (i,j)))
+            return ordered_path(o_path, entry)
+
+        def paths_from(n):
+            if n == len(chain):
+                yield []
+                return
+            entry = chain[n][1]
+            for path in families[n]:
+                head = original_path(path, entry)
+                for tail in paths_from(n + 1):
+                    yield head + tail
+
+        for path in paths_from(0):
+            yield path
+
+    def graphset(self, start_node, target_node):
+        """
+        sからtへの有向パスを元のグラフのユニバースのグラフセットで返す
+        呼び出し時のユニバースはdirected_link.append_virtual_nodes()で設定したものとする
+
+        returns:
+        * di_paths(GraphSet)
+        """
+        chain = self.chain(start_node, target_node)
+        if chain is None:
+            return GraphSet()
+        return reduce(lambda x,y: x.join(y), self._universe_families(chain))
@@ -0,0 +1,310 @@
+"""
+date 2026.10.19
+branch master
+file budget.py
+
+パス列挙に時間とメモリの上限を設ける
+
+GraphSet.pathsやexcludingはC++の中で計算するので、Pythonから途中で止めることができない
+このモジュールでは列挙をワーカープロセスで実行し、上限を超えたらプロセスを終了させる
+上限を超えたときは代わりの方法で求めた結果を返し、途中で打ち切ったことをフラグで示す
+
+
+# 動作概要
+1. ワーカープロセスを起動する
+   ワーカーは親プロセスと同じedgelistとユニバース(traversal="as-is")を設定する
+   max_memoryを指定したときはresource.RLIMIT_ASでアドレス空間の上限を設定する
+2. ワーカーは計算の段階(e.g. "rules", "paths", "excluding")を親プロセスに送る
+   親プロセスは段階が変わるたびと、poll_intervalごとにprogress(stage, elapsed)を呼ぶ
+3. 結果のグラフセットはdumps()で直列化して親プロセスに送り、loads()で復元する
+4. timeoutを過ぎたら親プロセスがワーカーを終了させる
+   ワーカーでMemoryErrorが発生したとき、またはワーカーが異常終了したときはメモリの上限を超えたとみなす
+   いずれの場合もfallbackの返り値を結果とする
+
+directed_pathsのfallbackはパス集合の代わりにCOSTの小さいk本のパスをYen法(ksp.py)で求め、
+元のグラフのパスのリストとして返す
+min_hopのfallbackはユニバースの辺を使った幅優先探索で求めたホップ数(min_hopと同じ値)を返す
+
+
+# 使い方
+result = directed_paths(s, t, timeout=60, max_memory=4 << 30, progress=print)
+if result.complete:
+    paths = result.value      # GraphSet
+else:
+    paths = result.value      # COSTの小さいk本のパスのリスト
+    print(result.status)      # "timeout" or "memory"
+"""
+
+from collections import defaultdict, deque
+from multiprocessing import Pipe, Process
+import time
+import traceback
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.graphillion_utils as gu
+from proposal_packages.ksp import k_shortest_paths
+
+COMPLETE = "complete"
+TIMEOUT = "timeout"
+MEMORY = "memory"
+
+# ワーカープロセスから親プロセスへの接続
+_conn = None
+
+class BudgetResult:
+    """
+    BudgetResultクラスは以下の属性を持つ
+    * value
+      計算結果。上限を超えたときはfallbackの返り値
+    * status
+      COMPLETE, TIMEOUT, MEMORYのいずれか
+    * stage
+      最後に報告された計算の段階
+    * elapsed
+      経過時間[s]
+    """
+
+    def __init__(self, value, status, stage, elapsed):
+        self.value = value
+        self.status = status
+        self.stage = stage
+        self.elapsed = elapsed
+
+    @property
+    def complete(self):
+        return self.status == COMPLETE
+
+    @property
+    def partial(self):
+        return self.status != COMPLETE
+
+    def __repr__(self):
+        return "BudgetResult(status={}, stage={}, elapsed={:.3f})".format(self.status, self.stage,
+                                                                          self.elapsed)
+
+def report(stage):
+    """
+    計算の段階を親プロセスに送る
+    ワーカープロセスの外で呼ばれたときは何もしない
+    """
+    if _conn is not None:
+        _conn.send(("progress", stage))
+
+def _encode(value):
+    if isinstance(value, GraphSet):
+        return ("graphset", value.dumps())
+    return ("value", value)
+
+def _decode(data):
+    kind, value = data
+    if kind == "graphset":
+        return GraphSet.loads(value)
+    return value
+
+def _worker(conn, edgelist, universe, max_memory, func, args):
+    global _conn
+    _conn = conn
+    try:
+        if max_memory is not None and resource is not None:
+            resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+        if edgelist is not None:
+            dl.read_edgelist(edgelist)
+        GraphSet.set_universe(universe, traversal="as-is")
+        value = func(*[_decode(arg) for arg in args])
+        conn.send(("done", _encode(value)))
+    except MemoryError:
+        conn.send(("memory", None))
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+def run_with_budget(func, args, timeout=None, max_memory=None, progress=None, fallback=None,
+                    poll_interval=0.5):
+    """
+    ワーカープロセスでfunc(*args)を実行する
+
+    arguments:
+    * func(function)
+      ワーカープロセスで実行する関数
+    * args(tuple)
+      GraphSetはdumps()で直列化してワーカープロセスに渡す
+    * timeout(int or float, optional)
+      経過時間の上限[s]
+    * max_memory(int, optional)
+      ワーカープロセスのアドレス空間の上限[byte]
+    * progress(function, optional)
+      progress(stage, elapsed)の形で呼び出す関数
+    * fallback(function, optional)
+      上限を超えたときにfallback()で結果を求める。指定しないときはNoneを結果とする
+    * poll_interval(int or float, optional)
+      progressを呼び出す間隔[s]
+
+    returns:
+    * result(BudgetResult)
+    """
+    parent, child = Pipe(duplex=False)
+    worker = Process(target=_worker,
+                     args=(child, getattr(dl, "edgelist", None), GraphSet.universe(), max_memory,
+                           func, [_encode(arg) for arg in args]))
+    started = time.monotonic()
+    worker.start()
+    child.close()
+
+    stage = None
+    status = None
+    value = None
+    while status is None:
+        elapsed = time.monotonic() - started
+        wait = poll_interval
+        if timeout is not None:
+            if elapsed >= timeout:
+                status = TIMEOUT
+                break
+            wait = min(wait, timeout - elapsed)
+        try:
+            ready = parent.poll(wait)
+            message = parent.recv() if ready else None
+        except EOFError:
+            status = MEMORY
+            break
+        if message is None:
+            if progress is not None:
+                progress(stage, time.monotonic() - started)
+            continue
+        kind, data = message
+        if kind == "progress":
+            stage = data
+            if progress is not None:
+                progress(stage, time.monotonic() - started)
+        elif kind == "done":
+            status = COMPLETE
+            value = _decode(data)
+        elif kind == "memory":
+            status = MEMORY
+        else:
+            worker.join()
+            raise RuntimeError(data)
+
+    if worker.is_alive():
+        worker.terminate()
+    worker.join()
+    parent.close()
+    if status != COMPLETE and fallback is not None:
+        value = fallback()
+    return BudgetResult(value, status, stage, time.monotonic() - started)
+
+def shortest_path_fallback(start_node, target_node, k=1):
+    """
+    directed_link.edgelistからCOSTの小さい順にk本のパスをYen法で求める
+
+    returns:
+    * paths(list)
+      スタートノードから順に並べた元のグラフのパスを要素とするリスト
+      パスがないときは空のリスト
+    """
+    def fallback():
+        return [path for path,cost in k_shortest_paths(dl.edgelist, start_node, target_node, k)]
+    return fallback
+
+def hop_fallback(terminal):
+    """
+    ユニバースの辺を使った幅優先探索でホップ数を求める
+    graphillion_utils.min_hopと同じ値となる
+    """
+    def fallback():
+        adjacency = defaultdict(list)
+        for e in GraphSet.universe():
+            adjacency[e[0]].append(e[1])
+            adjacency[e[1]].append(e[0])
+        dist = {terminal[0]: 0}
+        queue = deque([terminal[0]])
+        while queue:
+            u = queue.popleft()
+            for v in adjacency[u]:
+                if v not in dist:
+                    dist[v] = dist[u] + 1
+                    queue.append(v)
+        return dist.get(terminal[1])
+    return fallback
+
+def _directed_paths(start_node, target_node):
+    report("rules")
+    elms = GraphSet(dl.invalid_direction_elms(start_node, target_node))
+    report("paths")
+    di_paths = GraphSet.paths(start_node, target_node)
+    report("excluding")
+    return di_paths.excluding(elms)
+
+def directed_paths(start_node, target_node, k=10, **budget):
+    """
+    上限を設けてdirected_link.directed_pathsを実行する
+    上限を超えたときはCOSTの小さいk本のパスのリストを返す
+
+    arguments:
+    * start_node(node label)
+    * target_node(node label)
+    * k(int, optional)
+    * budget
+      run_with_budgetのtimeout, max_memory, progress, poll_interval
+
+    returns:
+    * result(BudgetResult)
+    """
+    return run_with_budget(_directed_paths, (start_node, target_node),
+                           fallback=shortest_path_fallback(start_node, target_node, k), **budget)
+
+def connected_edges(start_node, target_node, num_edges, **budget):
+    """
+    上限を設けてdirected_link.connected_edgesを実行する
+    上限を超えたときはNoneを返す
+    """
+    return run_with_budget(dl.connected_edges, (start_node, target_node, num_edges), **budget)
+
+def disjoint_paths(paths, path, **budget):
+    """
+    上限を設けてdirected_link.disjoint_pathsを実行する
+    上限を超えたときはNoneを返す
+    """
+    return run_with_budget(dl.disjoint_paths, (paths, path), **budget)
+
+def bidirectional_disjoint_paths(paths, path, **budget):
+    """
+    上限を設けてdirected_link.bidirectional_disjoint_pathsを実行する
+    上限を超えたときはNoneを返す
+    """
+    return run_with_budget(dl.bidirectional_disjoint_paths, (paths, path), **budget)
+
+def node_disjoint_paths(paths, path, **budget):
+    """
+    上限を設けてdirected_link.node_disjoint_pathsを実行する
+    上限を超えたときはNoneを返す
+    """
+    return run_with_budget(dl.node_disjoint_paths, (paths, path), **budget)
+
+def min_hop(terminal, **budget):
+    """
+    上限を設けてgraphillion_utils.min_hopを実行する
+    上限を超えたときは幅優先探索で求めたホップ数を返す
+    """
+    return run_with_budget(gu.min_hop, (terminal,), fallback=hop_fallback(terminal), **budget)
+
+def max_hop(terminal, **budget):
+    """
+    上限を設けてgraphillion_utils.max_hopを実行する
+    上限を超えたときはNoneを返す
+    """
+    return run_with_budget(gu.max_hop, (terminal,), **budget)
+
+def get_min_hop_paths(paths, terminal, **budget):
+    """
+    上限を設けてgraphillion_utils.get_min_hop_pathsを実行する
+    上限を超えたときはNoneを返す
+    """
+    return run_with_budget(gu.get_min_hop_paths, (paths, terminal), **budget)
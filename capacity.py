@@ -0,0 +1,151 @@
+"""
+date 2026.10.19
+branch master
+file capacity.py
+
+デマンド量より容量の小さいリンクを通るパスを列挙の前に取り除く
+
+デマンドをデマンド量によって容量クラスに分け、クラスごとに使えないリンクの向きを求める
+パスはGraphSet.pathsのgraphsetに使えないリンクを除外したグラフセットを渡して列挙するので、
+デマンド量の大きいデマンドほど小さいZDDで済む
+使えないリンクがないクラスのデマンドはこれまで通りdirected_link.directed_pathsで列挙する
+
+
+# 動作概要
+* 容量クラス
+  datファイルのC sectionに現れる容量の値を小さい順にc_1 < c_2 < ... < c_mとする
+  デマンド量dのデマンドは、c_k < dとなるkの個数をクラスとする
+  同じクラスのデマンドは使えないリンクの向きが等しいので、除外するグラフセットを共有する
+* リンクの向き
+  リンク(i,j)がedges_tableのキーの向きならユニバースの辺(i,j)、
+  逆向きなら仮想ノードvへの辺(i,v)を除外すればその向きだけを使えなくなる
+  容量が与えられていないリンクの向きは除外しない
+
+
+# 使い方
+1. directed_link.read_edgelist(edgelist)を実行する
+2. GraphSet.set_universe(directed_link.append_virtual_nodes())を実行する
+3. classes = CapacityClasses(dat.capacity)を作成する
+4. for demand, d, paths in capacity_paths(dat.traffic, dat.DK, classes):
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+
+def direction_edge(i, j, table=None):
+    """
+    リンク(i,j)の向きを表すユニバースの辺を返す
+
+    arguments:
+    * i(node label)
+    * j(node label)
+    * table(dict, optional)
+      directed_link.edges_table()の返り値。複数のリンクを調べるときは1回だけ作って渡す
+
+    returns:
+    * edge(tuple)
+      (i,j)または(i,v)
+    """
+    if table is None:
+        table = dl.edges_table()
+    if (i,j) in table:
+        return (i,j)
+    return (i, dl.virtual_node_expression(i, j))
+
+class CapacityClasses:
+    """
+    CapacityClassesクラスは以下の属性を持つ
+    * capacity
+      key: (i,j)
+      value: リンク(i,j)の容量
+    * thresholds
+      容量の値を小さい順に並べたリスト
+    * edges_table
+      作成時のdirected_link.edges_table()
+    """
+
+    def __init__(self, capacity):
+        """
+        arguments:
+        * capacity(list)
+          タプル(i,j,c)を要素とするリスト。Dat.capacityをそのまま渡せる
+        """
+        self.capacity = {(i,j): c for i,j,c in capacity}
+        self.thresholds = sorted(set(self.capacity.values()))
+        self.edges_table = dl.edges_table()
+        self.__search_spaces = {}
+
+    def class_of(self, demand):
+        """
+        デマンド量demandの容量クラスを返す
+        """
+        return bisect_left(self.thresholds, demand)
+
+    def infeasible_links(self, k):
+        """
+        クラスkのデマンドが使えないリンクの向きを返す
+        """
+        if k == 0:
+            return []
+        limit = self.thresholds[k-1]
+        return [link for link,c in self.capacity.items() if c <= limit]
+
+    def search_space(self, k):
+        """
+        クラスkのデマンドのパスを列挙する範囲を返す
+        使えないリンクがないときはNoneを返す
+        一度求めたグラフセットは保存しておく
+        """
+        if k == 0:
+            return None
+        if k not in self.__search_spaces:
+            edges = [direction_edge(i, j, self.edges_table) for i,j in self.infeasible_links(k)]
+            self.__search_spaces[k] = GraphSet({"exclude": edges})
+        return self.__search_spaces[k]
+
+    def directed_paths(self, start_node, target_node, demand):
+        """
+        デマンド量demandを流せる有向パスのグラフセットを返す
+        """
+        return dl.directed_paths(start_node, target_node,
+                                 self.search_space(self.class_of(demand)))
+
+def group_traffic(traffic, DK, classes):
+    """
+    デマンドを容量クラスごとにまとめる
+
+    arguments:
+    * traffic(list)
+    * DK(list)
+      各デマンドのデマンド量。Dat.DKをそのまま渡せる
+    * classes(CapacityClasses)
+
+    returns:
+    * groups(dict)
+      key: 容量クラス
+      value: タプル((s,t), d)を要素とするリスト
+    """
+    groups = defaultdict(list)
+    for demand, d in zip(traffic, DK):
+        groups[classes.class_of(d)].append((demand, d))
+    return groups
+
+def capacity_paths(traffic, DK, classes):
+    """
+    各デマンドについてデマンド量を流せる有向パスを容量クラスごとに返すジェネレータ
+
+    arguments:
+    * traffic(list)
+    * DK(list)
+    * classes(CapacityClasses)
+
+    yields:
+    * ((s,t), d, paths)(tuple)
+    """
+    groups = group_traffic(traffic, DK, classes)
+    for k in sorted(groups):
+        for (s,t), d in groups[k]:
+            yield (s,t), d, classes.directed_paths(s, t, d)
@@ -0,0 +1,150 @@
+"""
+date 2026.10.19
+branch master
+file criticality.py
+
+トラフィック行列全体でリンクの重要度を求める
+リンクの重要度は、各デマンドの有向パスのうちそのリンクを通るパスの本数とする
+
+
+# 動作概要
+元のグラフのリンク(i,j),(j,i)は仮想ノードvを使って(i,j),(j,v),(v,i)の3本の辺になる
+(j,v)を通るパスは必ず(v,i)も通るので、[(i,j)]と[(j,v)]からなるグラフセットを作り、
+paths.including(グラフセット)の要素数を数えれば双方向をまとめた本数が得られる
+リンクごとのグラフセットは最初に1回だけ作り、デマンドごとのパス集合も1回だけ作る
+
+processesを指定するとallpairs.runでデマンドを複数のプロセスに分けて計算する
+
+
+# 使い方
+1. directed_link.read_edgelist(edgelist)を実行する
+2. GraphSet.set_universe(directed_link.append_virtual_nodes())を実行する
+3. links, counts = criticality_matrix(traffic)を実行する
+4. demand_weighted(counts, totals, DK)でデマンド量で重み付けしたベクトルを求める
+"""
+
+import numpy as np
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.allpairs as allpairs
+
+# ワーカープロセスで使うリンクごとのグラフセット
+_families = None
+
+def original_links():
+    """
+    元のグラフのリンクをedges_tableのキーの向きで返す
+
+    returns:
+    * links(list)
+      リンク(i,j)を要素とするリスト
+    """
+    return list(dl.edges_table().keys())
+
+def link_families():
+    """
+    リンクを双方向のいずれかの向きで通るパスを取り出すためのグラフセットを返す
+
+    returns:
+    * families(list)
+      original_links()と同じ順に並んだGraphSetのリスト
+    """
+    families = []
+    for e1,e2 in dl.edges_table().values():
+        i, j = e2[0], e2[1]
+        v = dl.virtual_node_expression(i, j)
+        families.append(GraphSet([[(e1[0], e1[1])], [(i, v)]]))
+    return families
+
+def link_counts(paths, families):
+    """
+    各リンクを通るパスの本数を返す
+
+    arguments:
+    * paths(GraphSet)
+    * families(list)
+      link_familiesの返り値
+
+    returns:
+    * counts(list)
+    """
+    return [paths.including(family).len() for family in families]
+
+def _demand_counts(start_node, target_node):
+    global _families
+    if _families is None:
+        _families = link_families()
+    paths = dl.directed_paths(start_node, target_node)
+    return paths.len(), link_counts(paths, _families)
+
+def count_array(rows):
+    """
+    パスの本数を格納したリストをnumpy.ndarrayに変換する
+    int64に収まらないときはdtype=objectとする
+    """
+    try:
+        return np.array(rows, dtype=np.int64)
+    except OverflowError:
+        return np.array(rows, dtype=object)
+
+def criticality_matrix(traffic, processes=None):
+    """
+    すべてのリンクとデマンドについて、リンクを通る有向パスの本数を返す
+
+    arguments:
+    * traffic(list)
+      タプル(s,t)を要素とするリスト。Dat.trafficをそのまま渡せる
+    * processes(int, optional)
+      2以上を指定するとデマンドを複数のプロセスに分けて計算する
+      指定しないときもユニバースはdirected_link.edgelistから設定し直される
+
+    returns:
+    * links(list)
+      行に対応するリンク(i,j)のリスト
+    * counts(numpy.ndarray)
+      shape (len(links), len(traffic))
+      counts[l][k]はk番目のデマンドのパスのうちl番目のリンクを通るものの本数
+    * totals(numpy.ndarray)
+      shape (len(traffic),)
+      各デマンドのパスの本数
+    """
+    global _families
+    links = original_links()
+    _families = None
+    results = dict(allpairs.run(dl.edgelist, traffic, _demand_counts, processes))
+    results = [results[demand] for demand in traffic]
+
+    totals = count_array([total for total,counts in results])
+    counts = count_array([counts for total,counts in results]).reshape(len(traffic), len(links))
+    return links, counts.T, totals
+
+def demand_weighted(counts, totals, DK):
+    """
+    各デマンドのパスのうちリンクを通るものの割合をデマンド量で重み付けして足し合わせる
+
+    arguments:
+    * counts(numpy.ndarray)
+    * totals(numpy.ndarray)
+      criticality_matrixの返り値
+    * DK(list)
+      各デマンドのデマンド量。Dat.DKをそのまま渡せる
+
+    returns:
+    * risk(numpy.ndarray)
+      shape (len(links),)
+    """
+    totals = np.asarray(totals, dtype=float)
+    ratio = np.asarray(counts, dtype=float) / np.where(totals > 0, totals, 1.0)
+    return ratio.dot(np.asarray(DK, dtype=float))
+
+def ranking(links, counts):
+    """
+    トラフィック行列全体で通るパスの本数が多い順にリンクを並べる
+
+    returns:
+    * ranked(list)
+      タプル(link, パスの本数)を要素とするリスト
+    """
+    total = counts.sum(axis=1)
+    order = sorted(range(len(links)), key=lambda l: total[l], reverse=True)
+    return [(links[l], total[l]) for l in order]
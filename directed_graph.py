@@ -14,37 +14,179 @@ graphillionで有向グラフのパス列挙を行えるようにする
   スタートノードに流入するリンクを除外する
 
 * rule2
-  rule1で除外したリンクの構成ノード以外のノードのなかで流入するリンクの数が2以上のノードに着目する
+  スタートノード以外のノードのなかで流入するリンクの数が2以上のノードに着目する
+  rule1で除外したリンクの始点のノードも対象とする
   そのノードに流入するリンク2つから構成されるすべてのサブグラフを除外する
   着目しているノードに流入するリンク数をnとすれば除外するサブグラフはnC2個存在する
 
 
+# 入力するグラフ
+各関数の引数DiGraphには以下のいずれかを渡せる
+* NetworkXの有向グラフオブジェクト(NetworkX 1.x - 3.x)
+* EdgeArray
+  リンクの始点と終点のノードの番号をnumpyの配列に格納した有向グラフ
+  edgelist(タプル(i,j)または(i,j,cost)のリスト)かpath_engine.CSRGraphから作成する
+NetworkXのグラフは関数を呼ぶたびにEdgeArrayに変換する
+同じグラフで何度もdirected_pathsを実行するときはEdgeArrayを作成して渡すほうが速い
+
+rule1とrule2の除外するサブグラフは、流入リンクを終点の番号でソートした配列から
+流入リンク数が同じノードごとにまとめて求める
+
+
  # 使い方
-1. NetworkXの有向グラフオブジェクトを作成する
+1. NetworkXの有向グラフオブジェクトかEdgeArrayを作成する
    辺重みは付けても付けなくてもよい
-2. GraphSet.set_universe(G.edges())を実行してGraphillionにグラフを読み込ませる
+2. GraphSet.set_universe(universe(G))を実行してGraphillionにグラフを読み込ませる
+   NetworkXのグラフではGraphSet.set_universe(G.edges())でもよい
 3. directed_paths(G, s, t)を実行する
 """
 
 from itertools import combinations
 
+import numpy as np
 from graphillion import GraphSet
 import networkx as nx
 
+class EdgeArray:
+    """
+    EdgeArrayクラスは以下の属性を持つ
+    * nodes
+      番号kのノードのラベルをnodes[k]に格納したリスト
+    * index
+      key: node label
+      value: 番号
+    * tails, heads
+      k番目のリンクの始点と終点の番号を格納したnumpyの配列
+    * costs
+      k番目のリンクの重みを格納したリスト。重みがないときはNone
+    """
+
+    def __init__(self, edgelist):
+        """
+        arguments:
+        * edgelist(list)
+          タプル(i,j)または(i,j,cost)を要素とするリスト
+        """
+        self.nodes = []
+        self.index = {}
+        tails, heads, costs = [], [], []
+        for e in edgelist:
+            for node in e[:2]:
+                if node not in self.index:
+                    self.index[node] = len(self.nodes)
+                    self.nodes.append(node)
+            tails.append(self.index[e[0]])
+            heads.append(self.index[e[1]])
+            costs.append(e[2] if len(e) > 2 else None)
+        self.tails = np.array(tails, dtype=np.int64)
+        self.heads = np.array(heads, dtype=np.int64)
+        self.costs = costs
+        self.__edges = None
+        self.__in_order = None
+        self.__rule2 = None
+
+    @classmethod
+    def from_csr(cls, graph):
+        """
+        path_engine.CSRGraphからEdgeArrayを作成する
+        """
+        self = cls.__new__(cls)
+        self.nodes = list(graph.nodes)
+        self.index = dict(graph.index)
+        indptr = np.asarray(graph.indptr, dtype=np.int64)
+        self.tails = np.repeat(np.arange(len(self.nodes), dtype=np.int64), np.diff(indptr))
+        self.heads = np.asarray(graph.indices, dtype=np.int64)
+        self.costs = list(graph.costs)
+        self.__edges = None
+        self.__in_order = None
+        self.__rule2 = None
+        return self
+
+    def edges(self):
+        """
+        リンクのタプル(i,j)のリストを返す
+        """
+        if self.__edges is None:
+            nodes = self.nodes
+            self.__edges = [(nodes[i], nodes[j])
+                            for i,j in zip(self.tails.tolist(), self.heads.tolist())]
+        return self.__edges
+
+    def in_order(self):
+        """
+        流入リンクを終点の番号でまとめる
+
+        returns:
+        * order(numpy.ndarray)
+          リンクの番号を終点の番号でソートした配列
+        * indptr(numpy.ndarray)
+          番号kのノードの流入リンクはorder[indptr[k]:indptr[k+1]]
+        """
+        if self.__in_order is None:
+            order = np.argsort(self.heads, kind="stable")
+            in_degree = np.bincount(self.heads, minlength=len(self.nodes))
+            indptr = np.concatenate(([0], np.cumsum(in_degree)))
+            self.__in_order = (order, indptr)
+        return self.__in_order
+
+    def rule2_subgraphs(self):
+        """
+        すべてのノードについてrule2のサブグラフを求める
+
+        returns:
+        * subgraphs(list)
+          流入リンク2本からなるサブグラフを終点の番号の順に格納したリスト
+        * ptr(list)
+          番号kのノードのサブグラフはsubgraphs[ptr[k]:ptr[k+1]]
+        """
+        if self.__rule2 is None:
+            first, second = _pair_subgraphs(self)
+            edges = self.edges()
+            subgraphs = [[edges[e1], edges[e2]] for e1,e2 in zip(first.tolist(), second.tolist())]
+            ptr = np.searchsorted(self.heads[first], np.arange(len(self.nodes) + 1)).tolist()
+            self.__rule2 = (subgraphs, ptr)
+        return self.__rule2
+
+def as_edge_array(DiGraph):
+    """
+    NetworkXの有向グラフオブジェクトをEdgeArrayに変換する
+    EdgeArrayはそのまま返す
+    """
+    if isinstance(DiGraph, EdgeArray):
+        return DiGraph
+    graph = EdgeArray(list(DiGraph.edges()))
+    for node in DiGraph.nodes():
+        if node not in graph.index:
+            graph.index[node] = len(graph.nodes)
+            graph.nodes.append(node)
+    return graph
+
+def universe(DiGraph):
+    """
+    GraphSet.set_universeに渡すリンクのリストを返す
+    """
+    graph = as_edge_array(DiGraph)
+    if isinstance(DiGraph, EdgeArray) and all(cost is not None for cost in graph.costs):
+        return [(i, j, cost) for (i,j),cost in zip(graph.edges(), graph.costs)]
+    return graph.edges()
+
 def internal_edges(DiGraph, start_node):
     """
     rule1
 
     arguments:
-    * DiGraph(networkx directed Graph object)
+    * DiGraph(networkx directed Graph object or EdgeArray)
     * start_node(start node label)
 
     returns:
     * internal_links(list)
       rule1にあてはまるリンクからなるサブグラフを格納したリスト
     """
-    internal_links = [[(predecessor, start_node)]\
-                      for predecessor in DiGraph.predecessors_iter(start_node)]
+    graph = as_edge_array(DiGraph)
+    order, indptr = graph.in_order()
+    k = graph.index[start_node]
+    tails = graph.tails[order[indptr[k]:indptr[k+1]]]
+    internal_links = [[(graph.nodes[predecessor], start_node)] for predecessor in tails.tolist()]
     return internal_links
 
 def two_internal_edges_subgraph(DiGraph, node):
@@ -52,7 +194,7 @@ def two_internal_edges_subgraph(DiGraph, node):
     rule2
 
     arguments:
-    * DiGraph(networkx directed Graph object)
+    * DiGraph(networkx directed Graph object or EdgeArray)
     * node(node label)
 
     returns:
@@ -65,40 +207,56 @@ def two_internal_edges_subgraph(DiGraph, node):
     subgraphs = [[link1, link2] for link1,link2 in combinations(internal_links, 2)]
     return subgraphs
 
+def _pair_subgraphs(graph):
+    """
+    流入リンクが2本以上のノードについて、流入リンク2本の組をすべて求める
+    流入リンク数がnのノードをまとめ、nC2個の組の番号をnp.triu_indicesで一度に求める
+
+    returns:
+    * first, second(numpy.ndarray)
+      組を構成するリンクの番号。終点の番号の順に並ぶ
+    """
+    order, indptr = graph.in_order()
+    in_degree = np.diff(indptr)
+    firsts, seconds = [], []
+    for n in np.unique(in_degree[in_degree >= 2]).tolist():
+        starts = indptr[:-1][in_degree == n]
+        a, b = np.triu_indices(n, 1)
+        firsts.append(order[(starts[:, None] + a).ravel()])
+        seconds.append(order[(starts[:, None] + b).ravel()])
+    if not firsts:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    first, second = np.concatenate(firsts), np.concatenate(seconds)
+    by_head = np.argsort(graph.heads[first], kind="stable")
+    return first[by_head], second[by_head]
+
 def invalid_direction_elms(DiGraph, start_node):
     """
     rule1とrule2の結果をまとめる
+    EdgeArrayではrule2の全ノードのサブグラフを1回だけ求め、スタートノードの分を除いて使う
 
     arguments:
-    * DiGraph(networkx directed Graph object)
+    * DiGraph(networkx directed Graph object or EdgeArray)
     * start_node(node label)
 
     returns:
     * elms(list)
       rule1とrule2にあてはまる除外すべきグラフの要素を格納したリスト
     """
-    rule1 = internal_edges(DiGraph, start_node)
-    rule1_nodes = [start_node] + DiGraph.predecessors(start_node)
-    rule2_nodes = set(DiGraph.nodes()) - set(rule1_nodes)
-    elms = []
-    for node in rule2_nodes:
-        rule2 = two_internal_edges_subgraph(DiGraph, node)
-        if rule2 is None: continue
-        for subgraph in rule2:
-            elms.append(subgraph)
-    if len(rule1) == 0:
-        return elms
-    else:
-        for e in rule1:
-            elms.append(e)
-        return elms
+    graph = as_edge_array(DiGraph)
+    rule2, ptr = graph.rule2_subgraphs()
+    k = graph.index[start_node]
+    elms = rule2[:ptr[k]] + rule2[ptr[k+1]:]
+    elms += internal_edges(graph, start_node)
+    return elms
 
 def directed_paths(DiGraph, start_node, target_node):
     """
     有向性を考慮したパスだけを含むグラフセットを返す
 
     arguments:
-    * DiGraph(networkx directed Graph object)
+    * DiGraph(networkx directed Graph object or EdgeArray)
     * start_node(start node label)
     * target_node(target node label)
 
@@ -113,8 +271,8 @@ def directed_paths(DiGraph, start_node, target_node):
 
 if __name__ == "__main__":
     # 動作確認
-    G = nx.DiGraph(data=[("a","b"), ("a","d"), ("b","c"), ("b","e"),
-                         ("d","c"), ("d", "e"), ("e","f"), ("f","c")])
+    G = nx.DiGraph([("a","b"), ("a","d"), ("b","c"), ("b","e"),
+                    ("d","c"), ("d", "e"), ("e","f"), ("f","c")])
     GraphSet.set_universe(G.edges())
     print(internal_edges(G, "b"))
     print(two_internal_edges_subgraph(G, "c"))
@@ -49,6 +49,7 @@ import math
 import random
 
 from graphillion import GraphSet
+import proposal_packages.graphillion_utils as gu
 
 VIRTUAL_NODE_DIGIT_I = 1000
 VIRTUAL_NODE_DIGIT_J = 100
@@ -244,10 +245,7 @@ def neighbor_nodes(node):
     * neighbors(node list)
       neighborノードを格納したリスト
     """
-    global edgelist
-    neighbors = [list(l[0]) for l in external_edges(node)]
-    neighbors = list(set(reduce(lambda x,y: x + y, neighbors)) - {node})
-    return neighbors
+    return gu.universe_index().successors(node)
 
 def external_edges(node):
     """
@@ -260,9 +258,7 @@ def external_edges(node):
     * external_edges(list)
       nodeの流出リンク
     """
-    in_edges = internal_edges(node)
-    ex_edges = [l for l in GraphSet({}).graph_size(1).including(node) - GraphSet(in_edges)]
-    return ex_edges
+    return [[e] for e in gu.universe_index().outgoing(node)]
 
 def original_path(path):
     """
@@ -351,17 +347,20 @@ def invalid_direction_elms(start_node, target_node):
         except ValueError:
             continue
         else:
+            if rule2 is None: continue
             for subgraph in rule2:
                 elms.append(subgraph)
     return elms
 
-def directed_paths(start_node, target_node):
+def directed_paths(start_node, target_node, graphset=None):
     """
     有向性を考慮したパスだけを含むグラフセットを返す
 
     arguments:
     * start_node(node label)
     * target_node(node label)
+    * graphset(GraphSet, optional)
+      パスを列挙する範囲。GraphSet.pathsのgraphsetに渡す
 
     returns:
     * di_paths(GraphSet)
@@ -369,7 +368,7 @@ def directed_paths(start_node, target_node):
     """
     elms = invalid_direction_elms(start_node, target_node)
     elms = GraphSet(elms)
-    di_paths = GraphSet.paths(start_node, target_node)
+    di_paths = GraphSet.paths(start_node, target_node, graphset=graphset)
     di_paths = di_paths.excluding(elms)
     return di_paths
 
@@ -432,28 +431,26 @@ def disjoint_paths(paths, path):
     disjoint_elms = [[e] for e in path]
     return paths.excluding(GraphSet(disjoint_elms))
 
-def bidirectional_disjoint_paths(paths, path):
+def bidirectional_disjoint_elms(path):
     """
-    パスのグラフセットから指定したパスの双方向link-disjoint pathを求める
-    双方向にリンクが共有されないようにする
-    つまり(i,j), (j,v), (v,i)と共有されないパス集合が返る
+    指定したパスと双方向にリンクを共有するパスを除外するためのグラフセット形式のリストを返す
+    つまり(i,j), (j,v), (v,i)を要素とするリストを返す
 
     arguments:
-    * paths(GraphSet)
     * path(list)
 
     returns:
-    * di_paths(GraphSet)
+    * disjoint_elms(list)
     """
     disjoint_elms = []
     v_nodes = virtual_nodes()
-    v_table = virtual_node_table()
+    v_table_inv = {v:k for k,v in virtual_node_table().items()}
     for e in path:
         if e[0] in v_nodes:
-            i, j = v_table[e[0]]
+            i, j = v_table_inv[e[0]]
             disjoint_elms += [[(i,j)], [(e[0],i)], [(j,e[0])]]
         elif e[1] in v_nodes:
-            j, i = v_table[e[1]]
+            j, i = v_table_inv[e[1]]
             disjoint_elms += [[(i,j)], [(e[1],i)], [(j,e[1])]]
         else:
             disjoint_elms.append([e])
@@ -464,6 +461,66 @@ def bidirectional_disjoint_paths(paths, path):
             else:
                 v = virtual_node_expression(j, i)
                 disjoint_elms += [[(i,v)], [(v,j)]]
+    return disjoint_elms
+
+def bidirectional_disjoint_paths(paths, path):
+    """
+    パスのグラフセットから指定したパスの双方向link-disjoint pathを求める
+    双方向にリンクが共有されないようにする
+    つまり(i,j), (j,v), (v,i)と共有されないパス集合が返る
+
+    arguments:
+    * paths(GraphSet)
+    * path(list)
+
+    returns:
+    * di_paths(GraphSet)
+    """
+    disjoint_elms = bidirectional_disjoint_elms(path)
+    return paths.excluding(GraphSet(disjoint_elms))
+
+def node_disjoint_elms(path):
+    """
+    指定したパスの中間ノードを通るパスを除外するためのグラフセット形式のリストを返す
+    中間ノードに接続するリンクと、中間ノードに付随する仮想ノードに接続するリンクを要素とする
+    双方向link-disjointの条件もあわせて含める
+
+    arguments:
+    * path(list)
+
+    returns:
+    * disjoint_elms(list)
+    """
+    degree = defaultdict(int)
+    for i,j in path:
+        degree[i] += 1
+        degree[j] += 1
+    v_table_inv = {v:k for k,v in virtual_node_table().items()}
+    inner_nodes = {node for node,d in degree.items() if d == 2 and node not in v_table_inv}
+
+    disjoint_elms = bidirectional_disjoint_elms(path)
+    for i,j,cost in append_virtual_nodes():
+        ends = {i, j}
+        for node in (i, j):
+            if node in v_table_inv:
+                ends |= set(v_table_inv[node])
+        if ends & inner_nodes:
+            disjoint_elms.append([(i,j)])
+    return disjoint_elms
+
+def node_disjoint_paths(paths, path):
+    """
+    パスのグラフセットから指定したパスのnode-disjoint pathを求める
+    スタートノード、ターゲットノード以外のノードを共有しないパス集合が返る
+
+    arguments:
+    * paths(GraphSet)
+    * path(list)
+
+    returns:
+    * di_paths(GraphSet)
+    """
+    disjoint_elms = node_disjoint_elms(path)
     return paths.excluding(GraphSet(disjoint_elms))
 
 def total_cost(cost_dict, path):
@@ -592,5 +649,6 @@ if __name__ == "__main__":
     print("connected_edges", connected_edges(1, 4, 2))
     print("disjoint_paths", disjoint_paths(di_paths_1_4, [(3,3200), (3200,2)]))
     print("bidirectional_disjoint_paths", bidirectional_disjoint_paths(di_paths_1_4, [(4,4300), (4300,3), (3,3100), (3100,1)]))
+    print("node_disjoint_paths", node_disjoint_paths(di_paths_1_4, [(1,3), (3,4)]))
     print("original_path", original_path([(4, 4300), (4300, 3), (3, 3100), (3100, 1)]))
     print("probability_dict", probability_dict())
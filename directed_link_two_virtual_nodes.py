@@ -15,6 +15,12 @@ NetworkXを一切使用しない実装
 不要なサブグラフのグラフセットの作成をまとめて行うことで高速化
 directed_link.pyと同様の操作を実現する
 
+## 仮想ノードのラベル
+Python 3ではGraphillionがノードのラベルを比較して並べるので、タプル(i,j)を仮想ノードにすると
+整数のノードと比較できずにエラーとなる
+そこでリンク(i,j)の仮想ノードを整数N*(i+1)+jとする(Nは元のグラフのノードの最大値+1)
+元のグラフのノードは0以上の整数とする
+
 
 # 使い方
 1. グラフの重み付きリンクのタプル(i,j,cost)を要素とするリストedgelistを用意する。
@@ -24,20 +30,23 @@ directed_link.pyと同様の操作を実現する
 """
 
 from itertools import combinations
+from functools import reduce
 from collections import defaultdict
 
 from graphillion import GraphSet
 
 def read_edgelist(data):
     """
-    グローバル変数edgelistを設定する
+    グローバル変数edgelistと、仮想ノードのラベルに使うbaseを設定する
+    baseは元のグラフのノードの最大値+1
 
     arguments:
     * data(list)
       グラフを構成する重み付きの辺のタプルを要素とするリスト
     """
-    global edgelist
+    global edgelist, base
     edgelist = data
+    base = max(max(i, j) for i,j,cost in edgelist) + 1
 
 def edges_table():
     """
@@ -57,6 +66,31 @@ def edges_table():
             d[(j,i)].append((i,j,cost))
     return d
 
+def virtual_node_expression(i, j):
+    """
+    リンク(i,j)間の仮想ノードを返す
+
+    arguments:
+    * i(node label)
+    * j(node label)
+
+    returns:
+    * v_node(node label)
+      元のグラフのどのノードよりも大きい整数
+    """
+    global base
+    return base * (i + 1) + j
+
+def virtual_node_table():
+    """
+    キーがリンク(i,j)，値が(i,j)間の仮想ノードである辞書を返す
+
+    returns:
+    * v_table(dict)
+    """
+    global edgelist
+    return {(i,j): virtual_node_expression(i, j) for i,j,cost in edgelist}
+
 def append_virtual_nodes():
     """
     仮想ノードを追加したグラフの辺のリストを返す
@@ -66,9 +100,10 @@ def append_virtual_nodes():
       仮想ノードを追加したグラフの重み付き辺のタプルを要素とするリスト
     """
     global edgelist
+    v_table = virtual_node_table()
     virtual_nodes_graph = []
     for i,j,cost in edgelist:
-        v = (i,j)
+        v = v_table[(i,j)]
         virtual_nodes_graph += [(i,v,cost), (v,j,0)]
     return virtual_nodes_graph
 
@@ -82,9 +117,7 @@ def virtual_node_edges():
     """
     global edgelist
     edges = []
-    virtual_nodes_graph = []
-    for i,j,cost in edgelist:
-        v = (i,j)
+    for (i,j),v in virtual_node_table().items():
         edges += [[(i,v)], [(v,j)]]
     return edges
 
@@ -96,12 +129,7 @@ def virtual_nodes():
     * virtual_nodes(nodes list)
       仮想ノードを格納したリスト
     """
-    global edgelist
-    v_nodes = []
-    for i,j,cost in edgelist:
-        v = (i,j)
-        v_nodes.append(v)
-    return v_nodes
+    return list(virtual_node_table().values())
 
 def original_nodes():
     """
@@ -130,12 +158,10 @@ def predecessor_nodes(node):
     * predecessors(node list)
       predecessorノードを格納したリスト
     """
-    global edgelist
-    v_nodes = virtual_nodes()
     predecessors = []
-    for i,j in v_nodes:
+    for (i,j),v in virtual_node_table().items():
         if node == j:
-            predecessors.append((i,j))
+            predecessors.append(v)
     return predecessors
 
 def internal_edges(node):
@@ -169,7 +195,7 @@ def two_internal_edges_subgraph(node):
         if len(in_edges) < 2:
             raise ValueError("Error Message")
     except ValueError:
-        print "node {} has no two and over internal edges".format(node)
+        print("node {} has no two and over internal edges".format(node))
     else:
         subgraphs = [[e1, e2] for e1,e2 in combinations(in_edges, 2)]
         return subgraphs
@@ -195,10 +221,31 @@ def invalid_direction_elms(start_node, target_node):
         except ValueError:
             continue
         else:
+            if rule2 is None: continue
             for subgraph in rule2:
                 elms.append(subgraph)
     return elms
 
+def original_path(path):
+    """
+    仮想ノードを追加したグラフから求めたパスを元のグラフのパスに変換する
+
+    arguments:
+    * path(list)
+      辺を表すタプル(i,j)を要素とするリスト
+
+    returns:
+    * o_path(list)
+      pathから仮想ノードを除去した元のグラフのパス
+    """
+    v_table_inv = {v:k for k,v in virtual_node_table().items()}
+    o_path = []
+    for e in path:
+        for v in e:
+            if v in v_table_inv and v_table_inv[v] not in o_path:
+                o_path.append(v_table_inv[v])
+    return o_path
+
 def directed_paths(start_node, target_node):
     """
     有向性を考慮したパスだけを含むグラフセットを返す
@@ -223,13 +270,13 @@ if __name__ == "__main__":
                 (2,1,-10),(3,1,-20),(3,2,-30),(4,2,-40),(4,3,-50)]
     read_edgelist(edgelist)
     GraphSet.set_universe(append_virtual_nodes())
-    print "append_virtual_nodes", append_virtual_nodes()
-    print "virtual_node_edges", virtual_node_edges()
-    print "virtual_nodes", virtual_nodes()
-    print "predecessor_nodes", predecessor_nodes(4)
-    print "internal_edges", internal_edges(1)
-    print "two_internal_edges_subgraph", two_internal_edges_subgraph(1)
-    print "invalid_direction_elms", invalid_direction_elms(1, 4)
-    print "enumerate paths from start1 to target4"
+    print("append_virtual_nodes", append_virtual_nodes())
+    print("virtual_node_edges", virtual_node_edges())
+    print("virtual_nodes", virtual_nodes())
+    print("predecessor_nodes", predecessor_nodes(4))
+    print("internal_edges", internal_edges(1))
+    print("two_internal_edges_subgraph", two_internal_edges_subgraph(1))
+    print("invalid_direction_elms", invalid_direction_elms(1, 4))
+    print("enumerate paths from start1 to target4")
     for path in directed_paths(1, 4):
-        print path
+        print(path)
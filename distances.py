@@ -0,0 +1,150 @@
+"""
+date 2026.10.19
+branch master
+file distances.py
+
+全ノード間の最小ホップ数と最小COSTを行列で求める
+
+graphillion_utils.min_hopはデマンドごとにGraphSet.pathsでパス集合を作ってから
+min_iterで1本目を取り出していたので、全デマンドのループではZDDを何度も作っていた
+このモジュールではpath_engine.CSRGraphの配列から幅優先探索とDijkstra法で全ノード間の距離を
+1回だけ求め、numpyの配列に格納する。問い合わせは配列の参照だけで済む
+
+
+# 動作概要
+* 有向(directed=True)では各リンクを(i,j)の向きだけに使う
+  無向(directed=False)では(j,i)の向きにも使う
+  同じノードの組に複数のリンクがあるときは重みの最小値を使う
+* scipyがあるときはscipy.sparse.csgraph.shortest_pathで求める
+  ないときは各ノードから幅優先探索、Dijkstra法を行う
+* 到達できないノードの組の距離はnumpy.inf
+
+
+# 使い方
+dist = Distances(Dat(datfile).cost)
+dist.hop(s, t)                          # 最小ホップ数
+dist.cost(s, t)                         # 最小COST
+dist.hops[dist.index[s], dist.index[t]] # 行列を直接参照してもよい
+"""
+
+from collections import deque
+import heapq
+
+import numpy as np
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import shortest_path
+except ImportError:
+    csr_matrix = None
+
+import proposal_packages.path_engine as pe
+
+def _adjacency(graph, directed):
+    """
+    ノードの番号の組をキー、重みの最小値を値とする辞書を返す
+    """
+    adjacency = {}
+    for u in range(graph.num_nodes):
+        for k in range(graph.indptr[u], graph.indptr[u+1]):
+            v, cost = graph.indices[k], graph.costs[k]
+            pairs = [(u, v)] if directed else [(u, v), (v, u)]
+            for pair in pairs:
+                if cost < adjacency.get(pair, np.inf):
+                    adjacency[pair] = cost
+    return adjacency
+
+def _bfs_matrix(n, adjacency):
+    succ = [[] for _ in range(n)]
+    for u,v in adjacency:
+        succ[u].append(v)
+    matrix = np.full((n, n), np.inf)
+    for s in range(n):
+        row = matrix[s]
+        row[s] = 0
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            for v in succ[u]:
+                if row[v] == np.inf:
+                    row[v] = row[u] + 1
+                    queue.append(v)
+    return matrix
+
+def _dijkstra_matrix(n, adjacency):
+    succ = [[] for _ in range(n)]
+    for (u,v),cost in adjacency.items():
+        succ[u].append((v, cost))
+    matrix = np.full((n, n), np.inf)
+    for s in range(n):
+        dist = {s: 0}
+        heap = [(0, s)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for v, cost in succ[u]:
+                nd = d + cost
+                if nd < dist.get(v, np.inf):
+                    dist[v] = nd
+                    heapq.heappush(heap, (nd, v))
+        for v, d in dist.items():
+            matrix[s, v] = d
+    return matrix
+
+def _scipy_matrix(n, adjacency, unweighted):
+    rows = [u for u,v in adjacency]
+    cols = [v for u,v in adjacency]
+    # 重み0のリンクも明示的な要素として格納されるので辺として扱われる
+    matrix = csr_matrix((list(adjacency.values()), (rows, cols)), shape=(n, n))
+    return shortest_path(matrix, directed=True, unweighted=unweighted)
+
+class Distances:
+    """
+    Distancesクラスは以下の属性を持つ
+    * graph
+      path_engine.CSRGraph
+    * nodes, index
+      CSRGraphと同じノードの番号
+    * directed
+    * hops
+      hops[k, l]は番号kのノードから番号lのノードへの最小ホップ数を格納したnumpy.ndarray
+    * costs
+      costs[k, l]は番号kのノードから番号lのノードへの最小COSTを格納したnumpy.ndarray
+    """
+
+    def __init__(self, graph, directed=True):
+        """
+        arguments:
+        * graph(CSRGraph or list)
+          リストのときは重み付き辺のタプル(i,j,cost)を要素とするリスト。Dat.costをそのまま渡せる
+        * directed(bool, optional)
+        """
+        if not isinstance(graph, pe.CSRGraph):
+            graph = pe.CSRGraph(graph)
+        self.graph = graph
+        self.nodes = graph.nodes
+        self.index = graph.index
+        self.directed = directed
+        n = graph.num_nodes
+        adjacency = _adjacency(graph, directed)
+        if csr_matrix is not None and adjacency:
+            self.hops = _scipy_matrix(n, adjacency, True)
+            self.costs = _scipy_matrix(n, adjacency, False)
+        else:
+            self.hops = _bfs_matrix(n, adjacency)
+            self.costs = _dijkstra_matrix(n, adjacency)
+
+    def hop(self, start_node, target_node):
+        """
+        最小ホップ数を返す。到達できないときはNone
+        """
+        d = self.hops[self.index[start_node], self.index[target_node]]
+        return int(d) if np.isfinite(d) else None
+
+    def cost(self, start_node, target_node):
+        """
+        最小COSTを返す。到達できないときはNone
+        """
+        d = self.costs[self.index[start_node], self.index[target_node]]
+        return d.item() if np.isfinite(d) else None
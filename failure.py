@@ -0,0 +1,189 @@
+"""
+date 2026.10.19
+branch master
+file failure.py
+
+単一リンク故障、二重リンク故障のシナリオごとに、各デマンドの有向パスのうち
+故障したリンクを通らないものの本数と最小コストのパスを求める
+
+
+# 動作概要
+故障したリンクごとにedgelistを書き換えてユニバースを設定し直すのではなく、
+デマンドごとの有向パスのグラフセットを1回だけ作り、
+各シナリオの結果はそこから故障したリンクを通るパスを除外して求める
+
+元のグラフのリンク(i,j),(j,i)は仮想ノードvを使って(i,j),(j,v),(v,i)の3本の辺になる
+(j,v)を通るパスは必ず(v,i)も通るので、criticality.link_familiesと同様に
+[(i,j)]と[(j,v)]からなるグラフセットを除外すれば双方向とも故障したことになる
+二重リンク故障では2個のリンクのグラフセットの和集合を除外する
+
+processesを指定するとallpairs.runでデマンドを複数のプロセスに分けて計算する
+1個のデマンドのシナリオはすべて同じプロセスで計算し、パス集合の作成は1回で済ませる
+
+
+# 使い方
+1. directed_link.read_edgelist(edgelist)を実行する
+2. GraphSet.set_universe(directed_link.append_virtual_nodes())を実行する
+3. for demand, scenario, count, cheapest in failure_analysis(traffic, max_order=2):
+"""
+
+from functools import partial
+from itertools import combinations
+
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.allpairs as allpairs
+from proposal_packages.criticality import original_links, link_families
+from proposal_packages.protection import ordered_path
+
+# ワーカープロセスで使うリンクごとのグラフセットと辺の重み
+_families = None
+_metric = None
+
+def normalize_link(link, table=None):
+    """
+    リンクをedges_tableのキーの向きに揃える
+
+    arguments:
+    * link(tuple)
+      (i,j)または(j,i)
+    * table(dict, optional)
+      directed_link.edges_table()の返り値。複数のリンクを揃えるときは1回だけ作って渡す
+
+    returns:
+    * link(tuple)
+    """
+    if table is None:
+        table = dl.edges_table()
+    i, j = link[0], link[1]
+    if (i,j) in table:
+        return (i,j)
+    return (j,i)
+
+def failure_scenarios(max_order=2, links=None):
+    """
+    故障シナリオのリストを返す
+
+    arguments:
+    * max_order(int, optional)
+      同時に故障するリンクの最大数
+    * links(list, optional)
+      故障を考えるリンクのリスト。指定しないときは元のグラフのすべてのリンク
+
+    returns:
+    * scenarios(list)
+      故障したリンクのタプルを要素とするリスト
+      単一リンク故障のシナリオから順に並ぶ
+    """
+    if links is None:
+        links = original_links()
+    table = dl.edges_table()
+    links = [normalize_link(link, table) for link in links]
+    scenarios = []
+    for order in range(1, max_order + 1):
+        scenarios += list(combinations(links, order))
+    return scenarios
+
+def family_table():
+    """
+    リンクをキー、そのリンクを通るパスを取り出すグラフセットを値とする辞書を返す
+    リンクの向きを揃えずに引けるように、(i,j)と(j,i)の両方をキーにする
+    """
+    families = {}
+    for (i,j),family in zip(original_links(), link_families()):
+        families[(i,j)] = family
+        families[(j,i)] = family
+    return families
+
+def failure_family(scenario, families):
+    """
+    シナリオで故障したリンクのいずれかを通るパスを取り出すグラフセットを返す
+
+    arguments:
+    * scenario(tuple)
+    * families(dict)
+      family_tableの返り値
+    """
+    family = GraphSet()
+    for link in scenario:
+        family |= families[link[:2]]
+    return family
+
+def surviving_paths(paths, scenario, families):
+    """
+    パスのグラフセットから故障したリンクを通らないパスを求める
+
+    arguments:
+    * paths(GraphSet)
+    * scenario(tuple)
+    * families(dict)
+
+    returns:
+    * paths(GraphSet)
+    """
+    return paths.excluding(failure_family(scenario, families))
+
+def scenario_results(paths, start_node, scenarios, families, metric):
+    """
+    1個のデマンドについて各シナリオの結果を順に返すジェネレータ
+
+    arguments:
+    * paths(GraphSet)
+      デマンドの有向パスのグラフセット
+    * start_node(node label)
+    * scenarios(list)
+    * families(dict)
+    * metric(dict)
+      key: (i,j)
+      value: cost
+
+    yields:
+    * (scenario, count, cheapest)(tuple)
+      cheapestは最小コストのパスとそのコストのタプル(path, cost)
+      パスが残らないときはNone
+    """
+    for scenario in scenarios:
+        survivors = surviving_paths(paths, scenario, families)
+        cheapest = None
+        for path in survivors.min_iter(metric):
+            cheapest = (ordered_path(dl.original_path(path), start_node),
+                        dl.total_cost(metric, path))
+            break
+        yield scenario, survivors.len(), cheapest
+
+def _demand_scenarios(start_node, target_node, scenarios):
+    global _families, _metric
+    if _families is None:
+        _families = family_table()
+        _metric = {(i,j): cost for i,j,cost in dl.append_virtual_nodes()}
+    paths = dl.directed_paths(start_node, target_node)
+    return list(scenario_results(paths, start_node, scenarios, _families, _metric))
+
+def failure_analysis(traffic, max_order=2, links=None, scenarios=None, processes=None):
+    """
+    すべてのデマンドと故障シナリオについて、残る有向パスの本数と最小コストのパスを返すジェネレータ
+    デマンドの計算が終わった順に結果を返す
+
+    arguments:
+    * traffic(list)
+      タプル(s,t)を要素とするリスト。Dat.trafficをそのまま渡せる
+    * max_order(int, optional)
+    * links(list, optional)
+      failure_scenariosの引数
+    * scenarios(list, optional)
+      故障シナリオのリスト。指定したときはmax_order, linksを使わない
+    * processes(int, optional)
+      2以上を指定するとデマンドを複数のプロセスに分けて計算する
+      指定しないときもユニバースはdirected_link.edgelistから設定し直される
+
+    yields:
+    * ((s,t), scenario, count, cheapest)(tuple)
+    """
+    global _families, _metric
+    if scenarios is None:
+        scenarios = failure_scenarios(max_order, links)
+    _families, _metric = None, None
+    func = partial(_demand_scenarios, scenarios=scenarios)
+    for demand, results in allpairs.run(dl.edgelist, traffic, func, processes):
+        for scenario, count, cheapest in results:
+            yield demand, scenario, count, cheapest
@@ -4,11 +4,176 @@ Date: 2018.6.11
 File: graphillion_utils.py
 
 graphillionを操作しているときによく使う機能をまとめたモジュール
+
+min_hop, max_hop, degreeの結果はユニバースごとにキャッシュする
+degreeと隣接関係はユニバースの辺から1回だけ作る索引(UniverseIndex)から求める
+min_hopはユニバースを無向グラフとみなした全ノード間の最小ホップ数の行列(distances.py)から求め、
+max_hopはデマンドごとに1回だけGraphSet.pathsを実行する
+キャッシュはGraphSet.set_universeでユニバースが変わると破棄する
 """
 
 import random
+
+import numpy as np
 from graphillion import GraphSet
 
+try:
+    from graphillion.universe import Universe
+except ImportError:
+    Universe = None
+
+import proposal_packages.distances as ds
+import proposal_packages.query as query
+
+# ユニバースに結びついたキャッシュ
+_cache = {}
+_cache_token = None
+
+def _universe_token():
+    """
+    ユニバースを識別する値を返す
+    Graphillion 2.xではset_universeのたびに作り直される辺の表を使う
+    """
+    table = getattr(Universe, "e_objtable", None)
+    if table is not None:
+        return table
+    return tuple(GraphSet.universe())
+
+def universe_cache():
+    """
+    現在のユニバースに結びついたキャッシュの辞書を返す
+    ユニバースが変わっていたら空の辞書にする
+
+    returns:
+    * cache(dict)
+    """
+    global _cache, _cache_token
+    token = _universe_token()
+    if token is not _cache_token and token != _cache_token:
+        _cache = {}
+        _cache_token = token
+    return _cache
+
+def universe_distances():
+    """
+    ユニバースを無向グラフとみなした全ノード間の距離を返す
+
+    returns:
+    * distances(distances.Distances)
+    """
+    cache = universe_cache()
+    if "distances" not in cache:
+        edgelist = [(e[0], e[1], 1) for e in GraphSet.universe()]
+        cache["distances"] = ds.Distances(edgelist, directed=False)
+    return cache["distances"]
+
+class UniverseIndex:
+    """
+    ユニバースの辺から作るノードの次数と隣接関係の索引
+    辺の向きはユニバースに設定したときの向き(仮想ノードを使うときはリンクの向き)とする
+
+    UniverseIndexクラスは以下の属性を持つ
+    * nodes
+      番号kのノードのラベルをnodes[k]に格納したリスト
+    * index
+      key: node label
+      value: 番号
+    * edges
+      ユニバースの辺のタプル(i,j)のリスト
+    * tails, heads
+      k番目の辺の始点と終点の番号を格納したnumpyの配列
+    * in_degrees, out_degrees, degrees
+      番号kのノードの流入辺、流出辺、接続する辺の数を格納したnumpyの配列
+    * out_ptr, out_edges
+      番号kのノードの流出辺の番号はout_edges[out_ptr[k]:out_ptr[k+1]]
+    * in_ptr, in_edges
+      番号kのノードの流入辺の番号はin_edges[in_ptr[k]:in_ptr[k+1]]
+    """
+
+    def __init__(self, universe):
+        self.edges = [tuple(e[:2]) for e in universe]
+        self.nodes = []
+        self.index = {}
+        for e in self.edges:
+            for node in e:
+                if node not in self.index:
+                    self.index[node] = len(self.nodes)
+                    self.nodes.append(node)
+        n = len(self.nodes)
+        self.tails = np.array([self.index[i] for i,j in self.edges], dtype=np.int64)
+        self.heads = np.array([self.index[j] for i,j in self.edges], dtype=np.int64)
+        self.out_degrees = np.bincount(self.tails, minlength=n)
+        self.in_degrees = np.bincount(self.heads, minlength=n)
+        self.degrees = self.out_degrees + self.in_degrees
+        self.out_edges = np.argsort(self.tails, kind="stable")
+        self.out_ptr = np.concatenate(([0], np.cumsum(self.out_degrees)))
+        self.in_edges = np.argsort(self.heads, kind="stable")
+        self.in_ptr = np.concatenate(([0], np.cumsum(self.in_degrees)))
+
+    def degree(self, node):
+        """
+        nodeに接続する辺の数を返す。ユニバースにないノードは0
+        """
+        k = self.index.get(node)
+        return 0 if k is None else int(self.degrees[k])
+
+    def in_degree(self, node):
+        k = self.index.get(node)
+        return 0 if k is None else int(self.in_degrees[k])
+
+    def out_degree(self, node):
+        k = self.index.get(node)
+        return 0 if k is None else int(self.out_degrees[k])
+
+    def outgoing(self, node):
+        """
+        nodeの流出辺のタプル(node,j)のリストを返す
+        """
+        k = self.index.get(node)
+        if k is None:
+            return []
+        return [self.edges[e] for e in self.out_edges[self.out_ptr[k]:self.out_ptr[k+1]].tolist()]
+
+    def incoming(self, node):
+        """
+        nodeの流入辺のタプル(i,node)のリストを返す
+        """
+        k = self.index.get(node)
+        if k is None:
+            return []
+        return [self.edges[e] for e in self.in_edges[self.in_ptr[k]:self.in_ptr[k+1]].tolist()]
+
+    def incident(self, node):
+        """
+        nodeに接続する辺のリストを返す
+        """
+        return self.outgoing(node) + self.incoming(node)
+
+    def successors(self, node):
+        return [j for i,j in self.outgoing(node)]
+
+    def predecessors(self, node):
+        return [i for i,j in self.incoming(node)]
+
+    def neighbors(self, node):
+        """
+        辺の向きを考えずにnodeに隣接するノードのリストを返す
+        """
+        return self.successors(node) + self.predecessors(node)
+
+def universe_index():
+    """
+    現在のユニバースの索引を返す
+    ユニバースが変わったときは作り直す
+
+    returns:
+    * index(UniverseIndex)
+    """
+    cache = universe_cache()
+    if "index" not in cache:
+        cache["index"] = UniverseIndex(GraphSet.universe())
+    return cache["index"]
+
 def degree(node):
     """
     nodeの字数を返す
@@ -21,7 +186,7 @@ def degree(node):
       nodeの次数
     """
 
-    return len(GraphSet({}).including(node).graph_size(1))
+    return universe_index().degree(node)
 
 def flatten_paths(paths):
     """
@@ -33,16 +198,24 @@ def flatten_paths(paths):
 def min_hop(terminal):
     """
     2頂点間を結ぶパスの最小ホップ数を求める
+    パスがないときはNoneを返す
     """
 
-    return len(next(GraphSet.paths(terminal[0], terminal[1]).min_iter()))
+    return universe_distances().hop(terminal[0], terminal[1])
 
 def max_hop(terminal):
     """
     2頂点間を結ぶパスの最大ホップ数を求める
+    パスがないときはNoneを返す
+    辺の重みをすべて1としてmax_iterで取り出す
     """
 
-    return len(next(GraphSet.paths(terminal[0], terminal[1]).max_iter()))
+    cache = universe_cache()
+    key = ("max_hop", terminal[0], terminal[1])
+    if key not in cache:
+        path = next(GraphSet.paths(terminal[0], terminal[1]).max_iter({}), None)
+        cache[key] = None if path is None else len(path)
+    return cache[key]
 
 def get_min_hop_paths(paths, terminal):
     """
@@ -61,6 +234,8 @@ def get_min_hop_paths(paths, terminal):
 def excluding_multi_elms(graphset, elms):
     """
     複数のグラフ要素をグラフセットから削除する
+    query.Queryで要素の和集合をとり、1回のexcludingで削除する
+    結果はキャッシュしない
 
     arguments:
     * graphset(graphset)
@@ -70,10 +245,11 @@ def excluding_multi_elms(graphset, elms):
     * graphset(graphset)
     """
 
+    q = query.Query(graphset)
     for elm in elms:
-        graphset = graphset.excluding(elm)
+        q = q.excluding(elm)
 
-    return graphset
+    return q.graphset()
 
 def select_sleep_nodes(nodes, terminal, num):
     """
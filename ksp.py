@@ -0,0 +1,219 @@
+"""
+date 2026.10.19
+branch master
+file ksp.py
+
+Yen法でCOSTの小さい順にk本の有向単純パスを求める
+
+数千ノードのBRITEトポロジーではdirected_pathsのグラフセットを作ることができないが、
+必要なのはデマンドごとにCOSTの小さいk本の経路だけであることが多い
+このモジュールはGraphillionを使わず、path_engine.CSRGraphの配列の上で計算する
+
+
+# 動作概要
+1. ターゲットノードtへの最短距離h(v)と、最短パス木でのvの次のノードを
+   逆向きのグラフでのDijkstra法で求める(ターゲットノードごとに1回)
+2. Yen法で1本目のパスを最短パス木から取り出し、2本目以降は各パスの分岐点(spur node)から
+   分岐先のパスを求める
+   * 分岐点からの最短パス木のパスが除外するノードとリンクを通らなければ、それをそのまま使う
+     h(v)は除外がないときの最短距離なので、このパスは最適となる
+   * 通るときはh(v)をポテンシャルとしたA*探索(ヒープを使ったDijkstra法)で求める
+3. 候補はヒープで管理し、同じパスは1回だけ候補に加える
+
+結果はallpairs.top_pathsと同じく、タプル(path, cost)を要素とするリストで返す
+pathはスタートノードから順に並べた元のグラフの辺のリストとする
+
+
+# 使い方
+paths = k_shortest_paths(Dat(datfile).cost, s, t, k=10)
+results = all_k_shortest_paths(Dat(datfile).cost, Dat(datfile).traffic, k=10)
+"""
+
+from itertools import count
+import heapq
+
+from proposal_packages.path_engine import CSRGraph
+
+INF = float("inf")
+
+def reverse_tree(graph, target_node):
+    """
+    ターゲットノードへの最短距離と最短パス木を求める
+
+    arguments:
+    * graph(CSRGraph)
+    * target_node(node label)
+
+    returns:
+    * h(list)
+      h[v]は番号vのノードからターゲットノードへの最短距離。到達できないときはINF
+    * next_hop(list)
+      next_hop[v]は最短パス木で番号vのノードの次のノードの番号
+    """
+    n = graph.num_nodes
+    r_edges = [[] for _ in range(n)]
+    for u in range(n):
+        for k in range(graph.indptr[u], graph.indptr[u+1]):
+            r_edges[graph.indices[k]].append((u, graph.costs[k]))
+    t = graph.index[target_node]
+    h = [INF] * n
+    next_hop = [None] * n
+    h[t] = 0
+    heap = [(0, t)]
+    while heap:
+        d, v = heapq.heappop(heap)
+        if d > h[v]:
+            continue
+        for u, cost in r_edges[v]:
+            nd = d + cost
+            if nd < h[u]:
+                h[u] = nd
+                next_hop[u] = v
+                heapq.heappush(heap, (nd, u))
+    return h, next_hop
+
+def _spur_path(graph, h, next_hop, spur, t, banned_nodes, banned_edges):
+    """
+    spurからtへの除外を考慮した最短パスを求める
+
+    returns:
+    * (path, cost)(tuple)
+      pathはノードの番号のリスト。パスがないときはNone
+    """
+    if h[spur] == INF:
+        return None
+    path = [spur]
+    v = spur
+    ok = spur == t or (spur, next_hop[spur]) not in banned_edges
+    while ok and v != t:
+        v = next_hop[v]
+        if v in banned_nodes:
+            ok = False
+        path.append(v)
+    if ok:
+        return path, h[spur]
+
+    indptr, indices, costs = graph.indptr, graph.indices, graph.costs
+    dist = {spur: 0}
+    prev = {}
+    heap = [(h[spur], 0, spur)]
+    while heap:
+        f, g, u = heapq.heappop(heap)
+        if g > dist[u]:
+            continue
+        if u == t:
+            path = [t]
+            while path[-1] != spur:
+                path.append(prev[path[-1]])
+            path.reverse()
+            return path, g
+        for k in range(indptr[u], indptr[u+1]):
+            v = indices[k]
+            if v in banned_nodes or h[v] == INF or (u, v) in banned_edges:
+                continue
+            ng = g + costs[k]
+            if ng < dist.get(v, INF):
+                dist[v] = ng
+                prev[v] = u
+                heapq.heappush(heap, (ng + h[v], ng, v))
+    return None
+
+def _edge_costs(graph):
+    edge_costs = {}
+    for u in range(graph.num_nodes):
+        for k in range(graph.indptr[u], graph.indptr[u+1]):
+            v = graph.indices[k]
+            edge_costs[(u, v)] = min(graph.costs[k], edge_costs.get((u, v), INF))
+    return edge_costs
+
+def _yen(graph, s, t, k, h, next_hop, edge_costs):
+    found = []
+    if s == t or k <= 0:
+        return found
+    first = _spur_path(graph, h, next_hop, s, t, set(), set())
+    if first is None:
+        return found
+    found.append(first)
+    candidates = []
+    seen = {tuple(first[0])}
+    tie = count()
+    while len(found) < k:
+        path, cost = found[-1]
+        root_cost = 0
+        for i in range(len(path) - 1):
+            spur = path[i]
+            root = path[:i+1]
+            banned_edges = {(p[i], p[i+1]) for p,c in found if p[:i+1] == root}
+            banned_nodes = set(root[:-1])
+            spur_result = _spur_path(graph, h, next_hop, spur, t, banned_nodes, banned_edges)
+            if spur_result is not None:
+                candidate = root[:-1] + spur_result[0]
+                if tuple(candidate) not in seen:
+                    seen.add(tuple(candidate))
+                    heapq.heappush(candidates,
+                                   (root_cost + spur_result[1], next(tie), candidate))
+            root_cost += edge_costs[(path[i], path[i+1])]
+        if not candidates:
+            break
+        cost, _, candidate = heapq.heappop(candidates)
+        found.append((candidate, cost))
+    return found
+
+def _labelled(graph, found):
+    nodes = graph.nodes
+    return [([(nodes[u], nodes[v]) for u,v in zip(path, path[1:])], cost) for path,cost in found]
+
+def k_shortest_paths(graph, start_node, target_node, k):
+    """
+    COSTの小さい順にk本の有向単純パスを返す
+
+    arguments:
+    * graph(CSRGraph or list)
+      リストのときは重み付き辺のタプル(i,j,cost)を要素とするリスト。Dat.costをそのまま渡せる
+    * start_node(node label)
+    * target_node(node label)
+    * k(int)
+
+    returns:
+    * paths(list)
+      タプル(path, cost)を要素とするリスト。kが0以下のときは空のリスト
+    """
+    if k <= 0:
+        return []
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph(graph)
+    h, next_hop = reverse_tree(graph, target_node)
+    found = _yen(graph, graph.index[start_node], graph.index[target_node], k, h, next_hop,
+                 _edge_costs(graph))
+    return _labelled(graph, found)
+
+def all_k_shortest_paths(graph, traffic, k):
+    """
+    すべてのデマンドについてCOSTの小さい順にk本の有向単純パスを返す
+    最短パス木はターゲットノードごとに1回だけ求める
+
+    arguments:
+    * graph(CSRGraph or list)
+    * traffic(list)
+      タプル(s,t)を要素とするリスト。Dat.trafficをそのまま渡せる
+    * k(int)
+
+    returns:
+    * results(dict)
+      key: (s,t)
+      value: k_shortest_pathsと同じ形式の結果
+    """
+    if k <= 0:
+        return {(s,t): [] for s,t in traffic}
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph(graph)
+    edge_costs = _edge_costs(graph)
+    results = {}
+    trees = {}
+    for s,t in sorted(traffic, key=lambda demand: graph.index[demand[1]]):
+        if t not in trees:
+            trees = {t: reverse_tree(graph, t)}
+        h, next_hop = trees[t]
+        found = _yen(graph, graph.index[s], graph.index[t], k, h, next_hop, edge_costs)
+        results[(s,t)] = _labelled(graph, found)
+    return results
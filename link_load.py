@@ -0,0 +1,236 @@
+"""
+date 2026.10.19
+branch master
+file link_load.py
+
+デマンドごとに選んだパスからリンクの負荷と使用率を求める
+
+各デマンドのパスをリンクの番号に直し、デマンド×リンクの接続行列(疎行列)を1回だけ作る
+リンクの負荷は接続行列の転置とDKのデマンド量のベクトルの積で求める
+1本のデマンドのパスを変えたときは、そのデマンドの行だけを差し替えて負荷を差分で更新するので、
+探索のループで多数の経路の候補を評価できる
+
+
+# 動作概要
+* リンク
+  Dat.capacity(C section)の有向リンク(i,j)に順に番号をつける
+* パスの変換
+  パスはユニバースの辺のリストでも、directed_link.original_pathで変換したリンクのリストでもよい
+  仮想ノードvを通る辺(i,v),(v,j)はどちらもvに対応するリンク(i,j)に直し、1回だけ数える
+  仮想ノードとリンクの対応はvirtual_tableで与える。省略したときは各リンクについて
+  directed_link.virtual_node_expressionで求める
+* 負荷
+  scipyがあるときはscipy.sparse.csr_matrixの接続行列から求め、
+  ないときはnumpy.bincountで同じ値を求める
+* 使用率
+  負荷/容量。容量を超えたリンクを過負荷とする
+
+
+# 使い方
+dat = Dat(datfile)
+load = LinkLoad.from_dat(dat, paths)    # pathsはデマンドと同じ順に並べたパスのリスト
+load.max_utilization()
+load.overloaded()
+load.evaluate(k, path)                  # デマンドkをpathに変えたときの最大使用率(負荷は変えない)
+load.reroute(k, path)                   # デマンドkをpathに変える
+"""
+
+import numpy as np
+
+try:
+    from scipy.sparse import csr_matrix
+except ImportError:
+    csr_matrix = None
+
+import proposal_packages.directed_link as dl
+
+class LinkLoad:
+    """
+    LinkLoadクラスは以下の属性を持つ
+    * links
+      番号kのリンク(i,j)をlinks[k]に格納したリスト
+    * index
+      key: (i,j)
+      value: リンクの番号
+    * capacities
+      番号kのリンクの容量を格納したnumpyの配列
+    * traffic
+      デマンド(s,t)のリスト
+    * demands
+      k番目のデマンドのデマンド量を格納したnumpyの配列
+    * loads
+      番号kのリンクの負荷を格納したnumpyの配列
+    """
+
+    def __init__(self, capacity, traffic, DK, paths=None, virtual_table=None):
+        """
+        arguments:
+        * capacity(list)
+          タプル(i,j,c)を要素とするリスト。Dat.capacityをそのまま渡せる
+        * traffic(list)
+        * DK(list)
+        * paths(list, optional)
+          k番目のデマンドのパスをk番目に格納したリスト
+        * virtual_table(dict, optional)
+          key: リンク(i,j)
+          value: (i,j)間の仮想ノード
+          directed_link.virtual_node_table()やMultiDiGraph.virtual_node_table()をそのまま渡せる
+        """
+        if len(traffic) != len(DK):
+            raise ValueError("traffic and DK must have the same length")
+        self.links = [(i,j) for i,j,c in capacity]
+        self.index = {link: k for k,link in enumerate(self.links)}
+        self.capacities = np.array([c for i,j,c in capacity], dtype=float)
+        self.traffic = list(traffic)
+        self.demands = np.array(DK, dtype=float)
+        if virtual_table is None:
+            virtual_table = {link: dl.virtual_node_expression(*link) for link in self.links}
+        nodes = {node for link in self.links for node in link}
+        self.__virtual = {v: link for link,v in virtual_table.items() if v not in nodes}
+        empty = np.zeros(0, dtype=np.int64)
+        self.__rows = [empty] * len(self.traffic)
+        self.__matrix = None
+        self.loads = np.zeros(len(self.links))
+        if paths is not None:
+            self.set_paths(paths)
+
+    @classmethod
+    def from_dat(cls, dat, paths=None, virtual_table=None):
+        """
+        Datのcapacity, traffic, DKから作成する
+        """
+        return cls(dat.capacity, dat.traffic, dat.DK, paths, virtual_table)
+
+    def _link(self, edge):
+        """
+        パスの辺をリンクの番号に直す
+        仮想ノードから出る辺(v,j)はNoneを返す
+        """
+        i, j = edge[0], edge[1]
+        if (i,j) in self.index:
+            return self.index[(i,j)]
+        if j in self.__virtual and self.__virtual[j][0] == i:
+            return self.index[self.__virtual[j]]
+        if i in self.__virtual and self.__virtual[i][1] == j:
+            return None
+        raise KeyError("no capacity for link {}".format((i,j)))
+
+    def link_ids(self, path):
+        """
+        パスが通るリンクの番号をnumpyの配列で返す
+        同じリンクは1回だけ含める
+
+        arguments:
+        * path(list or None)
+          辺のタプルを要素とするリスト。Noneはパスを割り当てないことを表す
+        """
+        if not path:
+            return np.zeros(0, dtype=np.int64)
+        ids = {self._link(e) for e in path}
+        ids.discard(None)
+        return np.array(sorted(ids), dtype=np.int64)
+
+    def set_paths(self, paths):
+        """
+        全デマンドのパスを設定して負荷を計算し直す
+        """
+        paths = list(paths)
+        if len(paths) != len(self.traffic):
+            raise ValueError("paths must have one entry per demand")
+        self.__rows = [self.link_ids(path) for path in paths]
+        self.__matrix = None
+        self.refresh()
+
+    def matrix(self):
+        """
+        デマンド×リンクの接続行列を返す
+        要素(k,l)はデマンドkのパスがリンクlを通るとき1
+        scipyがないときはNoneを返す
+        """
+        if csr_matrix is None:
+            return None
+        if self.__matrix is None:
+            lengths = [len(row) for row in self.__rows]
+            indptr = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+            indices = np.concatenate(self.__rows) if self.__rows else np.zeros(0, dtype=np.int64)
+            data = np.ones(len(indices))
+            self.__matrix = csr_matrix((data, indices, indptr),
+                                       shape=(len(self.__rows), len(self.links)))
+        return self.__matrix
+
+    def refresh(self):
+        """
+        接続行列から負荷を計算し直す
+        rerouteを繰り返したときの丸め誤差もなくなる
+        """
+        matrix = self.matrix()
+        if matrix is not None:
+            self.loads = matrix.T.dot(self.demands)
+        else:
+            lengths = [len(row) for row in self.__rows]
+            indices = np.concatenate(self.__rows) if self.__rows else np.zeros(0, dtype=np.int64)
+            weights = np.repeat(self.demands, lengths)
+            self.loads = np.bincount(indices, weights=weights, minlength=len(self.links)).astype(float)
+        return self.loads
+
+    def path_links(self, k):
+        """
+        デマンドkのパスが通るリンクのリストを返す
+        """
+        return [self.links[l] for l in self.__rows[k].tolist()]
+
+    def utilization(self):
+        """
+        リンクの使用率(負荷/容量)をnumpyの配列で返す
+        """
+        return self.loads / self.capacities
+
+    def max_utilization(self):
+        """
+        最大のリンク使用率を返す
+        """
+        if not self.links:
+            return 0.0
+        return float(np.max(self.utilization()))
+
+    def overloaded(self):
+        """
+        負荷が容量を超えたリンクを使用率の大きい順に返す
+
+        returns:
+        * links(list)
+          タプル((i,j), load, capacity)を要素とするリスト
+        """
+        utilization = self.utilization()
+        ids = np.flatnonzero(self.loads > self.capacities)
+        ids = ids[np.argsort(-utilization[ids], kind="stable")]
+        return [(self.links[l], float(self.loads[l]), float(self.capacities[l])) for l in ids.tolist()]
+
+    def evaluate(self, k, path):
+        """
+        デマンドkのパスをpathに変えたときの最大使用率を返す
+        負荷は変更しない
+        """
+        old, new = self.__rows[k], self.link_ids(path)
+        d = self.demands[k]
+        loads = self.loads.copy()
+        loads[old] -= d
+        loads[new] += d
+        if not self.links:
+            return 0.0
+        return float(np.max(loads / self.capacities))
+
+    def reroute(self, k, path):
+        """
+        デマンドkのパスをpathに変え、変わったリンクの負荷だけを更新する
+
+        returns:
+        * loads(numpy.ndarray)
+        """
+        old, new = self.__rows[k], self.link_ids(path)
+        d = self.demands[k]
+        self.loads[old] -= d
+        self.loads[new] += d
+        self.__rows[k] = new
+        self.__matrix = None
+        return self.loads
@@ -2,24 +2,67 @@
 
 """
 NetworkX like multiDiGraph implemented by Graphillion
+
+双方向リンクを持つグラフを、directed_link.pyと同じ仮想ノードの追加方法でGraphillionに読み込む
+仮想ノードのラベルはdirected_link.virtual_node_expressionで求めるので、
+ユニバースはdirected_link.append_virtual_nodes()と同じになる
+
+コンストラクタで以下の索引を1回だけ作成し、各メソッドは索引を参照する
+* 仮想ノードとリンクの対応
+* ユニバースでの各ノードの流入ノード(predecessor)、流出ノード(neighbor)、次数
+* 双方向のリンクと、各ノードに接続するユニバースの辺
+隣接関係を返すメソッドはO(次数)のイテレータとし、リストを返すメソッドはそのlistとする
+
+
+# 使い方
+G = MultiDiGraph(edgelist)          # GraphSet.set_universeも実行する
+paths = G.directed_paths(s, t)
+backups = G.disjoint_paths(paths, path, kind="bidirectional")
 """
 
-from __future__ import print_function
-from itertools import combinations
 from collections import defaultdict
-import math
-import random
+from itertools import combinations
 
 from graphillion import GraphSet
+from proposal_packages.directed_link import virtual_node_expression
 
 class MultiDiGraph:
     """
     双方向リンクを持つグラフ
     """
+    __slots__ = ("edgelist", "_table", "_virtual", "_links", "_nodes", "_pred", "_succ",
+                 "_pair_edges", "_node_edges", "_universe")
+
     def __init__(self, edgelist):
         self.edgelist = edgelist
-        virtual_nodes_graph = self.append_virtual_nodes()
-        GraphSet.set_universe(virtual_nodes_graph)
+        self._table = self.edges_table()
+        # key: 仮想ノードを経由する方向のリンク(i,j)
+        # value: 仮想ノード
+        self._virtual = {}
+        for e1,e2 in self._table.values():
+            self._virtual[e2[:2]] = virtual_node_expression(e2[0], e2[1])
+        self._links = {v: link for link,v in self._virtual.items()}
+        self._nodes = tuple(dict.fromkeys(node for i,j,w in edgelist for node in (i, j)))
+
+        pred = defaultdict(list)
+        succ = defaultdict(list)
+        pair_edges = defaultdict(list)
+        node_edges = defaultdict(list)
+        for i,j,w in self.append_virtual_nodes():
+            succ[i].append(j)
+            pred[j].append(i)
+            ends = {self._links.get(node, (node,)) for node in (i, j)}
+            ends = {node for end in ends for node in end}
+            for node in ends:
+                node_edges[node].append((i, j))
+            pair_edges[frozenset(ends)].append((i, j))
+        self._pred = {node: tuple(nodes) for node,nodes in pred.items()}
+        self._succ = {node: tuple(nodes) for node,nodes in succ.items()}
+        self._pair_edges = {pair: tuple(edges) for pair,edges in pair_edges.items()}
+        self._node_edges = {node: tuple(edges) for node,edges in node_edges.items()}
+
+        GraphSet.set_universe(self.append_virtual_nodes())
+        self._universe = GraphSet.universe()
 
     def edges_table(self):
         """
@@ -46,16 +89,21 @@ class MultiDiGraph:
         * virtual_nodes_graph(edge list)
           仮想ノードを追加したグラフの重み付き辺のタプルを要素とするリスト
         """
-        d = self.edges_table()
         virtual_nodes_graph = []
-        for e1,e2 in d.values():
+        for e1,e2 in self._table.values():
             i, j, w = e2[0], e2[1], e2[2]
-            v = (i,j)
+            v = self._virtual[(i,j)]
             virtual_nodes_graph += [e1, (i,v,w), (v,j,0)]
         return virtual_nodes_graph
 
     def universe(self):
-        return GraphSet.universe()
+        """
+        このグラフのユニバースを設定して返す
+        他のグラフのユニバースが設定されていたときはtraversal="as-is"で設定し直す
+        """
+        if GraphSet.universe() != self._universe:
+            GraphSet.set_universe(self._universe, traversal="as-is")
+        return self._universe
 
     def virtual_nodes(self):
         """
@@ -65,15 +113,19 @@ class MultiDiGraph:
         * v_nodes(nodes list)
           仮想ノードを格納したリスト
         """
-        d  = self.edges_table()
-        v_nodes = []
-        for e1,e2 in d.values():
-            i, j, w = e2[0], e2[1], e2[2]
-            v_nodes.append((i,j))
-        return v_nodes
+        return list(self.virtual_nodes_iter())
 
     def virtual_nodes_iter(self):
-        pass
+        """
+        仮想ノードを返すイテレータ
+        """
+        return iter(self._links)
+
+    def virtual_node_table(self):
+        """
+        キーがリンク(i,j)、値が(i,j)間の仮想ノードである辞書を返す
+        """
+        return dict(self._virtual)
 
     def original_nodes(self):
         """
@@ -83,11 +135,13 @@ class MultiDiGraph:
         * o_nodes(node set)
           仮想ノード追加前のグラフのノードを格納したリスト
         """
-        edges = [[i,j] for i,j,w in self.edgelist]
-        return set(reduce(lambda x,y: x + y, edges))
+        return set(self._nodes)
 
-    def original_nodes_iter():
-        pass
+    def original_nodes_iter(self):
+        """
+        仮想ノード追加前のグラフのノードを返すイテレータ
+        """
+        return iter(self._nodes)
 
     def predecessor_nodes(self, node):
         """
@@ -97,14 +151,7 @@ class MultiDiGraph:
         * predecessors(node list)
           predecessorノードを格納したリスト
         """
-        v_nodes = self.virtual_nodes()
-        predecessors = []
-        for i,j in v_nodes:
-            if node == i:
-                predecessors.append(j)
-            if node == j:
-                predecessors.append((i,j))
-        return predecessors
+        return list(self.predecessors_iter(node))
 
     def predecessors_iter(self, node):
         """
@@ -112,23 +159,119 @@ class MultiDiGraph:
 
         yields:
         * predecessors
-          predecessorノードを格納したリスト
+          predecessorノード
         """
-        v_nodes = self.virtual_nodes()
-        for i,j in v_nodes:
-            if node == i:
-                yield j
-            if node == j:
-                yield (i,j)
+        return iter(self._pred.get(node, ()))
 
     def neighbor_nodes(self, node):
-        pass
+        """
+        nodeの流出リンク(node, neighbor)を構成するノードneighborを返す
+
+        returns:
+        * neighbors(node list)
+          neighborノードを格納したリスト
+        """
+        return list(self.neighbors_iter(node))
 
     def neighbors_iter(self, node):
-        pass
+        """
+        nodeの流出リンク(node, neighbor)を構成するノードneighborを返す
+
+        yields:
+        * neighbor
+          neighborノード
+        """
+        return iter(self._succ.get(node, ()))
 
     def degree(self, node):
-        return len(GraphSet({}).graph_size(1).including(node))
+        """
+        ユニバースでnodeに接続する辺の数を返す
+        """
+        return len(self._pred.get(node, ())) + len(self._succ.get(node, ()))
+
+    def original_path(self, path):
+        """
+        仮想ノードを追加したグラフから求めたパスを元のグラフのリンクのリストに変換する
+        """
+        o_path = []
+        for i,j in path:
+            if i in self._links:
+                continue
+            o_path.append(self._links.get(j, (i,j)))
+        return o_path
+
+    def invalid_direction_elms(self, start_node, target_node):
+        """
+        rule1とrule2をまとめたグラフセット形式のリストを返す
+        """
+        elms = [[(p, start_node)] for p in self.predecessors_iter(start_node)]
+        for node in self._nodes:
+            if node == start_node or node == target_node:
+                continue
+            in_edges = [(p, node) for p in self.predecessors_iter(node)]
+            elms += [[e1, e2] for e1,e2 in combinations(in_edges, 2)]
+        return elms
+
+    def directed_paths(self, start_node, target_node, graphset=None):
+        """
+        有向性を考慮したパスだけを含むグラフセットを返す
+
+        arguments:
+        * start_node(node label)
+        * target_node(node label)
+        * graphset(GraphSet, optional)
+          パスを列挙する範囲。GraphSet.pathsのgraphsetに渡す
+
+        returns:
+        * di_paths(GraphSet)
+        """
+        self.universe()
+        elms = GraphSet(self.invalid_direction_elms(start_node, target_node))
+        return GraphSet.paths(start_node, target_node, graphset=graphset).excluding(elms)
+
+    def disjoint_elms(self, path, kind="link"):
+        """
+        disjoint_pathsで除外するグラフセット形式のリストを返す
+
+        arguments:
+        * path(list)
+          ユニバースの辺のリスト
+        * kind(string, optional)
+          "link", "bidirectional", "node"のいずれか
+          directed_link.disjoint_paths, bidirectional_disjoint_paths, node_disjoint_pathsに対応する
+        """
+        if kind == "link":
+            return [[e] for e in path]
+        if kind not in ("bidirectional", "node"):
+            raise ValueError("unknown kind {}".format(kind))
+        edges = set()
+        for i,j in self.original_path(path):
+            edges.update(self._pair_edges[frozenset((i, j))])
+        if kind == "node":
+            degree = defaultdict(int)
+            for i,j in path:
+                degree[i] += 1
+                degree[j] += 1
+            for node,d in degree.items():
+                if d == 2 and node not in self._links:
+                    edges.update(self._node_edges[node])
+        return [[e] for e in edges]
+
+    def disjoint_paths(self, paths, path, kind="link"):
+        """
+        パスのグラフセットから指定したパスと共有しないパスを求める
+
+        arguments:
+        * paths(GraphSet)
+        * path(list)
+        * kind(string, optional)
+          "link", "bidirectional", "node"のいずれか
+
+        returns:
+        * di_paths(GraphSet)
+        """
+        self.universe()
+        return paths.excluding(GraphSet(self.disjoint_elms(path, kind)))
 
 if __name__ == "__main__":
     edgelist = [(1,2,1),(1,3,2),(2,3,3),(2,4,4),(3,4,5),
@@ -141,3 +284,5 @@ if __name__ == "__main__":
     print("original_nodes", G.original_nodes())
     for p in G.predecessors_iter(1):
         print(p)
+    for path in G.directed_paths(1, 4):
+        print(G.original_path(path))
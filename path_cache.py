@@ -0,0 +1,164 @@
+"""
+date 2026.10.19
+branch master
+file path_cache.py
+
+有向パスのグラフセットをGraphSet.dumps()の形式でディスクにキャッシュする
+
+同じリンク構成のモデルデータ(e.g. cost239_EQ_200とデマンドだけが異なるdatファイル)では
+ユニバースも有向パスのグラフセットも同じになるので、2回目以降は計算せずに読み込む
+
+
+# キャッシュのキー
+* ユニバースのfingerprint
+  仮想ノードの追加方法と、set_universe後のGraphSet.universe()の辺の並びから求める
+  ZDDの構造は辺の重みに依存しないので重みは含めない
+* スタートノード、ターゲットノード
+* 問い合わせの種類(e.g. "directed_paths")
+
+# 容量の上限
+ファイルの更新時刻を最終利用時刻として使い、合計サイズがmax_bytesを超えたら
+最も古く使われたファイルから削除する(LRU)
+
+
+# 使い方
+1. directed_link.read_edgelist(edgelist)を実行する
+2. GraphSet.set_universe(directed_link.append_virtual_nodes())を実行する
+3. cache = PathCache(directory)を作成する
+4. cached_directed_paths(cache, s, t)を実行する
+"""
+
+import hashlib
+import os
+
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+def fingerprint(scheme="directed_link"):
+    """
+    現在のユニバースのfingerprintを返す
+
+    arguments:
+    * scheme(string, optional)
+      仮想ノードの追加方法を表す名前
+
+    returns:
+    * fingerprint(string)
+    """
+    h = hashlib.sha1(scheme.encode("utf-8"))
+    for e in GraphSet.universe():
+        h.update(repr((e[0], e[1])).encode("utf-8"))
+    return h.hexdigest()
+
+class PathCache:
+    """
+    PathCacheクラスは以下の属性を持つ
+    * directory
+      キャッシュファイルを置くディレクトリ
+    * max_bytes
+      キャッシュファイルの合計サイズの上限
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def filename(self, fp, start_node, target_node, query):
+        """
+        キーに対応するキャッシュファイルのパスを返す
+        """
+        key = repr((fp, start_node, target_node, query)).encode("utf-8")
+        return os.path.join(self.directory, hashlib.sha1(key).hexdigest() + ".zdd")
+
+    def get(self, fp, start_node, target_node, query):
+        """
+        キャッシュされたグラフセットを返す
+        キャッシュされていないときはNoneを返す
+        """
+        filename = self.filename(fp, start_node, target_node, query)
+        try:
+            with open(filename) as f:
+                data = f.read()
+        except IOError:
+            return None
+        os.utime(filename, None)
+        return GraphSet.loads(data)
+
+    def put(self, fp, start_node, target_node, query, graphset):
+        """
+        グラフセットをキャッシュに書き込み、容量の上限を超えた分を削除する
+        """
+        filename = self.filename(fp, start_node, target_node, query)
+        tmp = "{}.{}.tmp".format(filename, os.getpid())
+        with open(tmp, "w") as f:
+            f.write(graphset.dumps())
+        os.replace(tmp, filename)
+        self.evict()
+
+    def entries(self):
+        """
+        キャッシュファイルを最後に使われた順が古いものから返す
+
+        returns:
+        * entries(list)
+          タプル(最終利用時刻, サイズ, パス)を要素とするリスト
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".zdd"):
+                continue
+            filename = os.path.join(self.directory, name)
+            try:
+                st = os.stat(filename)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, filename))
+        entries.sort()
+        return entries
+
+    def size(self):
+        """
+        キャッシュファイルの合計サイズを返す
+        """
+        return sum(size for mtime,size,filename in self.entries())
+
+    def evict(self):
+        """
+        合計サイズがmax_bytes以下になるまで最も古く使われたファイルから削除する
+        """
+        entries = self.entries()
+        total = sum(size for mtime,size,filename in entries)
+        for mtime, size, filename in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+            total -= size
+
+def cached_directed_paths(cache, start_node, target_node, fp=None):
+    """
+    キャッシュがあれば読み込み、なければdirected_link.directed_pathsで求めてキャッシュする
+
+    arguments:
+    * cache(PathCache)
+    * start_node(node label)
+    * target_node(node label)
+    * fp(string, optional)
+      fingerprint()の返り値。複数のデマンドに使うときは先に求めて渡す
+
+    returns:
+    * di_paths(GraphSet)
+    """
+    if fp is None:
+        fp = fingerprint()
+    di_paths = cache.get(fp, start_node, target_node, "directed_paths")
+    if di_paths is None:
+        di_paths = dl.directed_paths(start_node, target_node)
+        cache.put(fp, start_node, target_node, "directed_paths", di_paths)
+    return di_paths
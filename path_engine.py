@@ -0,0 +1,229 @@
+"""
+date 2026.10.19
+branch master
+file path_engine.py
+
+Graphillionを使わずに有向単純パスを列挙するエンジンと、問い合わせごとにエンジンを選ぶ関数
+
+小さいグラフや疎なグラフでは、仮想ノードを追加したユニバースの設定、GraphSet.paths、
+rule1/rule2の除外にかかる時間のほうがパスの列挙そのものよりも長い
+このモジュールではCSR形式の隣接リストとビットマスクの訪問済み集合を使って深さ優先探索を行い、
+元のグラフのパスを直接返す
+
+
+# 動作概要
+* CSRGraph
+  ノードに0から番号をつけ、ノードkの流出リンクの終点をindices[indptr[k]:indptr[k+1]]に格納する
+* iter_simple_paths
+  訪問済みのノードをint型のビットマスクで管理し、スタックを使った深さ優先探索でパスを返す
+  ターゲットノードに到達したらその先は探索しない
+  このパス集合はdirected_link.directed_paths, directed_graph.directed_pathsと同じになる
+* select_engine
+  以下の順に判定する
+  1. ノード数がSMALL_GRAPH以下 -> "dfs"
+  2. sからtに到達できない -> "dfs"
+  3. 平均出次数がSPARSE_DEGREE以下 -> "dfs"
+  4. それ以外 -> "probe"
+     探索のステップ数をPROBE_STEPSまでに制限して深さ優先探索を行い、
+     終わらなければ"zdd"(directed_link.directed_paths)に切り替える
+
+
+# 使い方
+graph = CSRGraph(edgelist)
+paths = directed_paths(graph, s, t)
+"""
+
+from collections import deque
+
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+from proposal_packages.protection import ordered_path
+
+SMALL_GRAPH = 24
+SPARSE_DEGREE = 2.5
+PROBE_STEPS = 100000
+
+class StepLimitExceeded(Exception):
+    pass
+
+class CSRGraph:
+    """
+    CSRGraphクラスは以下の属性を持つ
+    * edgelist
+    * nodes
+      番号kのノードのラベルをnodes[k]に格納したリスト
+    * index
+      key: node label
+      value: 番号
+    * indptr, indices, costs
+      番号kのノードの流出リンクの終点の番号と重みを
+      indices[indptr[k]:indptr[k+1]], costs[indptr[k]:indptr[k+1]]に格納したリスト
+    """
+
+    def __init__(self, edgelist):
+        self.edgelist = edgelist
+        self.nodes = []
+        self.index = {}
+        for i,j,cost in edgelist:
+            for node in (i, j):
+                if node not in self.index:
+                    self.index[node] = len(self.nodes)
+                    self.nodes.append(node)
+        out_edges = [[] for _ in self.nodes]
+        for i,j,cost in edgelist:
+            out_edges[self.index[i]].append((self.index[j], cost))
+        self.indptr = [0]
+        self.indices = []
+        self.costs = []
+        for edges in out_edges:
+            for j, cost in edges:
+                self.indices.append(j)
+                self.costs.append(cost)
+            self.indptr.append(len(self.indices))
+        self.universe = None
+
+    @property
+    def num_nodes(self):
+        return len(self.nodes)
+
+    @property
+    def num_edges(self):
+        return len(self.indices)
+
+    def density(self):
+        """
+        平均出次数を返す
+        """
+        return self.num_edges / max(self.num_nodes, 1)
+
+    def hops(self, start_node, target_node):
+        """
+        sからtへの最小ホップ数を返す
+        到達できないときはNoneを返す
+        """
+        s, t = self.index[start_node], self.index[target_node]
+        dist = {s: 0}
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            if u == t:
+                return dist[u]
+            for k in range(self.indptr[u], self.indptr[u+1]):
+                v = self.indices[k]
+                if v not in dist:
+                    dist[v] = dist[u] + 1
+                    queue.append(v)
+        return None
+
+def iter_simple_paths(graph, start_node, target_node, max_steps=None):
+    """
+    sからtへの有向単純パスを返すジェネレータ
+
+    arguments:
+    * graph(CSRGraph)
+    * start_node(node label)
+    * target_node(node label)
+    * max_steps(int, optional)
+      探索で辺をたどる回数の上限。超えたらStepLimitExceededを送出する
+
+    yields:
+    * path(list)
+      スタートノードから順に並べた元のグラフの辺のリスト
+    """
+    indptr, indices, nodes = graph.indptr, graph.indices, graph.nodes
+    s, t = graph.index[start_node], graph.index[target_node]
+    if s == t:
+        return
+    route = [s]
+    positions = [indptr[s]]
+    visited = 1 << s
+    steps = 0
+    while positions:
+        u = route[-1]
+        k = positions[-1]
+        if k == indptr[u+1]:
+            route.pop()
+            positions.pop()
+            visited &= ~(1 << u)
+            continue
+        positions[-1] = k + 1
+        v = indices[k]
+        steps += 1
+        if max_steps is not None and steps > max_steps:
+            raise StepLimitExceeded(steps)
+        if visited >> v & 1:
+            continue
+        if v == t:
+            yield [(nodes[route[n]], nodes[route[n+1]]) for n in range(len(route) - 1)]\
+                + [(nodes[u], nodes[t])]
+            continue
+        route.append(v)
+        positions.append(indptr[v])
+        visited |= 1 << v
+
+def count_simple_paths(graph, start_node, target_node):
+    """
+    sからtへの有向単純パスの本数を返す
+    """
+    return sum(1 for path in iter_simple_paths(graph, start_node, target_node))
+
+def select_engine(graph, start_node, target_node):
+    """
+    問い合わせに使うエンジンを選ぶ
+
+    returns:
+    * engine(string)
+      "dfs"または"probe"
+    """
+    if graph.num_nodes <= SMALL_GRAPH:
+        return "dfs"
+    if graph.hops(start_node, target_node) is None:
+        return "dfs"
+    if graph.density() <= SPARSE_DEGREE:
+        return "dfs"
+    return "probe"
+
+def zdd_paths(graph, start_node, target_node):
+    """
+    directed_link.directed_pathsで求めたパスを元のグラフのパスのリストで返す
+    ユニバースがgraphのものでないときは設定し直す
+    """
+    if GraphSet.universe() != graph.universe or getattr(dl, "edgelist", None) is not graph.edgelist:
+        dl.read_edgelist(graph.edgelist)
+        if graph.universe is None:
+            GraphSet.set_universe(dl.append_virtual_nodes())
+            graph.universe = GraphSet.universe()
+        else:
+            GraphSet.set_universe(graph.universe, traversal="as-is")
+    return [ordered_path(dl.original_path(path), start_node)
+            for path in dl.directed_paths(start_node, target_node)]
+
+def directed_paths(graph, start_node, target_node, engine="auto", probe_steps=PROBE_STEPS):
+    """
+    sからtへの有向パスを元のグラフのパスのリストで返す
+
+    arguments:
+    * graph(CSRGraph)
+    * start_node(node label)
+    * target_node(node label)
+    * engine(string, optional)
+      "auto", "dfs", "zdd"のいずれか
+    * probe_steps(int, optional)
+      engine="auto"で"probe"となったときの探索のステップ数の上限
+
+    returns:
+    * paths(list)
+      スタートノードから順に並べた元のグラフの辺のリストを要素とするリスト
+    """
+    if engine == "auto":
+        engine = select_engine(graph, start_node, target_node)
+        if engine == "probe":
+            try:
+                return list(iter_simple_paths(graph, start_node, target_node, probe_steps))
+            except StepLimitExceeded:
+                engine = "zdd"
+    if engine == "dfs":
+        return list(iter_simple_paths(graph, start_node, target_node))
+    if engine == "zdd":
+        return zdd_paths(graph, start_node, target_node)
+    raise ValueError("unknown engine {}".format(engine))
@@ -0,0 +1,212 @@
+"""
+date 2026.10.19
+branch master
+file path_stats.py
+
+directed_link.directed_pathsで求めたパス集合をすべて列挙せずに
+ホップ数の分布とコストの分位点を求める
+
+
+# 動作概要
+
+## ホップ数の分布
+仮想ノードを追加したグラフではリンク(j,i)が(j,v),(v,i)の2本の辺になるので、
+graph_size(k)で数えた辺の本数は元のグラフのホップ数と一致しない
+そこで(v,i)の重みを0、それ以外の辺の重みを1とし、
+cost_eq(hop_weights, h)で元のグラフのホップ数がhのパス集合を取り出して数える
+ホップ数の範囲はmin_iter/max_iterで最初の1本だけを取り出して決める
+
+## コストの分位点
+* method="exact"
+  コストが整数のとき、cost_le(metric, b)の要素数が分位点に達する最小のbを二分探索で求める
+* method="sample"
+  ホップ数ごとのパス集合を層とし、層の大きさに比例した本数をrand_iterで一様に取り出す
+  取り出したパスのコストから分位点を求める
+最小値と最大値はmin_iter/max_iterで厳密に求める
+
+
+# 使い方
+1. directed_link.read_edgelist(edgelist)を実行する
+2. GraphSet.set_universe(directed_link.append_virtual_nodes())を実行する
+3. demand_table(traffic)を実行する
+"""
+
+import math
+
+import numpy as np
+import proposal_packages.directed_link as dl
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+def hop_weights():
+    """
+    元のグラフのホップ数を数えるための辺の重みを返す
+
+    returns:
+    * weights(dict)
+      key: 仮想ノードを追加したグラフの辺(i,j)
+      value: 仮想ノードから出る辺は0、それ以外は1
+    """
+    v_nodes = set(dl.virtual_nodes())
+    return {(i,j): 0 if i in v_nodes else 1 for i,j,cost in dl.append_virtual_nodes()}
+
+def metric_table():
+    """
+    キーが仮想ノードを追加したグラフの辺(i,j)、値がcostの辞書を返す
+    """
+    return {(i,j): cost for i,j,cost in dl.append_virtual_nodes()}
+
+def hop_histogram(paths, weights=None):
+    """
+    パス集合のホップ数ごとのパスの本数を返す
+
+    arguments:
+    * paths(GraphSet)
+    * weights(dict, optional)
+      hop_weightsの返り値。複数のパス集合に使うときは使い回す
+
+    returns:
+    * histogram(dict)
+      key: ホップ数
+      value: パスの本数
+    """
+    if weights is None:
+        weights = hop_weights()
+    if paths.len() == 0:
+        return {}
+    shortest = dl.total_cost(weights, next(paths.min_iter(weights)))
+    longest = dl.total_cost(weights, next(paths.max_iter(weights)))
+    histogram = {}
+    for h in range(shortest, longest + 1):
+        num = paths.cost_eq(weights, h).len()
+        if num > 0:
+            histogram[h] = num
+    return histogram
+
+def integral_metric(metric, scale=1):
+    """
+    cost_le, cost_eqで使えるように重みを整数に変換する
+    scale倍しても整数にならない重みがあるときはNoneを返す
+    """
+    converted = {}
+    for e, cost in metric.items():
+        scaled = cost * scale
+        if scaled != int(scaled):
+            return None
+        converted[e] = int(scaled)
+    return converted
+
+def _exact_percentiles(paths, metric, percentiles, lower, upper, total):
+    values = []
+    for q in percentiles:
+        rank = max(1, int(math.ceil(total * q / 100.0)))
+        lo, hi = lower, upper
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if paths.cost_le(metric, mid).len() >= rank:
+                hi = mid
+            else:
+                lo = mid + 1
+        values.append(lo)
+    return values
+
+def _sampled_percentiles(paths, metric, percentiles, num_samples, weights):
+    total = paths.len()
+    costs = []
+    for h, num in hop_histogram(paths, weights).items():
+        quota = max(1, int(round(num_samples * float(num) / total)))
+        stratum = paths.cost_eq(weights, h)
+        for k, path in enumerate(stratum.rand_iter()):
+            if k == quota:
+                break
+            costs.append((dl.total_cost(metric, path), float(num) / min(num, quota)))
+    costs.sort()
+    values = np.array([c for c,w in costs])
+    cumulative = np.cumsum([w for c,w in costs])
+    cumulative /= cumulative[-1]
+    return [float(values[np.searchsorted(cumulative, q / 100.0 - 1e-12)])
+            for q in percentiles]
+
+def cost_percentiles(paths, metric=None, percentiles=DEFAULT_PERCENTILES,
+                     method="exact", scale=1, num_samples=1000, weights=None):
+    """
+    パス集合のコストの最小値、分位点、最大値を返す
+
+    arguments:
+    * paths(GraphSet)
+    * metric(dict, optional)
+      key: 仮想ノードを追加したグラフの辺(i,j)
+      value: cost
+    * percentiles(tuple, optional)
+      求める分位点(0から100)
+    * method(string, optional)
+      "exact"または"sample"
+      "exact"でscale倍した重みが整数にならないときは"sample"で求める
+    * scale(int, optional)
+      "exact"で重みを整数に変換するときの倍率
+    * num_samples(int, optional)
+      "sample"で取り出すパスの本数の目安
+    * weights(dict, optional)
+      hop_weightsの返り値
+
+    returns:
+    * (min_cost, values, max_cost)(tuple)
+      valuesはpercentilesの順に並んだ分位点のリスト
+    """
+    if metric is None:
+        metric = metric_table()
+    if weights is None:
+        weights = hop_weights()
+    if paths.len() == 0:
+        nan = float("nan")
+        return nan, [nan for q in percentiles], nan
+    min_cost = dl.total_cost(metric, next(paths.min_iter(metric)))
+    max_cost = dl.total_cost(metric, next(paths.max_iter(metric)))
+
+    scaled = integral_metric(metric, scale) if method == "exact" else None
+    if scaled is not None:
+        values = _exact_percentiles(paths, scaled, percentiles,
+                                    int(round(min_cost * scale)),
+                                    int(round(max_cost * scale)),
+                                    paths.len())
+        values = [float(v) / scale for v in values]
+    else:
+        values = _sampled_percentiles(paths, metric, percentiles, num_samples, weights)
+    return min_cost, values, max_cost
+
+def demand_table(traffic, percentiles=DEFAULT_PERCENTILES, method="exact",
+                 scale=1, num_samples=1000):
+    """
+    すべてのデマンドについてホップ数の分布とコストの分位点をまとめた表を返す
+
+    arguments:
+    * traffic(list)
+      タプル(s,t)を要素とするリスト。Dat.trafficをそのまま渡せる
+    * percentiles, method, scale, num_samples
+      cost_percentilesの引数
+
+    returns:
+    * hops(numpy.ndarray)
+      shape (len(traffic), 最大ホップ数+1)
+      hops[k][h]はk番目のデマンドのホップ数がhのパスの本数
+    * costs(numpy.ndarray)
+      shape (len(traffic), len(percentiles)+3)
+      各行は[パスの本数, 最小値, 分位点..., 最大値]
+    """
+    weights = hop_weights()
+    metric = metric_table()
+    histograms = []
+    costs = np.zeros((len(traffic), len(percentiles) + 3))
+    for k, (s,t) in enumerate(traffic):
+        paths = dl.directed_paths(s, t)
+        histograms.append(hop_histogram(paths, weights))
+        min_cost, values, max_cost = cost_percentiles(paths, metric, percentiles,
+                                                      method, scale, num_samples, weights)
+        costs[k] = [float(paths.len()), min_cost] + values + [max_cost]
+
+    max_h = max([h for histogram in histograms for h in histogram] + [0])
+    hops = np.zeros((len(traffic), max_h + 1))
+    for k, histogram in enumerate(histograms):
+        for h, num in histogram.items():
+            hops[k][h] = num
+    return hops, costs
@@ -0,0 +1,288 @@
+"""
+date 2026.10.19
+branch master
+file preflight.py
+
+directed_link.directed_pathsを実行する前に計算量を見積もる
+
+スイープを始める前にトポロジーとデマンドごとにdirected_pathsが数ミリ秒で終わるのか
+数日かかるのかを知りたい
+このモジュールはZDDを作らずに、edgelistとユニバースの辺の順序から以下の値を求める
+
+
+# 見積もる値
+
+## トポロジー(Preflight.topology)
+* "nodes", "links"
+  元のグラフのノード数とリンク数
+* "universe_size"
+  仮想ノードを追加したユニバースの辺の数
+* "virtual_nodes"
+  仮想ノードの数
+* "frontier_width"
+  ユニバースの辺の順序でのフロンティアの幅の最大値(パス幅の上界)
+  k番目までの辺と(k+1)番目以降の辺の両方に接続するノードの数をk番目のフロンティアの幅とする
+  GraphSet.pathsの計算量はおおむねこの値の指数関数となる
+* "rule2_pairs"
+  rule2で除外するサブグラフの数の合計(全ノードの流入リンク数nについてのnC2の和)
+
+## デマンド(Preflight.demand)
+* "rule1", "rule2"
+  rule1, rule2で除外するサブグラフの数
+* "paths"
+  有向パスの本数の推定値
+  Knuthの方法でスタートノードからランダムウォークを行い、各ステップの分岐数の積を平均する
+  ターゲットノードに到達できないノードには進まない
+* "universe_length"
+  有向パスのユニバースでの辺の数の推定値の平均
+  逆方向のリンクは仮想ノードを経由するので2本と数える
+* "zdd_size"
+  ZDDのノード数の上界の推定値
+  パスの本数と辺の数の積(パスを1本ずつ並べたときのノード数)と、
+  フロンティアの幅w_kから求めた各段の状態数(w_k+2)^w_kの和のうち小さい方
+* "engine"
+  "dfs", "zdd", "ksp"のいずれか
+  推定したパスの本数がDFS_PATHS以下なら"dfs"(path_engine)、
+  推定したZDDのノード数がZDD_NODES以下なら"zdd"、それ以外は"ksp"(ksp.py)とする
+
+Preflightはallpairs.run, sharding.split_traffic, allpairs.scheduleのestimateとしても使える
+このときはパスの本数の推定値を計算量の見積もりとする
+
+
+# 使い方
+preflight = Preflight(edgelist)
+print(preflight.topology())
+print(preflight.demand(s, t))
+results = allpairs.all_pairs(edgelist, traffic, estimate=Preflight(edgelist))
+"""
+
+from collections import defaultdict, deque
+import math
+import random
+
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+from proposal_packages.path_engine import CSRGraph
+
+DFS_PATHS = 10 ** 5
+ZDD_NODES = 10 ** 8
+
+def universe_edges(edgelist):
+    """
+    directed_link.append_virtual_nodes()と同じ順序でユニバースの辺を返す
+    directed_link.edgelistは変更しない
+
+    returns:
+    * edges(list)
+      タプル(i,j)を要素とするリスト
+    """
+    primary = {}
+    reverse = {}
+    for i,j,cost in edgelist:
+        if (j,i) in primary:
+            reverse[(j,i)] = (i,j)
+        else:
+            primary[(i,j)] = True
+    edges = []
+    for e1 in primary:
+        edges.append(e1)
+        if e1 in reverse:
+            i, j = reverse[e1]
+            v = dl.virtual_node_expression(i, j)
+            edges += [(i,v), (v,j)]
+    return edges
+
+def frontier_widths(edges):
+    """
+    ユニバースの辺の順序での各段のフロンティアの幅を返す
+
+    arguments:
+    * edges(list)
+      タプル(i,j)を要素とするユニバースの辺のリスト
+
+    returns:
+    * widths(list)
+      widths[k]は0からk番目までの辺とk+1番目以降の辺の両方に接続するノードの数
+    """
+    first = {}
+    last = {}
+    for k, e in enumerate(edges):
+        for node in e[:2]:
+            first.setdefault(node, k)
+            last[node] = k
+    diff = [0] * (len(edges) + 1)
+    for node in first:
+        diff[first[node]] += 1
+        diff[last[node]] -= 1
+    widths = []
+    width = 0
+    for k in range(len(edges)):
+        width += diff[k]
+        widths.append(width)
+    return widths
+
+def _frontier_states(widths):
+    """
+    フロンティアの幅から求めた各段の状態数の和の自然対数を返す
+    """
+    logs = [w * math.log(w + 2) for w in widths]
+    top = max(logs + [0.0])
+    return top + math.log(sum(math.exp(x - top) for x in logs) + 1e-300)
+
+class Preflight:
+    """
+    Preflightクラスは以下の属性を持つ
+    * edgelist
+    * graph
+      path_engine.CSRGraph
+    * universe
+      ユニバースの辺のリスト
+      指定しないときは、GraphSet.universe()がこのedgelistのユニバースならその順序、
+      そうでなければdirected_link.append_virtual_nodes()の順序とする
+    * samples
+      ランダムウォークの回数
+    * seed
+    """
+
+    def __init__(self, edgelist, universe=None, samples=1000, seed=0):
+        self.edgelist = edgelist
+        self.graph = CSRGraph(edgelist)
+        self.samples = samples
+        self.seed = seed
+        if universe is None:
+            universe = universe_edges(edgelist)
+            current = [e[:2] for e in GraphSet.universe()]
+            if len(current) == len(universe) and \
+               {frozenset(e) for e in current} == {frozenset(e) for e in universe}:
+                universe = current
+        self.universe = [e[:2] for e in universe]
+        self.widths = frontier_widths(self.universe)
+        self.__log_states = _frontier_states(self.widths)
+        self.__in_degree = defaultdict(int)
+        for i,j in {(i,j) for i,j,cost in edgelist}:
+            self.__in_degree[j] += 1
+        self.__primary = set()
+        for i,j,cost in edgelist:
+            if (j,i) not in self.__primary:
+                self.__primary.add((i,j))
+        self.__r_edges = defaultdict(list)
+        for u in range(self.graph.num_nodes):
+            for k in range(self.graph.indptr[u], self.graph.indptr[u+1]):
+                self.__r_edges[self.graph.indices[k]].append(u)
+        self.__reach = {}
+        self.__demands = {}
+
+    def topology(self):
+        """
+        トポロジーの見積もりを返す
+
+        returns:
+        * estimate(dict)
+        """
+        links = {(i,j) for i,j,cost in self.edgelist}
+        return {"nodes": self.graph.num_nodes,
+                "links": len(links),
+                "universe_size": len(self.universe),
+                "virtual_nodes": len(links) - len(self.__primary),
+                "frontier_width": max(self.widths + [0]),
+                "rule2_pairs": sum(n * (n - 1) // 2 for n in self.__in_degree.values())}
+
+    def _reaches(self, target):
+        """
+        ターゲットノードに到達できるノードの番号のビットマスクを返す
+        """
+        if target not in self.__reach:
+            r_edges = self.__r_edges
+            mask = 1 << target
+            queue = deque([target])
+            while queue:
+                v = queue.popleft()
+                for u in r_edges[v]:
+                    if not mask >> u & 1:
+                        mask |= 1 << u
+                        queue.append(u)
+            self.__reach = {target: mask}
+        return self.__reach[target]
+
+    def _walk(self, s, t, reach, rng):
+        """
+        sからランダムウォークを1回行い、(分岐数の積, 分岐数の積*ユニバースでの辺の数)を返す
+        ターゲットノードに到達しなかったときは(0, 0)を返す
+        """
+        g = self.graph
+        nodes, primary = g.nodes, self.__primary
+        u = s
+        visited = 1 << s
+        weight = 1
+        length = 0
+        while True:
+            choices = [v for v in g.indices[g.indptr[u]:g.indptr[u+1]]
+                       if reach >> v & 1 and not visited >> v & 1]
+            if not choices:
+                return 0, 0
+            weight *= len(choices)
+            v = rng.choice(choices)
+            length += 1 if (nodes[u], nodes[v]) in primary else 2
+            if v == t:
+                return weight, weight * length
+            visited |= 1 << v
+            u = v
+
+    def path_count(self, start_node, target_node):
+        """
+        Knuthの方法で有向パスの本数と、ユニバースでの辺の数の合計を推定する
+
+        returns:
+        * (paths, edges)(tuple)
+        """
+        s, t = self.graph.index[start_node], self.graph.index[target_node]
+        if s == t:
+            return 0.0, 0.0
+        reach = self._reaches(t)
+        if not reach >> s & 1:
+            return 0.0, 0.0
+        rng = random.Random(self.seed)
+        paths, edges = 0, 0
+        for _ in range(self.samples):
+            weight, length = self._walk(s, t, reach, rng)
+            paths += weight
+            edges += length
+        return float(paths) / self.samples, float(edges) / self.samples
+
+    def demand(self, start_node, target_node):
+        """
+        デマンドの見積もりを返す
+
+        returns:
+        * estimate(dict)
+        """
+        key = (start_node, target_node)
+        if key in self.__demands:
+            return self.__demands[key]
+        paths, edges = self.path_count(start_node, target_node)
+        rule2 = sum(n * (n - 1) // 2 for node,n in self.__in_degree.items()
+                    if node not in key)
+        if paths > 0:
+            zdd_size = min(edges, math.exp(min(self.__log_states, 700)))
+            length = edges / paths
+        else:
+            zdd_size, length = 0.0, 0.0
+        if paths <= DFS_PATHS:
+            engine = "dfs"
+        elif zdd_size <= ZDD_NODES:
+            engine = "zdd"
+        else:
+            engine = "ksp"
+        self.__demands[key] = {"rule1": self.__in_degree[start_node],
+                               "rule2": rule2,
+                               "paths": paths,
+                               "universe_length": length,
+                               "zdd_size": zdd_size,
+                               "engine": engine}
+        return self.__demands[key]
+
+    def __call__(self, start_node, target_node):
+        """
+        allpairs.runのestimateとして使う
+        """
+        return self.demand(start_node, target_node)["paths"]
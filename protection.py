@@ -0,0 +1,402 @@
+"""
+date 2026.10.19
+branch master
+file protection.py
+
+1+1プロテクション用の現用パスと予備パスの組を求める
+
+予備パスは現用パスと双方向にリンクを共有しない
+つまりdirected_link.bidirectional_disjoint_pathsと同じ規則でdisjointとなる
+
+
+# 動作概要
+
+## 最適な組(k=1)
+Suurballe/Bhandari法で求める
+1. スタートノードからの最短パスP1をDijkstra法で求める
+2. 各リンクの重みを最短距離で補正し、P1のリンクを逆向きの重み0のリンクに置き換える
+   このときP1のリンクと逆向きの実リンクは取り除く(双方向disjointの条件)
+3. 補正後のグラフで最短パスP2を求める
+4. P1とP2で打ち消し合うリンクを取り除いて2本のパスに分解する
+GraphSetを一切使わないのでユニバースの設定は不要
+
+## 上位k個の組(k>1)
+directed_pathsのmin_iterで現用パスを重みの昇順に取り出し、
+現用パスごとに予備パス候補をmin_iterで遅延評価しながらヒープでマージする
+現用パスは組のうち重みの小さいほうとするので、現用パスの重みをcとすると組の重みは2c以上となる
+この下限がヒープの先頭を超えるまで新しい現用パスを取り出さない
+
+## node-disjointな組
+スタートノード、ターゲットノード以外の各ノードを重み0のリンクでつないだ2個のノードに分割し、
+分割後のグラフでSuurballe法を実行する
+
+
+# 使い方
+1. directed_link.read_edgelist(edgelist)を実行する
+2. k>1のときはGraphSet.set_universe(directed_link.append_virtual_nodes())を実行する
+3. protection_pairs(start_node, target_node, k)またはall_protection_pairs(traffic, k)を実行する
+   node-disjointな組はall_node_disjoint_pairs(traffic)で求める
+"""
+
+from collections import defaultdict
+from itertools import count
+import heapq
+
+import proposal_packages.directed_link as dl
+
+def cost_table(edgelist):
+    """
+    キーが(i,j)、値がcostの辞書を返す
+
+    arguments:
+    * edgelist(list)
+      重み付き辺のタプル(i,j,cost)を要素とするリスト
+
+    returns:
+    * costs(dict)
+      key: (i,j)
+      value: cost
+    """
+    return {(i,j): cost for i,j,cost in edgelist}
+
+def successors_table(edgelist):
+    """
+    キーがノードi、値が{j: cost}の辞書を返す
+
+    arguments:
+    * edgelist(list)
+
+    returns:
+    * succ(defaultdict)
+      key: i
+      value: {j: cost}
+    """
+    succ = defaultdict(dict)
+    for i,j,cost in edgelist:
+        succ[i][j] = cost
+    return succ
+
+def dijkstra(succ, start_node, target_node=None):
+    """
+    start_nodeから各ノードへの最短距離と最短パス木を求める
+    target_nodeを指定するとtarget_nodeが確定した時点で打ち切る
+
+    arguments:
+    * succ(dict)
+      successors_tableの返り値
+    * start_node(node label)
+    * target_node(node label, optional)
+
+    returns:
+    * dist(dict)
+      key: node
+      value: start_nodeからの最短距離
+    * prev(dict)
+      key: node
+      value: 最短パス木におけるnodeの直前のノード
+    """
+    dist = {start_node: 0}
+    prev = {}
+    done = set()
+    tie = count()
+    heap = [(0, next(tie), start_node)]
+    while heap:
+        d, _, u = heapq.heappop(heap)
+        if u in done:
+            continue
+        done.add(u)
+        if u == target_node:
+            break
+        for v, cost in succ.get(u, {}).items():
+            nd = d + cost
+            if v not in dist or nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(heap, (nd, next(tie), v))
+    return dist, prev
+
+def tree_path(prev, start_node, target_node):
+    """
+    最短パス木からstart_nodeからtarget_nodeへのパスを取り出す
+
+    returns:
+    * path(list)
+      スタートノードから順に並んだ辺(i,j)のリスト
+    """
+    path = []
+    node = target_node
+    while node != start_node:
+        path.append((prev[node], node))
+        node = prev[node]
+    path.reverse()
+    return path
+
+def ordered_path(o_path, start_node):
+    """
+    original_pathで得られる順不同の辺のリストをstart_nodeから順に並べ替える
+
+    arguments:
+    * o_path(list)
+      辺(i,j)を要素とするリスト
+    * start_node(node label)
+
+    returns:
+    * path(list)
+    """
+    succ = {i: j for i,j in o_path}
+    path = []
+    node = start_node
+    while node in succ:
+        path.append((node, succ[node]))
+        node = succ[node]
+    return path
+
+def _split_flow(arcs, start_node, target_node):
+    """
+    2本分のフローを構成する辺集合を2本のパスに分解する
+    ゼロ重みの閉路ができた場合は取り除く
+    """
+    out_arcs = defaultdict(list)
+    for i,j in arcs:
+        out_arcs[i].append(j)
+    paths = []
+    for _ in range(2):
+        path = []
+        position = {start_node: 0}
+        node = start_node
+        while node != target_node:
+            nxt = out_arcs[node].pop()
+            path.append((node, nxt))
+            if nxt in position:
+                del path[position[nxt]:]
+                position = {e[1]: k+1 for k,e in enumerate(path)}
+                position[start_node] = 0
+            else:
+                position[nxt] = len(path)
+            node = nxt
+        paths.append(path)
+    return paths
+
+def suurballe(succ, start_node, target_node):
+    """
+    重みの総和が最小となる双方向link-disjointなパスの組を求める
+
+    arguments:
+    * succ(dict)
+      successors_tableの返り値
+      重みは0以上とする
+    * start_node(node label)
+    * target_node(node label)
+
+    returns:
+    * pair(tuple or None)
+      (primary, backup, cost)
+      primary, backupはスタートノードから順に並んだ辺(i,j)のリスト
+      primaryは重みの小さいほうのパス
+      disjointな組が存在しないときはNone
+    """
+    dist, prev = dijkstra(succ, start_node)
+    if target_node not in dist:
+        return None
+    first = tree_path(prev, start_node, target_node)
+    used = set(first)
+
+    # 補正した重みで残余グラフを作る
+    residual = defaultdict(dict)
+    for i in dist:
+        for j, cost in succ.get(i, {}).items():
+            if (i,j) in used or (j,i) in used:
+                continue
+            residual[i][j] = cost + dist[i] - dist[j]
+    for i,j in first:
+        residual[j][i] = 0
+
+    _, prev2 = dijkstra(residual, start_node, target_node)
+    if target_node not in prev2:
+        return None
+    second = tree_path(prev2, start_node, target_node)
+
+    arcs = set(first)
+    for i,j in second:
+        if (j,i) in arcs:
+            arcs.remove((j,i))
+        else:
+            arcs.add((i,j))
+    p1, p2 = _split_flow(arcs, start_node, target_node)
+    c1 = sum(succ[i][j] for i,j in p1)
+    c2 = sum(succ[i][j] for i,j in p2)
+    if c2 < c1:
+        p1, p2, c1, c2 = p2, p1, c2, c1
+    return (p1, p2, c1 + c2)
+
+def split_nodes(succ, start_node, target_node):
+    """
+    スタートノード、ターゲットノード以外の各ノードxを(x,0),(x,1)に分割し、
+    重み0のリンク((x,0),(x,1))でつないだグラフを返す
+    リンク(i,j)は((i,1),(j,0))となる
+
+    arguments:
+    * succ(dict)
+    * start_node(node label)
+    * target_node(node label)
+
+    returns:
+    * split(defaultdict)
+      successors_tableと同じ形式の辞書
+    """
+    split = defaultdict(dict)
+    nodes = set()
+    for i, heads in succ.items():
+        nodes.add(i)
+        for j, cost in heads.items():
+            nodes.add(j)
+            split[(i,1)][(j,0)] = cost
+    for node in nodes - {start_node, target_node}:
+        split[(node,0)][(node,1)] = 0
+    return split
+
+def node_disjoint_pair(succ, start_node, target_node):
+    """
+    重みの総和が最小となるnode-disjointなパスの組を求める
+    ノードを分割したグラフでsuurballeを実行する
+
+    arguments:
+    * succ(dict)
+      successors_tableの返り値
+    * start_node(node label)
+    * target_node(node label)
+
+    returns:
+    * pair(tuple or None)
+      (primary, backup, cost)
+      node-disjointな組が存在しないときはNone
+    """
+    split = split_nodes(succ, start_node, target_node)
+    pair = suurballe(split, (start_node,1), (target_node,0))
+    if pair is None:
+        return None
+    primary, backup, cost = pair
+    primary = [(i[0], j[0]) for i,j in primary if i[0] != j[0]]
+    backup = [(i[0], j[0]) for i,j in backup if i[0] != j[0]]
+    return (primary, backup, cost)
+
+def all_node_disjoint_pairs(traffic):
+    """
+    trafficのすべてのデマンドについてnode-disjointなパスの組が存在するかを調べ、
+    存在するときは重みの総和が最小の組を返す
+    パス集合の列挙は行わない
+
+    arguments:
+    * traffic(list)
+      タプル(s,t)を要素とするリスト
+
+    returns:
+    * pairs(dict)
+      key: (s,t)
+      value: (primary, backup, cost)またはNone
+    """
+    succ = successors_table(dl.edgelist)
+    return {(s,t): node_disjoint_pair(succ, s, t) for s,t in traffic}
+
+def ranked_pairs(paths, metric_table, start_node, k):
+    """
+    パス集合から重みの総和が小さい順に双方向link-disjointなパスの組をk個求める
+
+    arguments:
+    * paths(GraphSet)
+      directed_pathsの返り値
+    * metric_table(dict)
+      key: 仮想ノードを追加したグラフの辺(i,j)
+      value: cost
+    * start_node(node label)
+    * k(int)
+
+    returns:
+    * pairs(list)
+      (primary, backup, cost)を要素とするリスト
+    """
+    def weight(path):
+        return dl.total_cost(metric_table, path)
+
+    def backups(primary, c_p):
+        candidates = dl.bidirectional_disjoint_paths(paths, primary)
+        for backup in candidates.min_iter(metric_table):
+            c_b = weight(backup)
+            if c_b >= c_p:
+                yield backup, c_b
+
+    primaries = paths.min_iter(metric_table)
+    next_primary = next(primaries, None)
+    tie = count()
+    heap = []
+    seen = set()
+    pairs = []
+    while len(pairs) < k:
+        while next_primary is not None:
+            c_p = weight(next_primary)
+            if heap and 2 * c_p > heap[0][0]:
+                break
+            stream = backups(next_primary, c_p)
+            head = next(stream, None)
+            if head is not None:
+                heapq.heappush(heap, (c_p + head[1], next(tie), next_primary, c_p, head[0], stream))
+            next_primary = next(primaries, None)
+        if not heap:
+            break
+        cost, _, primary, c_p, backup, stream = heapq.heappop(heap)
+        key = frozenset([frozenset(primary), frozenset(backup)])
+        if key not in seen:
+            seen.add(key)
+            pairs.append((ordered_path(dl.original_path(primary), start_node),
+                          ordered_path(dl.original_path(backup), start_node),
+                          cost))
+        head = next(stream, None)
+        if head is not None:
+            heapq.heappush(heap, (c_p + head[1], next(tie), primary, c_p, head[0], stream))
+    return pairs
+
+def protection_pairs(start_node, target_node, k=1):
+    """
+    重みの総和が小さい順に現用パスと予備パスの組をk個返す
+
+    arguments:
+    * start_node(node label)
+    * target_node(node label)
+    * k(int, optional)
+      k>1のときはGraphSet.set_universe(append_virtual_nodes())が実行済みであること
+
+    returns:
+    * pairs(list)
+      (primary, backup, cost)を要素とするリスト
+      primary, backupは元のグラフの辺(i,j)をスタートノードから順に並べたリスト
+    """
+    return all_protection_pairs([(start_node, target_node)], k)[(start_node, target_node)]
+
+def all_protection_pairs(traffic, k=1):
+    """
+    trafficのすべてのデマンドについて現用パスと予備パスの組をk個ずつ返す
+    辺の表はすべてのデマンドで共有する
+
+    arguments:
+    * traffic(list)
+      タプル(s,t)を要素とするリスト。Dat.trafficをそのまま渡せる
+    * k(int, optional)
+
+    returns:
+    * pairs(dict)
+      key: (s,t)
+      value: (primary, backup, cost)を要素とするリスト
+    """
+    pairs = {}
+    if k == 1:
+        succ = successors_table(dl.edgelist)
+        for s,t in traffic:
+            pair = suurballe(succ, s, t)
+            pairs[(s,t)] = [] if pair is None else [pair]
+        return pairs
+
+    metric_table = {(i,j): cost for i,j,cost in dl.append_virtual_nodes()}
+    for s,t in traffic:
+        paths = dl.directed_paths(s, t)
+        pairs[(s,t)] = ranked_pairs(paths, metric_table, s, k)
+    return pairs
@@ -0,0 +1,298 @@
+"""
+date 2026.10.19
+branch master
+file query.py
+
+GraphSetの操作を遅延評価するクエリ
+
+graphillion_utils.excluding_multi_elmsやdirected_link.disjoint_pathsのように
+excludingを何度も続けると、1回ごとに新しいZDDを作る
+Queryはpaths, including, excluding, graph_size, unionの操作を記録するだけで、
+graphset()やイテレーションのときにまとめて計算する
+
+
+# 動作概要
+1. 連続するフィルタ(including, excluding, graph_size)をまとめる
+   フィルタどうしは順序を入れ替えても結果が変わらないので、以下の順に並べ直す
+   * graph_size
+     最も安いので最初に行う。異なる大きさを指定したときは空のグラフセットとなる
+   * including
+     要素をグラフセット(家族)に直し、GraphSet.joinで1個にまとめる
+     A.including(F1).including(F2)はA.including(F1.join(F2))と等しい
+   * excluding
+     要素をグラフセットに直し、和集合をとって1回のexcludingにする
+     GraphSet.excluding(GraphSet)はself - self.including(GraphSet)で計算するので、
+     内部のsetsetのnon_supersetsを使えるGraphillion 2.xでは直接使う(NON_SUPERSETS)
+     5x6グリッドの双方向リンクに仮想ノードを追加したユニバースでGraphSet.paths(1, 30)
+     (約1.3*10^12本)から2辺のグラフ50個を除くとき、excludingを50回続けると約9.7秒、
+     GraphSet.excludingを1回で約7.0秒、non_supersetsでは約1.4秒だった
+     要素の少ない小さなグラフセットではどれも数ミリ秒で差はない
+2. cache=Trueを指定したときは、GraphSet.pathsから始まるクエリの結果をユニバースごとに
+   キャッシュする(graphillion_utils.universe_cache)
+   操作の列の先頭部分がキャッシュにあるときは、そこから残りの操作だけを計算する
+   キャッシュのキーでは要素の順序を区別しない
+   キャッシュした結果はユニバースが変わるかMAX_CACHED個に達するまで保持されるので、
+   デマンドごとのループで使い捨てるクエリには指定しない
+   GraphSetから始まるクエリはキャッシュしない
+
+要素はGraphSet.excludingと同じく、GraphSet、グラフ(辺のlist, set)、辺(tuple)、頂点を指定できる
+頂点は接続する辺1本ずつからなるグラフセットに直す
+
+
+# 使い方
+q = Query.paths(s, t).excluding(GraphSet(elms)).excluding((i,j)).graph_size(4)
+for path in q:
+    print(path)
+gs = q.graphset()
+base = Query.directed_paths(s, t, cache=True)    # 同じデマンドで何度も使うときはキャッシュする
+
+Queryはincluding, excludingを持つので、directed_link.disjoint_pathsなどにそのまま渡せる
+q = dl.bidirectional_disjoint_paths(Query.directed_paths(s, t), path)
+"""
+
+import graphillion
+from graphillion import GraphSet
+
+try:
+    from graphillion.universe import Universe
+except ImportError:
+    Universe = None
+
+import proposal_packages.directed_link as dl
+import proposal_packages.graphillion_utils as gu
+
+# キャッシュするグラフセットの数の上限
+MAX_CACHED = 1024
+
+FILTERS = ("including", "excluding", "graph_size")
+
+def _has_non_supersets():
+    """
+    内部のsetset.non_supersets(e_objtable, setset)を使えるかを返す
+    Graphillion 2.xのGraphSet.excludingと同じ呼び出し方なので、2.x以外では使わない
+    """
+    version = getattr(graphillion, "__version__", "")
+    if Universe is None or not version.startswith("2."):
+        return False
+    return hasattr(GraphSet()._ss, "non_supersets")
+
+NON_SUPERSETS = _has_non_supersets()
+
+def _element_key(obj):
+    """
+    要素をキャッシュのキーに直す
+    GraphSetはオブジェクトの識別子で区別する
+    """
+    if isinstance(obj, GraphSet):
+        return ("graphset", id(obj))
+    if isinstance(obj, (list, set, frozenset)):
+        return ("graph", frozenset(frozenset(e[:2]) for e in obj))
+    if isinstance(obj, tuple):
+        return ("edge", frozenset(obj[:2]))
+    return ("vertex", obj)
+
+def _family(obj):
+    """
+    要素をグラフセットに直す
+    """
+    if isinstance(obj, GraphSet):
+        return obj
+    if isinstance(obj, (list, set, frozenset)):
+        return GraphSet([[e[:2] for e in obj]])
+    if isinstance(obj, tuple):
+        return GraphSet([[obj[:2]]])
+    edges = gu.universe_index().incident(obj)
+    if not edges:
+        raise KeyError(obj)
+    return GraphSet([[e] for e in edges])
+
+def _non_supersets(graphset, family):
+    """
+    familyのいずれかのグラフを含むグラフをgraphsetから除く
+    """
+    if NON_SUPERSETS:
+        return GraphSet(graphset._ss.non_supersets(Universe.e_objtable, family._ss))
+    return graphset.excluding(family)
+
+class Query:
+    """
+    Queryクラスは以下の属性を持つ
+    * source
+      ("graphset", GraphSet)または("paths", s, t)
+    * steps
+      操作のタプル(name, arg)のタプル
+      nameは"including", "excluding", "graph_size", "union"のいずれか
+    * cache
+      Trueのとき結果をユニバースごとにキャッシュする
+    """
+
+    def __init__(self, source, steps=(), cache=False):
+        if isinstance(source, GraphSet):
+            source = ("graphset", source)
+        self.source = source
+        self.steps = tuple(steps)
+        self.cache = cache
+
+    @classmethod
+    def paths(cls, start_node, target_node, cache=False):
+        """
+        GraphSet.paths(s, t)から始まるクエリを返す
+        """
+        return cls(("paths", start_node, target_node), cache=cache)
+
+    @classmethod
+    def directed_paths(cls, start_node, target_node, cache=False):
+        """
+        directed_link.directed_paths(s, t)と同じグラフセットを表すクエリを返す
+        """
+        elms = GraphSet(dl.invalid_direction_elms(start_node, target_node))
+        return cls.paths(start_node, target_node, cache).excluding(elms)
+
+    def _add(self, name, arg):
+        return Query(self.source, self.steps + ((name, arg),), self.cache)
+
+    def including(self, obj):
+        return self._add("including", obj)
+
+    def excluding(self, obj):
+        return self._add("excluding", obj)
+
+    def graph_size(self, size):
+        return self._add("graph_size", size)
+
+    def union(self, other):
+        """
+        otherとの和集合を表すクエリを返す
+        otherはQueryかGraphSet
+        """
+        if isinstance(other, GraphSet):
+            other = Query(other)
+        return self._add("union", other)
+
+    __or__ = union
+
+    @staticmethod
+    def _plan(steps):
+        """
+        操作の列を連続するフィルタごとにまとめる
+
+        returns:
+        * stages(list)
+          タプル(name, args)を要素とするリスト
+          nameは"graph_size", "including", "excluding", "union"のいずれか
+        """
+        stages = []
+        run = []
+
+        def flush():
+            sizes = tuple(sorted({arg for name,arg in run if name == "graph_size"}))
+            if sizes:
+                stages.append(("graph_size", sizes))
+            for name in ("including", "excluding"):
+                args = tuple(arg for n,arg in run if n == name)
+                if args:
+                    stages.append((name, args))
+            del run[:]
+
+        for step in steps:
+            if step[0] in FILTERS:
+                run.append(step)
+            else:
+                flush()
+                stages.append((step[0], (step[1],)))
+        flush()
+        return stages
+
+    def _source_key(self):
+        if self.source[0] == "graphset":
+            return ("graphset", id(self.source[1]))
+        return self.source
+
+    @staticmethod
+    def _stage_key(stage):
+        name, args = stage
+        if name in ("including", "excluding"):
+            return (name, frozenset(_element_key(arg) for arg in args))
+        if name == "union":
+            return (name, args[0].key())
+        return stage
+
+    def key(self, steps=None):
+        """
+        キャッシュのキーを返す
+        """
+        if steps is None:
+            steps = self.steps
+        return (self._source_key(),) + tuple(self._stage_key(stage) for stage in self._plan(steps))
+
+    def _evaluate_source(self):
+        if self.source[0] == "graphset":
+            return self.source[1]
+        return GraphSet.paths(self.source[1], self.source[2])
+
+    @staticmethod
+    def _apply(graphset, stage):
+        name, args = stage
+        if name == "graph_size":
+            if len(args) > 1:
+                return GraphSet()
+            return graphset.graph_size(args[0])
+        if name == "including":
+            families = [_family(arg) for arg in args]
+            family = families[0]
+            for other in families[1:]:
+                family = family.join(other)
+            return graphset.including(family)
+        if name == "excluding":
+            family = GraphSet()
+            for arg in args:
+                family |= _family(arg)
+            return _non_supersets(graphset, family)
+        if name == "union":
+            return graphset | args[0].graphset()
+        raise ValueError("unknown stage {}".format(name))
+
+    def cacheable(self):
+        """
+        結果をキャッシュするかを返す
+        GraphSetから始まるクエリは呼び出し側で使い捨てることが多いのでキャッシュしない
+        """
+        return self.cache and self.source[0] == "paths"
+
+    def graphset(self):
+        """
+        クエリを計算してグラフセットを返す
+        """
+        if not self.cacheable():
+            graphset = self._evaluate_source()
+            for stage in self._plan(self.steps):
+                graphset = self._apply(graphset, stage)
+            return graphset
+        cache = gu.universe_cache().setdefault("query", {})
+        key = self.key()
+        if key in cache:
+            return cache[key][0]
+        graphset = None
+        for k in range(len(self.steps), -1, -1):
+            prefix_key = self.key(self.steps[:k])
+            if prefix_key in cache:
+                graphset = cache[prefix_key][0]
+                rest = self.steps[k:]
+                break
+        if graphset is None:
+            graphset = self._evaluate_source()
+            rest = self.steps
+            cache[self.key(())] = (graphset, Query(self.source))
+        for stage in self._plan(rest):
+            graphset = self._apply(graphset, stage)
+        if len(cache) >= MAX_CACHED:
+            cache.clear()
+        # 識別子をキーに使ったGraphSetが解放されないように参照を保持する
+        cache[key] = (graphset, self)
+        return graphset
+
+    def __iter__(self):
+        return iter(self.graphset())
+
+    def len(self):
+        return self.graphset().len()
@@ -0,0 +1,238 @@
+"""
+date 2026.10.19
+branch master
+file sharding.py
+
+デマンドのリストをシャードに分割し、シャードごとに別のプロセスや別のマシンで計算する
+マシン間のやりとりは共有ファイルシステム上のディレクトリだけで行う
+
+
+# ディレクトリの構成
+* manifest.json
+  edgelist、計算の種類、シャードごとのデマンドのリスト
+* shard-00000.json
+  シャード0の計算結果
+* shard-00000.failed
+  シャード0の計算に失敗したときのトレースバック
+
+結果はいったん一時ファイルに書き込んでからos.replaceで置き換えるので、
+途中まで書き込まれた結果ファイルが読まれることはない
+
+
+# 使い方
+1. write_manifest(directory, edgelist, traffic, num_shards)を実行する
+   コマンドラインからは
+   python -m proposal_packages.sharding plan directory datfile num_shards
+2. 各マシンでrun_shard(directory, shard_id)を実行する
+   python -m proposal_packages.sharding run directory shard_id
+   途中の状態は以下で確かめる
+   python -m proposal_packages.sharding status directory
+3. merge(directory)で結果をまとめる
+   python -m proposal_packages.sharding merge directory output
+   終わったシャードの結果と、結果のないシャード、失敗したシャードの番号をoutputにJSONで書き込む
+   すべてのシャードが終わっていないときは終了ステータス1で終わる
+"""
+
+import argparse
+import json
+import os
+import sys
+import traceback
+
+import proposal_packages.allpairs as allpairs
+
+MANIFEST = "manifest.json"
+
+def shard_name(directory, shard_id, suffix="json"):
+    """
+    シャードの結果ファイルのパスを返す
+    """
+    return os.path.join(directory, "shard-{:05d}.{}".format(shard_id, suffix))
+
+def split_traffic(traffic, num_shards, estimate=None):
+    """
+    デマンドのリストを決定的にシャードに分割する
+    見積もりの大きい順に並べてからシャードに順番に割り当てる
+
+    arguments:
+    * traffic(list)
+    * num_shards(int)
+    * estimate(function, optional)
+      estimate(s, t)でデマンドの計算量の見積もりを返す関数
+
+    returns:
+    * shards(list)
+      デマンドのリストを要素とするリスト
+    """
+    if estimate is not None:
+        traffic = allpairs.schedule(traffic, estimate)
+    shards = [[] for _ in range(num_shards)]
+    for k, demand in enumerate(traffic):
+        shards[k % num_shards].append(demand)
+    return shards
+
+def _write_json(filename, data):
+    tmp = "{}.{}.tmp".format(filename, os.getpid())
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, filename)
+
+def write_manifest(directory, edgelist, traffic, num_shards, mode="count", k=10):
+    """
+    マニフェストを書き込む
+
+    arguments:
+    * directory(string)
+      共有ファイルシステム上のディレクトリ
+    * edgelist(list)
+    * traffic(list)
+      タプル(s,t)を要素とするリスト。Dat.trafficをそのまま渡せる
+    * num_shards(int)
+    * mode(string, optional)
+      allpairs.all_pairsのmode
+    * k(int, optional)
+
+    returns:
+    * manifest(dict)
+    """
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    shards = split_traffic(list(traffic), num_shards, allpairs.hop_estimate(edgelist))
+    manifest = {"edgelist": [list(e) for e in edgelist],
+                "mode": mode,
+                "k": k,
+                "shards": [[list(demand) for demand in shard] for shard in shards]}
+    _write_json(os.path.join(directory, MANIFEST), manifest)
+    return manifest
+
+def read_manifest(directory):
+    """
+    マニフェストを読み込む
+    """
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+    manifest["edgelist"] = [tuple(e) for e in manifest["edgelist"]]
+    manifest["shards"] = [[tuple(demand) for demand in shard] for shard in manifest["shards"]]
+    return manifest
+
+def run_shard(directory, shard_id, processes=None):
+    """
+    1個のシャードを計算して結果ファイルを書き込む
+    失敗したときはトレースバックを書き込んでから例外を送出する
+
+    arguments:
+    * directory(string)
+    * shard_id(int)
+    * processes(int, optional)
+      シャードの中でさらにプロセスプールを使うときに指定する
+    """
+    manifest = read_manifest(directory)
+    failed = shard_name(directory, shard_id, "failed")
+    if os.path.exists(failed):
+        os.remove(failed)
+    try:
+        traffic = manifest["shards"][shard_id]
+        results = allpairs.all_pairs(manifest["edgelist"], traffic, manifest["mode"],
+                                     manifest["k"], processes)
+        _write_json(shard_name(directory, shard_id),
+                    {"shard": shard_id,
+                     "results": [[list(demand), results[demand]] for demand in traffic]})
+    except Exception:
+        with open(failed, "w") as f:
+            f.write(traceback.format_exc())
+        raise
+
+def status(directory):
+    """
+    各シャードの状態を返す
+
+    returns:
+    * (done, missing, failed)(tuple)
+      それぞれシャード番号のリスト
+    """
+    manifest = read_manifest(directory)
+    done, missing, failed = [], [], []
+    for shard_id in range(len(manifest["shards"])):
+        if os.path.exists(shard_name(directory, shard_id, "failed")):
+            failed.append(shard_id)
+        elif os.path.exists(shard_name(directory, shard_id)):
+            done.append(shard_id)
+        else:
+            missing.append(shard_id)
+    return done, missing, failed
+
+def _restore(result, mode):
+    if mode == "topk":
+        return [([tuple(e) for e in path], cost) for path,cost in result]
+    return result
+
+def merge(directory):
+    """
+    終わったシャードの結果をまとめる
+
+    arguments:
+    * directory(string)
+
+    returns:
+    * results(dict)
+      key: (s,t)
+      value: allpairs.all_pairsと同じ形式の結果
+    * missing(list)
+      結果ファイルがないシャード番号のリスト
+    * failed(list)
+      計算に失敗したシャード番号のリスト
+    """
+    manifest = read_manifest(directory)
+    done, missing, failed = status(directory)
+    results = {}
+    for shard_id in done:
+        with open(shard_name(directory, shard_id)) as f:
+            data = json.load(f)
+        for demand, result in data["results"]:
+            results[tuple(demand)] = _restore(result, manifest["mode"])
+    return results, missing, failed
+
+if __name__ == "__main__":
+    from proposal_packages.dat_utils import Dat
+
+    parser = argparse.ArgumentParser(description="デマンドをシャードに分割して有向パスを計算します")
+    subparsers = parser.add_subparsers(dest="command")
+    plan = subparsers.add_parser("plan", help="datファイルからマニフェストを書き込みます")
+    plan.add_argument("directory", type=str)
+    plan.add_argument("dat", type=str)
+    plan.add_argument("num_shards", type=int)
+    plan.add_argument("--mode", type=str, default="count")
+    plan.add_argument("-k", type=int, default=10)
+    run = subparsers.add_parser("run", help="1個のシャードを計算します")
+    run.add_argument("directory", type=str)
+    run.add_argument("shard_id", type=int)
+    run.add_argument("--processes", type=int, default=None)
+    check = subparsers.add_parser("status", help="シャードの状態を表示します")
+    check.add_argument("directory", type=str)
+    collect = subparsers.add_parser("merge", help="終わったシャードの結果をまとめて書き込みます")
+    collect.add_argument("directory", type=str)
+    collect.add_argument("output", type=str)
+    args = parser.parse_args()
+
+    if args.command == "plan":
+        dat = Dat(args.dat)
+        write_manifest(args.directory, dat.cost, dat.traffic, args.num_shards, args.mode, args.k)
+    elif args.command == "run":
+        run_shard(args.directory, args.shard_id, args.processes)
+    elif args.command == "status":
+        done, missing, failed = status(args.directory)
+        print("done", done)
+        print("missing", missing)
+        print("failed", failed)
+    elif args.command == "merge":
+        results, missing, failed = merge(args.directory)
+        _write_json(args.output, {"results": [[list(demand), result] for demand,result in results.items()],
+                                  "missing": missing,
+                                  "failed": failed})
+        print("merged", len(results))
+        print("missing", missing)
+        print("failed", failed)
+        if missing or failed:
+            sys.exit(1)
+    else:
+        parser.error("plan, run, status, mergeのいずれかを指定してください")
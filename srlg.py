@@ -0,0 +1,193 @@
+"""
+date 2026.10.19
+branch master
+file srlg.py
+
+共通のリスク要因を持つリンクの集合(SRLG, shared risk link group)を考慮した
+disjoint pathを求める
+
+同じ管路を通るリンクは同時に故障するので、双方向link-disjointなだけでは予備パスとして不十分である
+参照パスが通るリンクとSRLGを共有するリンクをすべて除外する
+
+
+# SRLGファイルの形式
+1行に1本のリンクを書く
+元のグラフのリンクの構成ノードi,jに続けて、そのリンクが属するSRLGのラベルを空白区切りで並べる
+リンクは双方向とみなすので(i,j)と(j,i)のどちらを書いてもよい
+#から始まる行は読み飛ばす
+
+e.g.
+# i j groups
+0 1 conduit_a
+1 2 conduit_a conduit_b
+2 3 conduit_b
+
+
+# 動作概要
+リンクとそのリンクを双方向に構成するユニバースの辺(i,j),(j,v),(v,i)の対応表は
+ユニバースごとに1回だけ作る(link_edges_table)
+SRLG.__init__でSRLGごとに除外すべきグラフセットを作り、
+さらにリンクごとに自分自身と同じSRLGに属するリンクをまとめたグラフセットを作っておく
+パスを指定したときは、パスを構成するリンクのグラフセットの和集合をとり、
+excludingを1回だけ実行する
+
+
+# 使い方
+1. directed_link.read_edgelist(edgelist)を実行する
+2. GraphSet.set_universe(directed_link.append_virtual_nodes())を実行する
+3. srlg = SRLG(read_srlg(srlgfile))を実行する
+4. srlg.disjoint_paths(paths, path)を実行する
+"""
+
+from functools import reduce
+from collections import defaultdict
+
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.graphillion_utils as gu
+
+def read_srlg(srlgfile):
+    """
+    SRLGファイルを読み込む
+
+    arguments:
+    * srlgfile(string)
+
+    returns:
+    * groups(dict)
+      key: リンク(i,j)
+      value: リンクが属するSRLGのラベルのリスト
+    """
+    groups = {}
+    f = open(srlgfile)
+    try:
+        for line in f:
+            line = line.strip()
+            if len(line) == 0 or line.startswith("#"):
+                continue
+            params = line.split()
+            groups[(int(params[0]), int(params[1]))] = params[2:]
+    finally:
+        f.close()
+    return groups
+
+def link_edges_table():
+    """
+    リンクを双方向に構成するユニバースの辺の対応表を返す
+    現在のユニバースで1回だけ作成し、graphillion_utils.universe_cacheに保存する
+
+    returns:
+    * table(dict)
+      key: 元のグラフのリンク(i,j), (j,i)と、ユニバースの辺(i,j), (j,v), (v,i)
+      value: タプル((i,j), (j,v), (v,i))
+      (i,j)はdirected_link.edges_tableのキーの向き
+    """
+    cache = gu.universe_cache()
+    if "link_edges" not in cache:
+        table = {}
+        for e1,e2 in dl.edges_table().values():
+            i, j = e1[0], e1[1]
+            v = dl.virtual_node_expression(j, i)
+            edges = ((i,j), (j,v), (v,i))
+            for key in ((i,j), (j,i)) + edges:
+                table[key] = edges
+        cache["link_edges"] = table
+    return cache["link_edges"]
+
+class SRLG:
+    """
+    SRLGクラスは以下の属性を持つ
+    * links
+      key: SRLGのラベル
+      value: SRLGに属するリンク(i,j)の集合
+    * group_elms
+      key: SRLGのラベル
+      value: SRLGに属するリンクを双方向に除外するグラフセット
+    * link_elms
+      key: リンク(i,j)
+      value: リンク自身とリンクとSRLGを共有するリンクを双方向に除外するグラフセット
+
+    リンク(i,j)はdirected_link.edges_tableのキーの向きにそろえる
+    GraphSet.set_universe(directed_link.append_virtual_nodes())を実行してから作成すること
+    """
+
+    def __init__(self, groups):
+        self.__table = link_edges_table()
+
+        self.links = defaultdict(set)
+        for link, labels in groups.items():
+            for label in labels:
+                self.links[label].add(self.__table[link][0])
+
+        self.group_elms = {}
+        for label, links in self.links.items():
+            self.group_elms[label] = GraphSet(self.__elms(links))
+
+        self.__link_groups = defaultdict(set)
+        for label, links in self.links.items():
+            for link in links:
+                self.__link_groups[link].add(label)
+
+        self.link_elms = {}
+        for link in {edges[0] for edges in self.__table.values()}:
+            families = [self.group_elms[label] for label in self.__link_groups[link]]
+            self.link_elms[link] = reduce(lambda x,y: x | y, families,
+                                          GraphSet(self.__elms([link])))
+
+    def __elms(self, links):
+        """
+        linksを双方向に除外するグラフセット形式のリストを返す
+        """
+        return [[e] for link in links for e in self.__table[link]]
+
+    def shared_links(self, path):
+        """
+        pathを構成するリンクとSRLGを共有するリンクを返す
+
+        arguments:
+        * path(list)
+          仮想ノードを追加したグラフのパス
+
+        returns:
+        * links(set)
+          リンク(i,j)の集合
+        """
+        links = set()
+        for link in self.path_links(path):
+            links.add(link)
+            for label in self.__link_groups.get(link, ()):
+                links |= self.links[label]
+        return links
+
+    def path_links(self, path):
+        """
+        pathを構成するリンクをedges_tableのキーの向きで返す
+        """
+        return {self.__table[e][0] for e in path}
+
+    def exclusion(self, path):
+        """
+        pathとSRLGを共有するパスを除外するためのグラフセットを返す
+
+        arguments:
+        * path(list)
+
+        returns:
+        * elms(GraphSet)
+        """
+        families = [self.link_elms[link] for link in self.path_links(path)]
+        return reduce(lambda x,y: x | y, families, GraphSet())
+
+    def disjoint_paths(self, paths, path):
+        """
+        パスのグラフセットから指定したパスとSRLGを共有しないパスを求める
+        双方向link-disjointの条件も含む
+
+        arguments:
+        * paths(GraphSet)
+        * path(list)
+
+        returns:
+        * di_paths(GraphSet)
+        """
+        return paths.excluding(self.exclusion(path))
@@ -0,0 +1,109 @@
+"""
+date 2026.10.19
+branch master
+file test_allpairs.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import time
+import proposal_packages.allpairs as ap
+
+def slow_or_fail(start_node, target_node):
+    if start_node == 1:
+        raise RuntimeError(target_node)
+    time.sleep(1)
+    return start_node
+
+class TestAllPairs:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50)]
+
+    def setup(self):
+        dl.read_edgelist(self.edgelist)
+        GraphSet.set_universe(dl.append_virtual_nodes())
+
+    def teardown(self):
+        pass
+
+    @raises(RuntimeError)
+    def test_worker_error(self):
+        # 例外は残りのデマンドの終了を待たずに伝わる
+        traffic = [(1,2)] + [(s,t) for s in (2,3,4) for t in (1,2,3,4) if s != t]
+        started = time.time()
+        try:
+            list(ap.run(self.edgelist, traffic, slow_or_fail, processes=2,
+                        estimate=lambda s,t: s == 1))
+        finally:
+            ok_(time.time() - started < 4)
+
+    def test_close_early(self):
+        traffic = [(s,t) for s in (2,3,4) for t in (1,2,3,4) if s != t]
+        started = time.time()
+        results = ap.run(self.edgelist, traffic, slow_or_fail, processes=2)
+        next(results)
+        results.close()
+        ok_(time.time() - started < 4)
+
+    @raises(ValueError)
+    def test_invalid_edgelist(self):
+        # 逆向きのリンクがないとワーカーの初期化に失敗するので、プールを作る前に例外を出す
+        list(ap.run([(1,2,10), (2,3,20)], [(1,3)], ap.count_paths, processes=2))
+
+    def test_hop_estimate(self):
+        estimate = ap.hop_estimate(self.edgelist)
+        eq_(estimate(1, 2), 1)
+        eq_(estimate(1, 4), 2)
+        eq_(ap.schedule([(1,2), (1,4)], estimate), [(1,4), (1,2)])
+
+    def test_count(self):
+        results = ap.all_pairs(self.edgelist)
+        eq_(len(results), 12)
+        for (s,t),num in results.items():
+            eq_(num, len(dl.directed_paths(s, t)))
+        eq_(ap.all_pairs(self.edgelist, processes=2), results)
+
+    def test_dumps(self):
+        results = ap.all_pairs(self.edgelist, [(1,4), (4,1)], mode="dumps", processes=2)
+        eq_(GraphSet.loads(results[(1,4)]), dl.directed_paths(1, 4))
+        eq_(GraphSet.loads(results[(4,1)]), dl.directed_paths(4, 1))
+
+    def test_topk(self):
+        results = ap.all_pairs(self.edgelist, [(1,4)], mode="topk", k=2)
+        eq_(results[(1,4)], [([(1,2), (2,4)], 50), ([(1,3), (3,4)], 70)])
+
+    def test_is_symmetric(self):
+        ok_(ap.is_symmetric(self.edgelist))
+        ok_(not ap.is_symmetric([(1,2,10), (2,1,20)]))
+
+    def test_orbits(self):
+        identity = {node: node for node in [1, 2, 3, 4]}
+        orbit = ap.orbits([(1,4), (4,1), (2,3)], [identity], True)
+        eq_(sorted(orbit.keys()), [(1,4), (2,3)])
+        eq_([demand for demand,mapping,reversed_ in orbit[(1,4)]], [(1,4), (4,1)])
+
+        # 1<->4, 2<->3の入れ替えは重みを保存しない
+        eq_(len(ap.automorphisms(self.edgelist)), 1)
+
+    def test_symmetry(self):
+        direct = ap.all_pairs(self.edgelist, symmetry=False)
+        eq_(ap.all_pairs(self.edgelist), direct)
+        eq_(ap.all_pairs(self.edgelist, use_automorphisms=True), direct)
+
+        results = ap.all_pairs(self.edgelist, [(1,4), (4,1)], mode="topk", k=1)
+        eq_(results[(4,1)], [([(4,2), (2,1)], 50)])
+
+    def test_transform_path(self):
+        eq_(ap.transform_path([(1,2), (2,4)], {1: 1, 2: 3, 4: 4}, False), [(1,3), (3,4)])
+        eq_(ap.transform_path([(1,2), (2,4)], {1: 1, 2: 2, 4: 4}, True), [(4,2), (2,1)])
@@ -0,0 +1,72 @@
+"""
+date 2026.10.19
+branch master
+file test_block_cut.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4----5----6
+          |   /
+          |  /
+          | /
+          |/
+          7
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+from proposal_packages.block_cut import BlockCutTree
+
+class TestBlockCutTree:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),(4,5,60),(5,6,70),(5,7,80),(6,7,90),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50),(5,4,60),(6,5,70),(7,5,80),(7,6,90)]
+
+    def setup(self):
+        dl.read_edgelist(self.edgelist)
+        GraphSet.set_universe(dl.append_virtual_nodes())
+        self.tree = BlockCutTree(self.edgelist)
+
+    def teardown(self):
+        pass
+
+    def test_blocks(self):
+        eq_(len(self.tree.blocks), 3)
+        eq_(self.tree.cut_nodes, {4, 5})
+        eq_([(len(self.tree.blocks[k]), entry, exit_) for k,entry,exit_ in self.tree.chain(1, 7)],
+            [(4, 1, 4), (2, 4, 5), (3, 5, 7)])
+
+    def test_count(self):
+        eq_(self.tree.count(1, 7), 4 * 1 * 2)
+        eq_(self.tree.count(7, 2), len(dl.directed_paths(7, 2)))
+        eq_(self.tree.count(4, 5), 1)
+
+    def test_iter_paths(self):
+        paths = list(self.tree.iter_paths(1, 6))
+        eq_(len(paths), 8)
+        ok_([(1,2), (2,4), (4,5), (5,6)] in paths)
+        ok_([(1,3), (3,2), (2,4), (4,5), (5,7), (7,6)] in paths)
+
+    def test_graphset(self):
+        universe = GraphSet.universe()
+        eq_(self.tree.graphset(6, 1), dl.directed_paths(6, 1))
+        eq_(GraphSet.universe(), universe)
+        for s in range(1, 8):
+            for t in range(1, 8):
+                if s != t:
+                    eq_(self.tree.graphset(s, t), dl.directed_paths(s, t))
+        eq_(GraphSet.universe(), universe)
+
+    def test_iter_paths_lazy(self):
+        for s,t in [(1, 7), (6, 3), (4, 5)]:
+            expected = sorted(sorted(dl.original_path(p)) for p in dl.directed_paths(s, t))
+            eq_(sorted(sorted(p) for p in self.tree.iter_paths(s, t)), expected)
+        # 最初の1本はブロックのグラフセットからそのまま取り出す
+        path = next(self.tree.iter_paths(7, 1))
+        eq_((path[0][0], path[-1][1]), (7, 1))
@@ -0,0 +1,93 @@
+"""
+date 2026.10.19
+branch master
+file test_budget.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4
+"""
+
+import time
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.graphillion_utils as gu
+import proposal_packages.budget as bg
+
+def _allocate(size):
+    return len(bytearray(size))
+
+def _vm_size():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmSize:"):
+                return int(line.split()[1]) * 1024
+
+class TestBudget:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50)]
+
+    def setup(self):
+        dl.read_edgelist(self.edgelist)
+        GraphSet.set_universe(dl.append_virtual_nodes())
+
+    def teardown(self):
+        pass
+
+    def test_directed_paths(self):
+        stages = []
+        result = bg.directed_paths(1, 4, timeout=60, progress=lambda stage,elapsed: stages.append(stage))
+        ok_(result.complete)
+        eq_(result.value, dl.directed_paths(1, 4))
+        eq_(stages, ["rules", "paths", "excluding"])
+
+    def test_disjoint_paths(self):
+        paths = dl.directed_paths(1, 4)
+        result = bg.bidirectional_disjoint_paths(paths, [(1,2), (2,4)], timeout=60)
+        eq_(result.value, dl.bidirectional_disjoint_paths(paths, [(1,2), (2,4)]))
+        eq_(bg.min_hop((1,4), timeout=60).value, gu.min_hop((1,4)))
+
+    def test_timeout(self):
+        result = bg.run_with_budget(time.sleep, (10,), timeout=0.5,
+                                    fallback=bg.shortest_path_fallback(1, 4))
+        eq_(result.status, bg.TIMEOUT)
+        ok_(result.partial)
+        ok_(result.elapsed < 10)
+        eq_(result.value, [[(1,2), (2,4)]])
+
+    def test_wall_clock_jump(self):
+        # 時計を1時間進めても上限の判定には影響しない
+        wall_clock = time.time
+        calls = []
+        def jumped():
+            calls.append(None)
+            return wall_clock() + (3600 if len(calls) > 1 else 0)
+        time.time = jumped
+        try:
+            result = bg.run_with_budget(time.sleep, (0.2,), timeout=30)
+        finally:
+            time.time = wall_clock
+        eq_(result.status, bg.COMPLETE)
+        ok_(result.elapsed < 30)
+
+    def test_memory(self):
+        result = bg.run_with_budget(_allocate, (1 << 34,), max_memory=_vm_size() + (1 << 30))
+        eq_(result.status, bg.MEMORY)
+        eq_(result.value, None)
+
+    @raises(RuntimeError)
+    def test_error(self):
+        bg.directed_paths(1, 99, timeout=60)
+
+    def test_k_shortest_fallback(self):
+        result = bg.run_with_budget(time.sleep, (10,), timeout=0.5,
+                                    fallback=bg.shortest_path_fallback(1, 4, k=3))
+        eq_(result.value, [[(1,2), (2,4)], [(1,3), (3,4)], [(1,2), (2,3), (3,4)]])
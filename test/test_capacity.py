@@ -0,0 +1,56 @@
+"""
+date 2026.10.19
+branch master
+file test_capacity.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4
+容量はリンク(2,4),(4,2)が5、リンク(3,4)が10、それ以外は100とする
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.capacity as cp
+
+class TestCapacity:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50)]
+
+    capacity = [(1,2,100),(1,3,100),(2,3,100),(2,4,5),(3,4,10),
+                (2,1,100),(3,1,100),(3,2,100),(4,2,5),(4,3,100)]
+
+    def setup(self):
+        dl.read_edgelist(self.edgelist)
+        GraphSet.set_universe(dl.append_virtual_nodes())
+        self.classes = cp.CapacityClasses(self.capacity)
+
+    def teardown(self):
+        pass
+
+    def test_class_of(self):
+        eq_(self.classes.thresholds, [5, 10, 100])
+        eq_([self.classes.class_of(d) for d in [1, 5, 7, 10, 20, 100]], [0, 0, 1, 1, 2, 2])
+        eq_(sorted(self.classes.infeasible_links(1)), [(2,4), (4,2)])
+        eq_(self.classes.search_space(0), None)
+        ok_(self.classes.search_space(2) is self.classes.search_space(2))
+
+    def test_directed_paths(self):
+        eq_(len(self.classes.directed_paths(1, 4, 1)), 4)
+        eq_(len(self.classes.directed_paths(1, 4, 7)), 2)
+        eq_(len(self.classes.directed_paths(1, 4, 20)), 0)
+        paths = self.classes.directed_paths(4, 1, 20)
+        eq_(sorted(sorted(dl.original_path(p)) for p in paths),
+            [[(2,1), (3,2), (4,3)], [(3,1), (4,3)]])
+
+    def test_capacity_paths(self):
+        results = [(demand, d, len(paths)) for demand,d,paths
+                   in cp.capacity_paths([(1,4), (4,1), (1,4)], [20, 7, 1], self.classes)]
+        eq_(results, [((1,4), 1, 4), ((4,1), 7, 2), ((1,4), 20, 0)])
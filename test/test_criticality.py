@@ -0,0 +1,54 @@
+"""
+date 2026.10.19
+branch master
+file test_criticality.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4----5
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.criticality as cr
+
+class TestCriticality:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),(4,5,60),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50),(5,4,60)]
+
+    traffic = [(1,4), (4,1), (1,5)]
+
+    def setup(self):
+        dl.read_edgelist(self.edgelist)
+        GraphSet.set_universe(dl.append_virtual_nodes())
+
+    def teardown(self):
+        pass
+
+    def test_criticality_matrix(self):
+        links, counts, totals = cr.criticality_matrix(self.traffic)
+        eq_(links, [(1,2), (1,3), (2,3), (2,4), (3,4), (4,5)])
+        eq_(list(totals), [4, 4, 4])
+        eq_(counts.shape, (6, 3))
+        eq_(list(counts[links.index((2,3))]), [2, 2, 2])
+        eq_(list(counts[links.index((4,5))]), [0, 0, 4])
+
+    def test_criticality_matrix_processes(self):
+        links, counts, totals = cr.criticality_matrix(self.traffic)
+        links2, counts2, totals2 = cr.criticality_matrix(self.traffic, processes=2)
+        eq_(links, links2)
+        ok_((counts == counts2).all())
+        ok_((totals == totals2).all())
+
+    def test_demand_weighted(self):
+        links, counts, totals = cr.criticality_matrix(self.traffic)
+        risk = cr.demand_weighted(counts, totals, [100, 100, 50])
+        eq_(risk[links.index((4,5))], 50)
+        eq_(cr.ranking(links, counts)[-1], ((4,5), 4))
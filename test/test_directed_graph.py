@@ -0,0 +1,64 @@
+"""
+date 2026.10.19
+branch master
+file test_directed_graph.py
+
+以下の有向グラフを使用する(samples/sample2.pyと同じ)
+A->B, A->D, B->E, B->D, C->A, C->F, D->C, D->F, D->G, E->G, G->F
+"""
+
+from itertools import permutations
+
+from nose.tools import ok_, eq_, raises, with_setup
+import networkx as nx
+from graphillion import GraphSet
+import proposal_packages.directed_graph as dg
+import proposal_packages.path_engine as pe
+from proposal_packages.protection import ordered_path
+
+class TestDirectedGraph:
+
+    edgelist = [("A","B",2), ("A","D",1),
+                ("B","E",10), ("B","D",3),
+                ("C","A",4), ("C","F",5),
+                ("D","C",2), ("D","F",8), ("D","G",4),
+                ("E","G",6),
+                ("G","F",1)]
+
+    def setup(self):
+        self.G = nx.DiGraph()
+        self.G.add_weighted_edges_from(self.edgelist)
+        self.E = dg.EdgeArray(self.edgelist)
+        GraphSet.set_universe(dg.universe(self.E))
+
+    def teardown(self):
+        pass
+
+    def test_edge_array(self):
+        eq_(self.E.edges(), [(i,j) for i,j,cost in self.edgelist])
+        eq_(dg.universe(self.E), self.edgelist)
+        csr = dg.EdgeArray.from_csr(pe.CSRGraph(self.edgelist))
+        eq_(sorted(csr.edges()), sorted(self.E.edges()))
+
+    def test_internal_edges(self):
+        eq_(sorted(dg.internal_edges(self.G, "F")), [[("C","F")], [("D","F")], [("G","F")]])
+        eq_(sorted(dg.internal_edges(self.E, "F")), [[("C","F")], [("D","F")], [("G","F")]])
+        eq_(dg.two_internal_edges_subgraph(self.E, "A"), None)
+        eq_(len(dg.two_internal_edges_subgraph(self.E, "F")), 3)
+
+    def test_invalid_direction_elms(self):
+        for s in "ABCDEFG":
+            expected = sorted(sorted(elm) for elm in dg.invalid_direction_elms(self.G, s))
+            eq_(sorted(sorted(elm) for elm in dg.invalid_direction_elms(self.E, s)), expected)
+        # rule1: A<-C, rule2: D(A,B), F(C,D,G), G(D,E)
+        eq_(len(dg.invalid_direction_elms(self.E, "A")), 1 + 1 + 3 + 1)
+        eq_(len(dg.invalid_direction_elms(self.E, "D")), 2 + 3 + 1)
+
+    def test_directed_paths(self):
+        graph = pe.CSRGraph(self.edgelist)
+        for s,t in permutations("ABCDEFG", 2):
+            expected = sorted(pe.iter_simple_paths(graph, s, t))
+            for g in (self.G, self.E):
+                paths = [ordered_path([(i,j) if self.G.has_edge(i, j) else (j,i) for i,j in path], s)
+                         for path in dg.directed_paths(g, s, t)]
+                eq_(sorted(paths), expected)
@@ -187,3 +187,19 @@ class TestDirectedLink:
 
     def test_directed_paths(self):
         pass
+
+    def test_bidirectional_disjoint_paths(self):
+        paths = dl.directed_paths(1, 4)
+        disjoint = dl.bidirectional_disjoint_paths(paths, [(1,3), (2,4), (3,3200), (3200,2)])
+        eq_(len(disjoint), 0)
+        disjoint = dl.bidirectional_disjoint_paths(paths, [(1,2), (2,4)])
+        eq_(list(disjoint), [[(1,3), (3,4)]])
+
+    def test_node_disjoint_paths(self):
+        paths = dl.directed_paths(2, 3)
+        disjoint = dl.node_disjoint_paths(paths, [(2,2100), (2100,1), (1,3)])
+        eq_(sorted(sorted(p) for p in disjoint), [[(2,3)], [(2,4), (4,4300), (4300,3)]])
+        disjoint = dl.node_disjoint_paths(paths, [(2,4), (4,4300), (4300,3)])
+        for path in disjoint:
+            ok_((2,4) not in path)
+            ok_((4,4200) not in path)
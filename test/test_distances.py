@@ -0,0 +1,47 @@
+"""
+date 2026.10.19
+branch master
+file test_distances.py
+
+以下の有向グラフを使用する(括弧内は重み)
+1 -> 2 (10, 3), 2 -> 3 (10), 1 -> 3 (50), 3 -> 4 (0), 4 -> 1 (5), 5 -> 4 (1)
+"""
+
+import numpy as np
+from nose.tools import ok_, eq_, raises, with_setup
+import proposal_packages.distances as ds
+
+class TestDistances:
+
+    edgelist = [(1,2,10), (2,3,10), (1,3,50), (3,4,0), (4,1,5), (5,4,1), (1,2,3)]
+
+    def setup(self):
+        pass
+
+    def teardown(self):
+        pass
+
+    def check(self, dist):
+        eq_(dist.hop(1, 3), 1)
+        eq_(dist.cost(1, 3), 13)
+        eq_(dist.cost(1, 4), 13)
+        eq_(dist.hop(3, 2), 3)
+        eq_(dist.cost(3, 2), 8)
+        eq_(dist.hop(1, 5), None)
+        eq_(dist.cost(1, 5), None)
+        eq_(dist.hop(5, 5), 0)
+        undirected = ds.Distances(dist.graph, directed=False)
+        eq_(undirected.hop(1, 5), 2)
+        eq_(undirected.cost(2, 5), 9)
+        ok_(np.array_equal(undirected.hops, undirected.hops.T))
+
+    def test_distances(self):
+        self.check(ds.Distances(self.edgelist))
+
+    def test_without_scipy(self):
+        saved = ds.csr_matrix
+        ds.csr_matrix = None
+        try:
+            self.check(ds.Distances(self.edgelist))
+        finally:
+            ds.csr_matrix = saved
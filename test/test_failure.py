@@ -0,0 +1,54 @@
+"""
+date 2026.10.19
+branch master
+file test_failure.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4----5
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.failure as fl
+
+class TestFailure:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),(4,5,60),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50),(5,4,60)]
+
+    def setup(self):
+        dl.read_edgelist(self.edgelist)
+        GraphSet.set_universe(dl.append_virtual_nodes())
+
+    def teardown(self):
+        pass
+
+    def test_failure_scenarios(self):
+        eq_(len(fl.failure_scenarios(1)), 6)
+        eq_(len(fl.failure_scenarios(2)), 6 + 15)
+        eq_(fl.failure_scenarios(1, [(4,2), (5,4)]), [((2,4),), ((4,5),)])
+
+    def test_surviving_paths(self):
+        families = fl.family_table()
+        ok_(families[(4,2)] is families[(2,4)])
+        paths = dl.directed_paths(1, 4)
+        eq_(len(fl.surviving_paths(paths, ((4,2),), families)), 2)
+        eq_(len(fl.surviving_paths(paths, ((2,4),(3,4)), families)), 0)
+        paths = dl.directed_paths(4, 1)
+        eq_(len(fl.surviving_paths(paths, ((2,4),), families)), 2)
+
+    def test_failure_analysis(self):
+        results = {(demand, scenario): (count, cheapest) for demand,scenario,count,cheapest
+                   in fl.failure_analysis([(1,4), (5,1)], scenarios=[((2,4),), ((2,4),(3,4)), ((4,5),)])}
+        eq_(results[((1,4), ((2,4),))], (2, ([(1,3),(3,4)], 70)))
+        eq_(results[((1,4), ((2,4),(3,4)))], (0, None))
+        eq_(results[((1,4), ((4,5),))], (4, ([(1,2),(2,4)], 50)))
+        eq_(results[((5,1), ((2,4),))], (2, ([(5,4),(4,3),(3,1)], 130)))
+        eq_(results[((5,1), ((4,5),))], (0, None))
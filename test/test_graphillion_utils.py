@@ -32,6 +32,22 @@ class TestGraphillionUtils:
         eq_(gu.degree(3), 3)
         eq_(gu.degree(4), 2)
 
+    def test_universe_index(self):
+        index = gu.universe_index()
+        ok_(gu.universe_index() is index)
+        eq_(index.out_degree(2), 2)
+        eq_(index.in_degree(2), 1)
+        eq_(sorted(index.successors(2)), [3, 4])
+        eq_(index.predecessors(2), [1])
+        eq_(sorted(index.neighbors(2)), [1, 3, 4])
+        eq_(sorted(index.incident(4)), [(2,4), (3,4)])
+        eq_(index.degree(5), 0)
+        eq_(index.successors(5), [])
+        GraphSet.set_universe([(1,2), (2,5)])
+        ok_(gu.universe_index() is not index)
+        eq_(gu.degree(2), 2)
+        eq_(gu.degree(5), 1)
+
     def test_flatten_paths(self):
         paths = GraphSet.paths(1, 4)
         edges = []
@@ -47,11 +63,36 @@ class TestGraphillionUtils:
     def test_max_hop(self):
         eq_(gu.max_hop((1, 4)), 3)
 
+    def test_hop_cache(self):
+        eq_(gu.min_hop((1, 4)), 2)
+        ok_(("max_hop", 1, 4) not in gu.universe_cache())
+        eq_(gu.max_hop((1, 4)), 3)
+        ok_(("max_hop", 1, 4) in gu.universe_cache())
+        # 重みが最小のパスは1-2-5-4だが最小ホップ数は1
+        GraphSet.set_universe([(1,2,1), (2,5,1), (5,4,1), (1,4,10)])
+        ok_(("max_hop", 1, 4) not in gu.universe_cache())
+        eq_(gu.min_hop((1, 4)), 1)
+        eq_(gu.max_hop((1, 4)), 3)
+        GraphSet.set_universe([(1,2), (3,4)])
+        eq_(gu.min_hop((1, 4)), None)
+        eq_(gu.max_hop((1, 4)), None)
+
     def test_get_min_hop_paths(self):
-        pass
+        paths = GraphSet.paths(1, 4)
+        eq_(gu.get_min_hop_paths(paths, (1, 4)), GraphSet([[(1,2),(2,4)], [(1,3),(3,4)]]))
 
     def test_excluding_multi_elms(self):
-        pass
+        paths = GraphSet.paths(1, 4)
+        for elms in [[3, (1,3), GraphSet([[(1,2),(2,3)]])],
+                     [(2,4), GraphSet([[(1,3),(3,4)]]), 4]]:
+            expected = paths
+            for elm in elms:
+                expected = expected.excluding(elm)
+            eq_(gu.excluding_multi_elms(paths, elms), expected)
+        eq_(gu.excluding_multi_elms(paths, [3, (1,3), GraphSet([[(1,2),(2,3)]])]),
+            GraphSet([[(1,2),(2,4)]]))
+        eq_(gu.excluding_multi_elms(paths, []), paths)
+        eq_(gu.excluding_multi_elms(paths, [2, 3]), GraphSet())
 
     def test_select_sleep_nodes(self):
         pass
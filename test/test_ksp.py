@@ -0,0 +1,48 @@
+"""
+date 2026.10.19
+branch master
+file test_ksp.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4----5
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.allpairs as ap
+import proposal_packages.ksp as ksp
+
+class TestKShortestPaths:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),(4,5,60),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50),(5,4,60)]
+
+    def setup(self):
+        pass
+
+    def teardown(self):
+        pass
+
+    def test_k_shortest_paths(self):
+        eq_(ksp.k_shortest_paths(self.edgelist, 1, 5, 10),
+            [([(1,2), (2,4), (4,5)], 110),
+             ([(1,3), (3,4), (4,5)], 130),
+             ([(1,2), (2,3), (3,4), (4,5)], 150),
+             ([(1,3), (3,2), (2,4), (4,5)], 150)])
+        eq_(ksp.k_shortest_paths(self.edgelist, 5, 1, 1), [([(5,4), (4,2), (2,1)], 110)])
+        eq_(ksp.k_shortest_paths(self.edgelist, 1, 5, 0), [])
+        eq_(ksp.k_shortest_paths(self.edgelist, 1, 5, -1), [])
+        eq_(ksp.all_k_shortest_paths(self.edgelist, [(1,5), (5,1)], 0), {(1,5): [], (5,1): []})
+
+    def test_same_as_top_paths(self):
+        results = ap.all_pairs(self.edgelist, mode="topk", k=3, symmetry=False)
+        shortest = ksp.all_k_shortest_paths(self.edgelist, list(results.keys()), 3)
+        for demand in results:
+            eq_([cost for path,cost in shortest[demand]], [cost for path,cost in results[demand]])
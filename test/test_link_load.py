@@ -0,0 +1,92 @@
+"""
+date 2026.10.19
+branch master
+file test_link_load.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4
+容量はリンク(2,4),(4,2)が5、リンク(3,4)が10、それ以外は100とする
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import numpy as np
+import proposal_packages.directed_link as dl
+import proposal_packages.link_load as ll
+
+class TestLinkLoad:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50)]
+
+    capacity = [(1,2,100),(1,3,100),(2,3,100),(2,4,5),(3,4,10),
+                (2,1,100),(3,1,100),(3,2,100),(4,2,5),(4,3,100)]
+
+    traffic = [(1,4), (4,1), (2,3)]
+    DK = [6, 20, 4]
+
+    def setup(self):
+        dl.read_edgelist(self.edgelist)
+        GraphSet.set_universe(dl.append_virtual_nodes())
+
+    def teardown(self):
+        pass
+
+    def loads(self, paths):
+        """
+        辞書に加算して求めた負荷
+        """
+        loads = {}
+        for path,d in zip(paths, self.DK):
+            for link in dl.original_path(path):
+                loads[link] = loads.get(link, 0) + d
+        return loads
+
+    def test_loads(self):
+        paths = [[(1,2), (2,4)], [(4,3), (3,1)], [(2,3)]]
+        load = ll.LinkLoad(self.capacity, self.traffic, self.DK, paths)
+        eq_(dict((link, l) for link,l in zip(load.links, load.loads) if l),
+            {(1,2): 6, (2,4): 6, (4,3): 20, (3,1): 20, (2,3): 4})
+        eq_(load.max_utilization(), 1.2)
+        eq_(load.overloaded(), [((2,4), 6.0, 5.0)])
+
+    def test_virtual_nodes(self):
+        # 逆向きのリンクは仮想ノードを通るユニバースの辺で与える
+        paths = [sorted(p) for p in [next(dl.directed_paths(s, t).min_iter()) for s,t in self.traffic]]
+        load = ll.LinkLoad(self.capacity, self.traffic, self.DK, paths, dl.virtual_node_table())
+        expected = self.loads(paths)
+        eq_(dict((link, l) for link,l in zip(load.links, load.loads) if l), expected)
+        eq_(sorted(load.path_links(1)), sorted(dl.original_path(paths[1])))
+        # virtual_tableを省略しても同じ
+        eq_(ll.LinkLoad(self.capacity, self.traffic, self.DK, paths).loads.tolist(),
+            load.loads.tolist())
+
+    def test_reroute(self):
+        paths = [[(1,2), (2,4)], [(4,3), (3,1)], None]
+        load = ll.LinkLoad(self.capacity, self.traffic, self.DK, paths)
+        new = [(1,3), (3,4)]
+        eq_(load.evaluate(0, new), 0.6)
+        eq_(load.max_utilization(), 1.2)
+        load.reroute(0, new)
+        eq_(load.max_utilization(), 0.6)
+        eq_(load.overloaded(), [])
+        paths[0] = new
+        ok_(np.allclose(load.loads, ll.LinkLoad(self.capacity, self.traffic, self.DK, paths).loads))
+        ok_(np.allclose(load.loads, load.refresh()))
+        if load.matrix() is not None:
+            eq_(load.matrix().shape, (3, 10))
+            eq_(load.matrix()[0].indices.tolist(), [load.index[(1,3)], load.index[(3,4)]])
+
+    @raises(KeyError)
+    def test_unknown_link(self):
+        ll.LinkLoad(self.capacity, self.traffic, self.DK, [[(1,4)], None, None])
+
+    @raises(ValueError)
+    def test_paths_length(self):
+        ll.LinkLoad(self.capacity, self.traffic, self.DK, [None])
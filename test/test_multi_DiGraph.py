@@ -0,0 +1,71 @@
+"""
+date 2026.10.19
+branch master
+file test_multi_DiGraph.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4----5
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+from proposal_packages.multi_DiGraph import MultiDiGraph
+
+class TestMultiDiGraph:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),(4,5,60),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50),(5,4,60)]
+
+    def setup(self):
+        self.G = MultiDiGraph(self.edgelist)
+        dl.read_edgelist(self.edgelist)
+
+    def teardown(self):
+        pass
+
+    def test_indexes(self):
+        eq_(sorted(self.G.append_virtual_nodes()), sorted(dl.append_virtual_nodes()))
+        eq_(sorted(self.G.virtual_nodes()), sorted(dl.virtual_nodes()))
+        eq_(self.G.original_nodes(), {1, 2, 3, 4, 5})
+        eq_(list(self.G.original_nodes_iter()), [1, 2, 3, 4, 5])
+        eq_(sorted(self.G.predecessor_nodes(1)), [2100, 3100])
+        eq_(sorted(self.G.neighbor_nodes(1)), [2, 3])
+        eq_(sorted(self.G.neighbor_nodes(2100)), [1])
+        eq_(self.G.degree(1), 4)
+        eq_(self.G.degree(5), 2)
+        eq_(self.G.degree(2100), 2)
+        eq_(self.G.predecessor_nodes(6), [])
+        ok_(not hasattr(self.G, "__dict__"))
+
+    def test_directed_paths(self):
+        for s in range(1, 6):
+            for t in range(1, 6):
+                if s == t:
+                    continue
+                eq_(self.G.directed_paths(s, t), dl.directed_paths(s, t))
+                eq_(sorted(self.G.predecessor_nodes(s)), sorted(dl.predecessor_nodes(s)))
+
+    def test_universe(self):
+        GraphSet.set_universe([(1,2),(2,3)])
+        eq_(self.G.directed_paths(1, 5).len(), 4)
+        eq_(len(GraphSet.universe()), 18)
+
+    def test_disjoint_paths(self):
+        paths = self.G.directed_paths(1, 5)
+        for path in paths:
+            eq_(self.G.original_path(path), dl.original_path(path))
+            eq_(self.G.disjoint_paths(paths, path), dl.disjoint_paths(paths, path))
+            eq_(self.G.disjoint_paths(paths, path, "bidirectional"),
+                dl.bidirectional_disjoint_paths(paths, path))
+            eq_(self.G.disjoint_paths(paths, path, "node"), dl.node_disjoint_paths(paths, path))
+
+    @raises(ValueError)
+    def test_unknown_kind(self):
+        self.G.disjoint_elms([(1,2)], "srlg")
@@ -0,0 +1,67 @@
+"""
+date 2026.10.19
+branch master
+file test_path_cache.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4
+"""
+
+import os
+import shutil
+import tempfile
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.path_cache as pc
+
+class TestPathCache:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50)]
+
+    def setup(self):
+        dl.read_edgelist(self.edgelist)
+        GraphSet.set_universe(dl.append_virtual_nodes())
+        self.directory = tempfile.mkdtemp()
+
+    def teardown(self):
+        shutil.rmtree(self.directory)
+
+    def test_fingerprint(self):
+        fp = pc.fingerprint()
+        # 重みだけが異なるモデルデータは同じfingerprintになる
+        dl.read_edgelist([(i,j,cost*2) for i,j,cost in self.edgelist])
+        GraphSet.set_universe(dl.append_virtual_nodes())
+        eq_(pc.fingerprint(), fp)
+        ok_(pc.fingerprint("directed_graph") != fp)
+
+        dl.read_edgelist(self.edgelist[:4] + self.edgelist[5:9])
+        GraphSet.set_universe(dl.append_virtual_nodes())
+        ok_(pc.fingerprint() != fp)
+
+    def test_cached_directed_paths(self):
+        cache = pc.PathCache(self.directory)
+        fp = pc.fingerprint()
+        eq_(cache.get(fp, 1, 4, "directed_paths"), None)
+        paths = pc.cached_directed_paths(cache, 1, 4)
+        eq_(paths, dl.directed_paths(1, 4))
+        eq_(cache.get(fp, 1, 4, "directed_paths"), paths)
+        eq_(len(cache.entries()), 1)
+
+    def test_evict(self):
+        cache = pc.PathCache(self.directory)
+        for s,t in [(1,4), (4,1), (2,3)]:
+            pc.cached_directed_paths(cache, s, t)
+        oldest = cache.entries()[0][2]
+        cache.max_bytes = cache.size() - 1
+        cache.evict()
+        eq_(len(cache.entries()), 2)
+        ok_(not os.path.exists(oldest))
@@ -0,0 +1,67 @@
+"""
+date 2026.10.19
+branch master
+file test_path_engine.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4----5
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.path_engine as pe
+from proposal_packages.protection import ordered_path
+
+class TestPathEngine:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),(4,5,60),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50),(5,4,60)]
+
+    def setup(self):
+        self.graph = pe.CSRGraph(self.edgelist)
+        dl.read_edgelist(self.edgelist)
+        GraphSet.set_universe(dl.append_virtual_nodes())
+
+    def teardown(self):
+        pass
+
+    def test_csr(self):
+        eq_(self.graph.nodes, [1, 2, 3, 4, 5])
+        eq_(self.graph.indptr, [0, 2, 5, 8, 11, 12])
+        eq_(self.graph.hops(1, 4), 2)
+        eq_(self.graph.hops(5, 1), 3)
+
+    def test_iter_simple_paths(self):
+        for s in range(1, 6):
+            for t in range(1, 6):
+                if s == t:
+                    continue
+                expected = sorted(ordered_path(dl.original_path(path), s)
+                                  for path in dl.directed_paths(s, t))
+                eq_(sorted(pe.iter_simple_paths(self.graph, s, t)), expected)
+        eq_(pe.count_simple_paths(self.graph, 1, 5), 4)
+
+    def test_select_engine(self):
+        eq_(pe.select_engine(self.graph, 1, 5), "dfs")
+        pe.SMALL_GRAPH, pe.SPARSE_DEGREE = 0, 1.0
+        try:
+            eq_(pe.select_engine(self.graph, 1, 5), "probe")
+            eq_(sorted(pe.directed_paths(self.graph, 1, 5, probe_steps=3)),
+                sorted(pe.directed_paths(self.graph, 1, 5, engine="dfs")))
+        finally:
+            pe.SMALL_GRAPH, pe.SPARSE_DEGREE = 24, 2.5
+
+    @raises(pe.StepLimitExceeded)
+    def test_step_limit(self):
+        list(pe.iter_simple_paths(self.graph, 1, 5, max_steps=3))
+
+    def test_zdd_paths(self):
+        eq_(sorted(pe.directed_paths(self.graph, 5, 1, engine="zdd")),
+            sorted(pe.directed_paths(self.graph, 5, 1, engine="dfs")))
@@ -0,0 +1,50 @@
+"""
+date 2026.10.19
+branch master
+file test_path_stats.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.path_stats as ps
+
+class TestPathStats:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50)]
+
+    def setup(self):
+        dl.read_edgelist(self.edgelist)
+        GraphSet.set_universe(dl.append_virtual_nodes())
+
+    def teardown(self):
+        pass
+
+    def test_hop_histogram(self):
+        eq_(ps.hop_histogram(dl.directed_paths(1, 4)), {2: 2, 3: 2})
+        # [(4,4300),(4300,3),(3,3100),(3100,1)]は仮想ノードを2個通るが2ホップ
+        eq_(ps.hop_histogram(dl.directed_paths(4, 1)), {2: 2, 3: 2})
+
+    def test_cost_percentiles(self):
+        # 1から4へのパスのコストは50, 70, 90, 90
+        paths = dl.directed_paths(1, 4)
+        eq_(ps.cost_percentiles(paths, percentiles=(25, 50, 100)), (50, [50.0, 70.0, 90.0], 90))
+        min_cost, values, max_cost = ps.cost_percentiles(paths, percentiles=(50,), method="sample")
+        eq_((min_cost, max_cost), (50, 90))
+        ok_(values[0] in (50, 70, 90))
+
+    def test_demand_table(self):
+        hops, costs = ps.demand_table([(1,4), (2,3)], percentiles=(50,))
+        eq_(hops.shape, (2, 4))
+        eq_(list(hops[0]), [0, 0, 2, 2])
+        eq_(list(costs[0]), [4, 50, 70, 90])
@@ -0,0 +1,70 @@
+"""
+date 2026.10.19
+branch master
+file test_preflight.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4----5
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.allpairs as allpairs
+import proposal_packages.directed_link as dl
+import proposal_packages.path_engine as pe
+import proposal_packages.preflight as pf
+
+class TestPreflight:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),(4,5,60),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50),(5,4,60)]
+
+    def setup(self):
+        dl.read_edgelist(self.edgelist)
+        GraphSet.set_universe(dl.append_virtual_nodes(), traversal="as-is")
+
+    def teardown(self):
+        pass
+
+    def test_universe_edges(self):
+        eq_(pf.universe_edges(self.edgelist), [e[:2] for e in dl.append_virtual_nodes()])
+
+    def test_frontier_widths(self):
+        eq_(pf.frontier_widths([(1,2),(2,3),(3,4)]), [1, 1, 0])
+        eq_(pf.frontier_widths([(1,2),(3,4),(2,3)]), [1, 2, 0])
+
+    def test_topology(self):
+        eq_(pf.Preflight(self.edgelist).topology(),
+            {"nodes": 5, "links": 12, "universe_size": 18, "virtual_nodes": 6,
+             "frontier_width": 4, "rule2_pairs": 10})
+
+    def test_demand(self):
+        preflight = pf.Preflight(self.edgelist, samples=2000)
+        graph = pe.CSRGraph(self.edgelist)
+        for s,t in [(1,5),(5,1),(2,3)]:
+            estimate = preflight.demand(s, t)
+            exact = pe.count_simple_paths(graph, s, t)
+            ok_(abs(estimate["paths"] - exact) <= 0.2 * exact)
+            eq_(estimate["engine"], "dfs")
+            ok_(estimate["zdd_size"] > 0)
+        estimate = preflight.demand(1, 5)
+        eq_(estimate["rule1"], 2)
+        # 2,3,4は流入リンクが3本
+        eq_(estimate["rule2"], 3 + 3 + 3)
+
+    def test_no_paths(self):
+        preflight = pf.Preflight([(1,2,10),(2,1,10),(3,4,10),(4,3,10)])
+        eq_(preflight.demand(1, 3)["paths"], 0.0)
+        eq_(preflight.demand(1, 3)["zdd_size"], 0.0)
+
+    def test_estimate(self):
+        traffic = [(1,5),(4,5),(1,2)]
+        eq_(allpairs.schedule(traffic, pf.Preflight(self.edgelist))[-1], (4,5))
+        results = allpairs.all_pairs(self.edgelist, traffic, estimate=pf.Preflight(self.edgelist))
+        eq_(results[(1,5)], 4)
@@ -0,0 +1,83 @@
+"""
+date 2026.10.19
+branch master
+file test_protection.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.protection as pr
+
+class TestProtection:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50)]
+
+    def setup(self):
+        dl.read_edgelist(self.edgelist)
+        GraphSet.set_universe(dl.append_virtual_nodes())
+
+    def teardown(self):
+        pass
+
+    def test_ordered_path(self):
+        eq_(pr.ordered_path([(3,4), (1,2), (2,3)], 1), [(1,2), (2,3), (3,4)])
+
+    def test_suurballe(self):
+        succ = pr.successors_table(self.edgelist)
+        eq_(pr.suurballe(succ, 1, 4), ([(1,2), (2,4)], [(1,3), (3,4)], 120))
+        primary, backup, cost = pr.suurballe(succ, 2, 3)
+        eq_(sorted([primary, backup]), [[(2,1), (1,3)], [(2,3)]])
+        eq_(cost, 60)
+
+    def test_suurballe_no_pair(self):
+        succ = pr.successors_table([(1,2,1),(2,1,1),(2,3,1),(3,2,1)])
+        eq_(pr.suurballe(succ, 1, 3), None)
+
+    def test_protection_pairs(self):
+        eq_(pr.protection_pairs(1, 4), [([(1,2), (2,4)], [(1,3), (3,4)], 120)])
+
+        eq_(pr.protection_pairs(1, 4, k=3), [([(1,2), (2,4)], [(1,3), (3,4)], 120)])
+
+        pairs = pr.protection_pairs(2, 3, k=3)
+        eq_([cost for primary,backup,cost in pairs], [60, 120, 120])
+        primary, backup, cost = pairs[1]
+        eq_(backup, [(2,4), (4,3)])
+
+    def test_all_protection_pairs(self):
+        traffic = [(1,4), (4,1), (2,3)]
+        pairs = pr.all_protection_pairs(traffic)
+        eq_(sorted(pairs.keys()), sorted(traffic))
+        for (s,t),result in pairs.items():
+            primary, backup, cost = result[0]
+            links = {frozenset(e) for e in primary}
+            ok_(all(frozenset(e) not in links for e in backup))
+            eq_(pr.all_protection_pairs([(s,t)], k=2)[(s,t)][0][2], cost)
+
+    def test_node_disjoint_pair(self):
+        succ = pr.successors_table(self.edgelist)
+        eq_(pr.node_disjoint_pair(succ, 1, 4), ([(1,2), (2,4)], [(1,3), (3,4)], 120))
+        eq_(pr.node_disjoint_pair(succ, 1, 3)[2], 20 + 10 + 30)
+
+        succ = pr.successors_table([(1,2,1),(2,1,1),(1,3,1),(3,1,1),
+                                    (2,4,1),(4,2,1),(3,4,1),(4,3,1),
+                                    (4,5,1),(5,4,1),(2,5,5),(5,2,5),
+                                    (5,6,1),(6,5,1)])
+        eq_(pr.node_disjoint_pair(succ, 1, 5), ([(1,3), (3,4), (4,5)], [(1,2), (2,5)], 9))
+        eq_(pr.node_disjoint_pair(succ, 3, 5), ([(3,4), (4,5)], [(3,1), (1,2), (2,5)], 9))
+        eq_(pr.node_disjoint_pair(succ, 1, 6), None)
+
+    def test_all_node_disjoint_pairs(self):
+        pairs = pr.all_node_disjoint_pairs([(1,4), (2,3)])
+        eq_(pairs[(1,4)][2], 120)
+        eq_(pairs[(2,3)][2], 60)
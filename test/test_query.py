@@ -0,0 +1,114 @@
+"""
+date 2026.10.19
+branch master
+file test_query.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4----5
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.graphillion_utils as gu
+import proposal_packages.query as query
+from proposal_packages.query import Query
+
+class TestQuery:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),(4,5,60),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50),(5,4,60)]
+
+    def setup(self):
+        dl.read_edgelist(self.edgelist)
+        GraphSet.set_universe(dl.append_virtual_nodes())
+
+    def teardown(self):
+        pass
+
+    def test_plan(self):
+        steps = (("excluding", (1,2)), ("graph_size", 3), ("including", 4),
+                 ("excluding", [(2,3)]), ("union", None), ("excluding", 3))
+        eq_(Query._plan(steps), [("graph_size", (3,)), ("including", (4,)),
+                                 ("excluding", ((1,2), [(2,3)])),
+                                 ("union", (None,)), ("excluding", (3,))])
+
+    def test_same_as_chain(self):
+        elms = [(1,2), [(2,3),(3,4)], 3, GraphSet([[(2,4)]])]
+        expected = GraphSet.paths(1, 5)
+        q = Query.paths(1, 5)
+        for elm in elms:
+            expected = expected.excluding(elm)
+            q = q.excluding(elm)
+        eq_(q.graphset(), expected)
+        eq_(gu.excluding_multi_elms(GraphSet.paths(1, 5), elms), expected)
+
+        expected = dl.directed_paths(1, 5).including((2,4)).graph_size(4).excluding(3)
+        q = Query.directed_paths(1, 5).excluding(3).including((2,4)).graph_size(4)
+        eq_(q.graphset(), expected)
+        eq_(sorted(map(sorted, q)), sorted(map(sorted, expected)))
+        eq_(q.len(), expected.len())
+
+        eq_(Query.paths(1, 5).graph_size(3).graph_size(4).len(), 0)
+        eq_(Query.paths(1, 5).including(2).including(3).graphset(),
+            GraphSet.paths(1, 5).including(2).including(3))
+
+    def test_union(self):
+        q = Query.paths(1, 5).graph_size(3) | GraphSet.paths(1, 5).graph_size(5)
+        eq_(q.graphset(), GraphSet.paths(1, 5).graph_size(3) | GraphSet.paths(1, 5).graph_size(5))
+
+    def test_disjoint_paths(self):
+        paths = dl.directed_paths(1, 5)
+        for path in paths:
+            q = dl.bidirectional_disjoint_paths(Query.directed_paths(1, 5), path)
+            eq_(q.graphset(), dl.bidirectional_disjoint_paths(paths, path))
+            q = dl.node_disjoint_paths(Query.directed_paths(1, 5), path)
+            eq_(q.graphset(), dl.node_disjoint_paths(paths, path))
+
+    def test_cache(self):
+        base = Query.directed_paths(1, 5, cache=True)
+        gs = base.graphset()
+        ok_(base.graphset() is gs)
+        ok_(base.key() in gu.universe_cache()["query"])
+        # 要素の順序が異なっても同じキャッシュを使う
+        q1 = base.excluding((2,4)).excluding((3,4))
+        q2 = base.excluding((3,4)).excluding((2,4))
+        ok_(q1.graphset() is q2.graphset())
+        GraphSet.set_universe(dl.append_virtual_nodes())
+        ok_("query" not in gu.universe_cache())
+
+    def test_no_cache(self):
+        # 指定しないときとGraphSetから始まるクエリは結果を保持しない
+        q = Query.directed_paths(1, 5).excluding((2,4))
+        ok_(q.graphset() is not q.graphset())
+        gs = GraphSet.paths(1, 5)
+        q = Query(gs, cache=True).excluding(3)
+        eq_(q.graphset(), gs.excluding(3))
+        eq_(gu.excluding_multi_elms(gs, [3, (2,4)]), gs.excluding(3).excluding((2,4)))
+        ok_("query" not in gu.universe_cache())
+
+    def test_non_supersets(self):
+        ok_(query.NON_SUPERSETS)
+        paths = GraphSet.paths(1, 5)
+        family = GraphSet([[(1,2)], [(2,3),(3,4)]])
+        expected = paths.excluding(family)
+        # GraphSet.excludingを使わずにnon_supersetsで求めていることを確かめる
+        excluding = GraphSet.excluding
+        def fail(self, obj):
+            raise AssertionError("GraphSet.excluding was called")
+        GraphSet.excluding = fail
+        try:
+            result = query._non_supersets(paths, family)
+        finally:
+            GraphSet.excluding = excluding
+        eq_(result, expected)
+
+    @raises(KeyError)
+    def test_unknown_vertex(self):
+        Query.paths(1, 5).excluding(9).graphset()
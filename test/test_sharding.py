@@ -0,0 +1,87 @@
+"""
+date 2026.10.19
+branch master
+file test_sharding.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4
+"""
+
+import json
+import os
+import sys
+import shutil
+import subprocess
+import tempfile
+from itertools import permutations
+
+from nose.tools import ok_, eq_, raises, with_setup
+import proposal_packages.allpairs as ap
+import proposal_packages.sharding as sh
+
+class TestSharding:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50)]
+
+    traffic = list(permutations([1, 2, 3, 4], 2))
+
+    def setup(self):
+        self.directory = tempfile.mkdtemp()
+
+    def teardown(self):
+        shutil.rmtree(self.directory)
+
+    def test_split_traffic(self):
+        shards = sh.split_traffic(self.traffic, 5)
+        eq_(len(shards), 5)
+        eq_(sorted(d for shard in shards for d in shard), sorted(self.traffic))
+        eq_(sh.split_traffic(self.traffic, 5), shards)
+
+    def test_run_shards_in_processes(self):
+        sh.write_manifest(self.directory, self.edgelist, self.traffic, 3)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+        workers = [subprocess.Popen([sys.executable, "-m", "proposal_packages.sharding",
+                                     "run", self.directory, str(shard_id)], env=env)
+                   for shard_id in (0, 1)]
+        for worker in workers:
+            eq_(worker.wait(), 0)
+
+        results, missing, failed = sh.merge(self.directory)
+        eq_((missing, failed), ([2], []))
+        output = os.path.join(self.directory, "merged.json")
+        merge = [sys.executable, "-m", "proposal_packages.sharding", "merge", self.directory, output]
+        eq_(subprocess.call(merge, env=env, stdout=subprocess.DEVNULL), 1)
+        with open(output) as f:
+            merged = json.load(f)
+        eq_((merged["missing"], merged["failed"]), ([2], []))
+        eq_(len(merged["results"]), len(results))
+
+        sh.run_shard(self.directory, 2)
+        results, missing, failed = sh.merge(self.directory)
+        eq_((missing, failed), ([], []))
+        eq_(results, ap.all_pairs(self.edgelist, self.traffic))
+        eq_(subprocess.call(merge, env=env, stdout=subprocess.DEVNULL), 0)
+
+    def test_topk(self):
+        sh.write_manifest(self.directory, self.edgelist, [(1,4)], 1, mode="topk", k=1)
+        sh.run_shard(self.directory, 0)
+        results, missing, failed = sh.merge(self.directory)
+        eq_(results, {(1,4): [([(1,2), (2,4)], 10 + 40)]})
+
+    def test_failed_shard(self):
+        sh.write_manifest(self.directory, self.edgelist, [(1,4), (1,5)], 2)
+        try:
+            sh.run_shard(self.directory, 1)
+        except Exception:
+            pass
+        sh.run_shard(self.directory, 0)
+        results, missing, failed = sh.merge(self.directory)
+        eq_((missing, failed), ([], [1]))
+        eq_(list(results.keys()), [(1,4)])
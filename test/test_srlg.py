@@ -0,0 +1,69 @@
+"""
+date 2026.10.19
+branch master
+file test_srlg.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4
+
+リンク(1,2),(3,4)はSRLG aに属する
+"""
+
+import os
+import tempfile
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.srlg as sr
+
+class TestSRLG:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50)]
+
+    def setup(self):
+        dl.read_edgelist(self.edgelist)
+        GraphSet.set_universe(dl.append_virtual_nodes())
+        fd, self.srlgfile = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(fd, "w") as f:
+            f.write("# i j groups\n2 1 a\n3 4 a\n1 3 b\n")
+
+    def teardown(self):
+        os.remove(self.srlgfile)
+
+    def test_read_srlg(self):
+        eq_(sr.read_srlg(self.srlgfile), {(2,1): ["a"], (3,4): ["a"], (1,3): ["b"]})
+
+    def test_links(self):
+        srlg = sr.SRLG(sr.read_srlg(self.srlgfile))
+        eq_(srlg.links["a"], {(1,2), (3,4)})
+        eq_(srlg.shared_links([(1,2), (2,4)]), {(1,2), (2,4), (3,4)})
+
+    def test_link_edges_table(self):
+        table = sr.link_edges_table()
+        ok_(sr.link_edges_table() is table)
+        eq_(table[(2,1)], ((1,2), (2,2100), (2100,1)))
+        ok_(table[(2,2100)] is table[(1,2)])
+        srlg = sr.SRLG(sr.read_srlg(self.srlgfile))
+        for label, links in srlg.links.items():
+            eq_(srlg.group_elms[label], GraphSet(dl.bidirectional_disjoint_elms(list(links))))
+        GraphSet.set_universe(dl.append_virtual_nodes())
+        ok_(sr.link_edges_table() is not table)
+
+    def test_disjoint_paths(self):
+        srlg = sr.SRLG(sr.read_srlg(self.srlgfile))
+        paths = dl.directed_paths(1, 4)
+        eq_(len(dl.bidirectional_disjoint_paths(paths, [(1,2), (2,4)])), 1)
+        eq_(len(srlg.disjoint_paths(paths, [(1,2), (2,4)])), 0)
+
+        paths = dl.directed_paths(2, 3)
+        disjoint = srlg.disjoint_paths(paths, [(2,3)])
+        eq_(sorted(sorted(p) for p in disjoint), [[(1,3), (2,2100), (2100,1)],
+                                                  [(2,4), (4,4300), (4300,3)]])
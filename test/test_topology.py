@@ -0,0 +1,68 @@
+"""
+date 2026.10.19
+branch master
+file test_topology.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+from proposal_packages.topology import MutableTopology
+
+class TestMutableTopology:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50)]
+
+    def setup(self):
+        self.topology = MutableTopology(self.edgelist)
+
+    def teardown(self):
+        pass
+
+    def test_remove_link(self):
+        eq_(len(self.topology.directed_paths(1, 4)), 4)
+        eq_(self.topology.cheapest_path(1, 4), ([(1,2), (2,4)], 50))
+        self.topology.remove_link(4, 2)
+        eq_(sorted(self.topology.successors(2)), [1, 3])
+        eq_(len(self.topology.directed_paths(1, 4)), 2)
+        eq_(self.topology.cheapest_path(1, 4), ([(1,3), (3,4)], 70))
+        eq_(len(self.topology.directed_paths(4, 1)), 2)
+
+    def test_add_link(self):
+        self.topology.remove_link(2, 4)
+        eq_(len(self.topology.directed_paths(1, 4)), 2)
+        self.topology.add_link(2, 4, 5)
+        eq_(len(self.topology.directed_paths(1, 4)), 4)
+        eq_(self.topology.cheapest_path(1, 4), ([(1,2), (2,4)], 15))
+        self.topology.add_link(1, 4, 1, 100)
+        eq_(len(self.topology.directed_paths(1, 4)), 5)
+        eq_(self.topology.cheapest_path(4, 1), ([(4,2), (2,1)], 15))
+
+    @raises(ValueError)
+    def test_add_existing_link(self):
+        self.topology.add_link(1, 2, 10)
+
+    def test_set_cost(self):
+        eq_(self.topology.cheapest_path(1, 4), ([(1,2), (2,4)], 50))
+        self.topology.set_cost(1, 3, 1)
+        self.topology.set_cost(2, 4, 100)
+        eq_(self.topology.cheapest_path(1, 4), ([(1,3), (3,4)], 51))
+        self.topology.set_cost(2, 4, 40)
+        eq_(self.topology.cheapest_path(1, 4), ([(1,2), (2,4)], 50))
+        eq_(self.topology.cheapest_path(4, 1), ([(4,2), (2,1)], 50))
+
+    def test_remove_node(self):
+        self.topology.remove_node(2)
+        eq_(sorted(self.topology.nodes()), [1, 3, 4])
+        eq_(self.topology.predecessors(2), [])
+        eq_(len(self.topology.directed_paths(1, 4)), 1)
+        eq_(self.topology.cheapest_path(1, 2), None)
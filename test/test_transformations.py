@@ -0,0 +1,83 @@
+"""
+date 2026.10.19
+branch master
+file test_transformations.py
+
+以下のグラフを使用する
+ただし，リンクは双方向とする
+1----2
+|   /|
+|  / |
+| /  |
+|/   |
+3----4----5
+"""
+
+import os
+import tempfile
+
+from nose.tools import ok_, eq_, raises, with_setup
+import proposal_packages.transformations as tr
+import proposal_packages.path_engine as pe
+
+class TestTransformations:
+
+    edgelist = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),(4,5,60),
+                (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50),(5,4,60)]
+    # 逆向きのリンクを含まない有向グラフ
+    one_way = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),(4,5,60),(5,1,70)]
+
+    def setup(self):
+        tr._decisions.clear()
+
+    def teardown(self):
+        tr._decisions.clear()
+
+    def test_applicable(self):
+        eq_(tr.applicable_transformations(self.edgelist),
+            ["one_virtual_node", "two_virtual_nodes"])
+        eq_(tr.applicable_transformations(self.one_way), ["two_virtual_nodes", "digraph"])
+
+    def test_same_paths(self):
+        for edgelist in (self.edgelist, self.one_way):
+            graph = pe.CSRGraph(edgelist)
+            for name in tr.applicable_transformations(edgelist):
+                finder = tr.DirectedPaths(edgelist, name)
+                for s in range(1, 6):
+                    for t in range(1, 6):
+                        if s == t:
+                            continue
+                        eq_(sorted(finder.original_paths(s, t)),
+                            sorted(pe.iter_simple_paths(graph, s, t)))
+
+    def test_trial(self):
+        results = tr.trial(self.edgelist, [(1,5),(5,1)])
+        eq_(sorted(results.keys()), ["one_virtual_node", "two_virtual_nodes"])
+        for result in results.values():
+            eq_(result["count"], 8)
+            ok_(result["size"] > 0)
+        ok_(results["one_virtual_node"]["size"] <= results["two_virtual_nodes"]["size"])
+
+    def test_choose(self):
+        eq_(tr.choose(self.edgelist, [(1,5),(5,1)]), "one_virtual_node")
+        ok_(tr.fingerprint(self.edgelist) in tr._decisions)
+        eq_(tr.DirectedPaths(self.edgelist).name, "one_virtual_node")
+
+    def test_cache_file(self):
+        fd, cache_file = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        os.remove(cache_file)
+        try:
+            name = tr.choose(self.one_way, cache_file=cache_file)
+            tr._decisions.clear()
+            tr.TRANSFORMATIONS, saved = [], tr.TRANSFORMATIONS
+            try:
+                eq_(tr.choose(self.one_way, cache_file=cache_file), name)
+            finally:
+                tr.TRANSFORMATIONS = saved
+        finally:
+            os.remove(cache_file)
+
+    @raises(ValueError)
+    def test_unknown(self):
+        tr.DirectedPaths(self.edgelist, "three_virtual_nodes")
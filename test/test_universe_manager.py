@@ -0,0 +1,73 @@
+"""
+date 2026.10.19
+branch master
+file test_universe_manager.py
+
+以下の2個のグラフを使用する
+ただし，リンクは双方向とする
+1----2    1----2
+|   /|    |    |
+|  / |    |    |
+| /  |    |    |
+|/   |    |    |
+3----4    3----4
+"""
+
+from nose.tools import ok_, eq_, raises, with_setup
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.allpairs as ap
+import proposal_packages.universe_manager as um
+
+class TestUniverseManager:
+
+    edgelist1 = [(1,2,10),(1,3,20),(2,3,30),(2,4,40),(3,4,50),
+                 (2,1,10),(3,1,20),(3,2,30),(4,2,40),(4,3,50)]
+    edgelist2 = [(1,2,10),(1,3,20),(2,4,40),(3,4,50),
+                 (2,1,10),(3,1,20),(4,2,40),(4,3,50)]
+
+    def setup(self):
+        self.t1 = um.register("t1", self.edgelist1)
+        self.t2 = um.register("t2", self.edgelist2)
+
+    def teardown(self):
+        um.unregister("t1")
+        um.unregister("t2")
+
+    def test_use(self):
+        with um.use(self.t1):
+            eq_(um.active(), self.t1)
+            eq_(len(self.t1.directed_paths(1, 4)), 4)
+            with um.use("t2"):
+                eq_(um.active(), self.t2)
+                eq_(len(self.t2.directed_paths(1, 4)), 2)
+                eq_(dl.edgelist, self.edgelist2)
+            eq_(um.active(), self.t1)
+            eq_(dl.edgelist, self.edgelist1)
+
+    @raises(ValueError)
+    def test_register_twice(self):
+        um.register("t1", self.edgelist1)
+
+    def test_switch_back(self):
+        paths = self.t1.directed_paths(1, 4)
+        universe = GraphSet.universe()
+        self.t2.directed_paths(1, 4)
+        eq_(um.active(), self.t2)
+        eq_(len(self.t1.load(("directed_paths", 1, 4))), 4)
+        eq_(GraphSet.universe(), universe)
+        eq_(sorted(self.t1.keys()), [("directed_paths", 1, 4)])
+
+    def test_external_set_universe(self):
+        self.t1.directed_paths(1, 4)
+        GraphSet.set_universe([(1,2), (2,3)])
+        eq_(um.activate(self.t1), self.t1)
+        eq_(self.t1.load(("directed_paths", 1, 4)), None)
+        eq_(len(self.t1.directed_paths(1, 4)), 4)
+
+    def test_topology_pool(self):
+        with um.TopologyPool([self.t1, "t2"]) as pool:
+            r1 = pool.submit("t1", ap.count_paths, 1, 4)
+            r2 = pool.submit("t2", ap.count_paths, 1, 4)
+            eq_((r1.get(), r2.get()), (4, 2))
+            eq_(pool.map("t2", ap.count_paths, [(1,4), (2,3)]), [2, 2])
@@ -0,0 +1,277 @@
+"""
+date 2026.10.19
+branch master
+file topology.py
+
+実験の途中でリンクやノードを追加・削除できるトポロジー
+
+directed_linkはグローバル変数edgelistからedges_table、仮想ノード、ユニバースを毎回作り直すので、
+リンクを1本変更するだけでもすべてのグラフセットを求め直す必要がある
+MutableTopologyは隣接関係と仮想ノードの対応を辞書で保持してO(次数)で更新し、
+変更したリンクに関係するキャッシュだけを無効にする
+
+
+# 動作概要
+* ユニバース
+  これまでに追加したすべてのリンクを含むユニバースを保持する
+  リンクを削除してもユニバースは設定し直さず、削除したリンクを通るパスを除外する
+  ユニバースにないリンクを追加したときだけ、次に問い合わせたときにユニバースを設定し直す
+* 有向パスのキャッシュ
+  * remove_link
+    キャッシュしたパス集合から削除したリンクを通るパスを除外する(ZDDの演算1回)
+  * add_link
+    新しいパスが増える可能性があるので、すべてのパス集合を無効にする
+  * set_cost
+    パス集合はリンクの重みに依存しないので無効にしない
+* 最小コストのパスのキャッシュ
+  * remove_link
+    最小コストのパスが削除したリンクを通るデマンドだけを無効にする
+  * set_cost
+    重みを大きくしたときは最小コストのパスがそのリンクを通るデマンドだけ、
+    小さくしたときはそのリンクを通るパスを持つデマンドだけを無効にする
+
+リンクは双方向とし、add_link, remove_linkは両方向をまとめて追加・削除する
+set_costは片方向の重みだけを変更する
+
+
+# 使い方
+topology = MutableTopology(edgelist)
+topology.directed_paths(1, 4)
+topology.remove_link(2, 4)
+topology.cheapest_path(1, 4)
+"""
+
+from collections import defaultdict
+
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+from proposal_packages.protection import ordered_path
+
+class MutableTopology:
+    """
+    MutableTopologyクラスは以下の属性を持つ
+    * costs
+      key: (i,j)
+      value: 現在のリンク(i,j)の重み
+    * succ
+      key: node
+      value: 流出リンクの終点ノードの集合
+    * pred
+      key: node
+      value: 流入リンクの始点ノードの集合
+    """
+
+    def __init__(self, edgelist):
+        """
+        arguments:
+        * edgelist(list)
+          重み付き辺のタプル(i,j,cost)を要素とするリスト
+          すべてのリンク(i,j)に対して逆向きのリンク(j,i)が存在すること
+        """
+        self.costs = {}
+        self.succ = defaultdict(set)
+        self.pred = defaultdict(set)
+        for i,j,cost in edgelist:
+            self.__add_direction(i, j, cost)
+        self.__encoding = None
+        self.__universe = None
+        self.__entry = {}
+        self.__metric = {}
+        self.__paths = {}
+        self.__cheapest = {}
+
+    def __add_direction(self, i, j, cost):
+        self.costs[(i,j)] = cost
+        self.succ[i].add(j)
+        self.pred[j].add(i)
+
+    def __remove_direction(self, i, j):
+        del self.costs[(i,j)]
+        self.succ[i].discard(j)
+        self.pred[j].discard(i)
+
+    def edgelist(self):
+        """
+        現在のリンクを重み付き辺のタプル(i,j,cost)のリストで返す
+        """
+        return [(i, j, cost) for (i,j),cost in self.costs.items()]
+
+    def nodes(self):
+        return [node for node in set(self.succ) | set(self.pred)
+                if self.succ[node] or self.pred[node]]
+
+    def successors(self, node):
+        return list(self.succ[node])
+
+    def predecessors(self, node):
+        return list(self.pred[node])
+
+    def _rebuild(self):
+        """
+        現在のリンクからユニバースを作り直す
+        """
+        self.__encoding = self.edgelist()
+        dl.read_edgelist(self.__encoding)
+        GraphSet.set_universe(dl.append_virtual_nodes())
+        self.__universe = GraphSet.universe()
+        self.__entry = {}
+        self.__metric = {}
+        for e1,e2 in dl.edges_table().values():
+            i, j = e1[0], e1[1]
+            v = dl.virtual_node_expression(j, i)
+            self.__entry[(i,j)] = (i,j)
+            self.__entry[(j,i)] = (j,v)
+            self.__metric[(i,j)] = e1[2]
+            self.__metric[(j,v)] = e2[2]
+            self.__metric[(v,i)] = 0
+        self.__paths = {}
+        self.__cheapest = {}
+
+    def _activate(self):
+        """
+        このトポロジーのユニバースを設定する
+        ほかのユニバースが設定されていたときはキャッシュしたグラフセットを破棄する
+        """
+        if self.__universe is None:
+            self._rebuild()
+            return
+        dl.read_edgelist(self.__encoding)
+        if GraphSet.universe() != self.__universe:
+            GraphSet.set_universe(self.__universe, traversal="as-is")
+            self.__paths = {}
+
+    def _family(self, i, j):
+        """
+        リンク(i,j)を双方向のいずれかの向きで通るパスを取り出すグラフセットを返す
+        """
+        return GraphSet([[self.__entry[(i,j)]], [self.__entry[(j,i)]]])
+
+    def _removed_links(self):
+        """
+        ユニバースにあるが現在は削除されているリンクをedges_tableのキーの向きで返す
+        """
+        return [(i,j) for i,j,cost in self.__encoding
+                if (i,j) not in self.costs and self.__entry[(i,j)] == (i,j)]
+
+    def metric(self):
+        """
+        ユニバースの辺の重みを返す
+        min_iterなどにそのまま渡せる
+        """
+        self._activate()
+        return self.__metric
+
+    def directed_paths(self, start_node, target_node):
+        """
+        有向パスのグラフセットを返す
+        一度求めたものはキャッシュしておく
+        スタートノードかターゲットノードが削除されているときは空のグラフセットを返す
+        """
+        self._activate()
+        key = (start_node, target_node)
+        if not (self.succ[start_node] and self.pred[target_node]):
+            return GraphSet()
+        if key not in self.__paths:
+            paths = dl.directed_paths(start_node, target_node)
+            for i,j in self._removed_links():
+                paths = paths.excluding(self._family(i, j))
+            self.__paths[key] = paths
+        return self.__paths[key]
+
+    def cheapest_path(self, start_node, target_node):
+        """
+        最小コストのパスを返す
+        一度求めたものはキャッシュしておく
+
+        returns:
+        * (path, cost)(tuple)
+          pathはスタートノードから順に並べた元のグラフの辺のリスト
+          パスがないときはNone
+        """
+        key = (start_node, target_node)
+        if key not in self.__cheapest:
+            cheapest = None
+            metric = self.metric()
+            for path in self.directed_paths(start_node, target_node).min_iter(metric):
+                cheapest = (ordered_path(dl.original_path(path), start_node),
+                            dl.total_cost(metric, path))
+                break
+            self.__cheapest[key] = cheapest
+        return self.__cheapest[key]
+
+    def add_link(self, i, j, cost, reverse_cost=None):
+        """
+        リンク(i,j),(j,i)を追加する
+
+        arguments:
+        * i(node label)
+        * j(node label)
+        * cost(int or float)
+          リンク(i,j)の重み
+        * reverse_cost(int or float, optional)
+          リンク(j,i)の重み。指定しないときはcostとする
+        """
+        if (i,j) in self.costs:
+            raise ValueError("link ({}, {}) already exists".format(i, j))
+        if reverse_cost is None:
+            reverse_cost = cost
+        self.__add_direction(i, j, cost)
+        self.__add_direction(j, i, reverse_cost)
+        if self.__universe is None:
+            return
+        if (i,j) not in self.__entry:
+            self.__universe = None
+            return
+        self.__set_metric(i, j, cost)
+        self.__set_metric(j, i, reverse_cost)
+        self.__paths = {}
+        self.__cheapest = {}
+
+    def remove_link(self, i, j):
+        """
+        リンク(i,j),(j,i)を削除する
+        """
+        self.__remove_direction(i, j)
+        self.__remove_direction(j, i)
+        if self.__universe is None:
+            return
+        if self.__paths:
+            self._activate()
+            family = self._family(i, j)
+            for key, paths in list(self.__paths.items()):
+                self.__paths[key] = paths.excluding(family)
+        for key, cheapest in list(self.__cheapest.items()):
+            if cheapest is not None and ((i,j) in cheapest[0] or (j,i) in cheapest[0]):
+                del self.__cheapest[key]
+
+    def set_cost(self, i, j, cost):
+        """
+        リンク(i,j)の重みを変更する
+        逆向きのリンク(j,i)の重みは変更しない
+        """
+        old = self.costs[(i,j)]
+        self.costs[(i,j)] = cost
+        if self.__universe is None:
+            return
+        self.__set_metric(i, j, cost)
+        if cost > old:
+            for key, cheapest in list(self.__cheapest.items()):
+                if cheapest is not None and (i,j) in cheapest[0]:
+                    del self.__cheapest[key]
+        elif cost < old:
+            self._activate()
+            entry = self.__entry[(i,j)]
+            for key in list(self.__cheapest):
+                paths = self.__paths.get(key)
+                if paths is None or paths.including(entry):
+                    del self.__cheapest[key]
+
+    def __set_metric(self, i, j, cost):
+        self.__metric[self.__entry[(i,j)]] = cost
+
+    def remove_node(self, node):
+        """
+        ノードとノードに接続するリンクをすべて削除する
+        """
+        for j in list(self.succ[node]):
+            self.remove_link(node, j)
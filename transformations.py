@@ -0,0 +1,287 @@
+"""
+date 2026.10.19
+branch master
+file transformations.py
+
+有向リンクをGraphillionで扱うための3種類の変換を同じインターフェースで使えるようにし、
+トポロジーごとに最も安い変換を選ぶ
+
+* "one_virtual_node"
+  directed_link.py。逆向きのリンクにだけ仮想ノードを1個追加する
+  すべてのリンク(i,j)に対して逆向きのリンク(j,i)が存在するグラフで使える
+* "two_virtual_nodes"
+  directed_link_two_virtual_nodes.py。すべてのリンクに仮想ノードを追加する
+  ノードが0以上の整数のグラフで使える
+* "digraph"
+  directed_graph.py。有向グラフのリンクをそのままユニバースとする
+  逆向きのリンクの組(i,j),(j,i)を含まないグラフで使える
+
+
+# 動作概要
+1. 使える変換ごとに、サンプルのデマンドについてdirected_pathsを実行する(trial)
+   ZDDの大きさ(dumps()の行数)の合計と計算時間の合計を記録する
+2. metricが最も小さい変換を選ぶ
+3. 選んだ変換はトポロジーのfingerprintをキーとしてキャッシュする
+   cache_fileを指定したときはJSONファイルにも保存し、次回以降はtrialを行わない
+   fingerprintはリンクの(i,j)の組から求め、重みは含めない
+
+
+# 使い方
+finder = DirectedPaths(edgelist)                  # 変換を自動で選ぶ
+finder = DirectedPaths(edgelist, "two_virtual_nodes")
+paths = finder.directed_paths(s, t)               # 変換後のユニバースのGraphSet
+paths = finder.original_paths(s, t)               # 元のグラフのパスのリスト
+"""
+
+from itertools import permutations
+import hashlib
+import json
+import os
+import random
+import time
+
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+import proposal_packages.directed_link_two_virtual_nodes as dl2
+import proposal_packages.directed_graph as dg
+from proposal_packages.protection import ordered_path
+
+# key: fingerprint
+# value: 変換の名前
+_decisions = {}
+
+class OneVirtualNode:
+    name = "one_virtual_node"
+
+    def applicable(self, edgelist):
+        links = {(i,j) for i,j,cost in edgelist}
+        return all((j,i) in links for i,j in links)
+
+    def prepare(self, edgelist):
+        dl.read_edgelist(edgelist)
+
+    def universe(self):
+        return dl.append_virtual_nodes()
+
+    def directed_paths(self, start_node, target_node):
+        return dl.directed_paths(start_node, target_node)
+
+    def original_path(self, path):
+        return dl.original_path(path)
+
+class TwoVirtualNodes:
+    name = "two_virtual_nodes"
+
+    def applicable(self, edgelist):
+        return all(isinstance(node, int) and node >= 0
+                   for i,j,cost in edgelist for node in (i, j))
+
+    def prepare(self, edgelist):
+        dl2.read_edgelist(edgelist)
+
+    def universe(self):
+        return dl2.append_virtual_nodes()
+
+    def directed_paths(self, start_node, target_node):
+        return dl2.directed_paths(start_node, target_node)
+
+    def original_path(self, path):
+        return dl2.original_path(path)
+
+class Digraph:
+    name = "digraph"
+
+    def __init__(self):
+        self.graph = None
+        self.links = None
+
+    def applicable(self, edgelist):
+        links = {(i,j) for i,j,cost in edgelist}
+        return not any((j,i) in links for i,j in links)
+
+    def prepare(self, edgelist):
+        if self.graph is None:
+            self.graph = dg.EdgeArray(edgelist)
+            self.links = set(self.graph.edges())
+
+    def universe(self):
+        return dg.universe(self.graph)
+
+    def directed_paths(self, start_node, target_node):
+        return dg.directed_paths(self.graph, start_node, target_node)
+
+    def original_path(self, path):
+        return [(i,j) if (i,j) in self.links else (j,i) for i,j in path]
+
+TRANSFORMATIONS = [OneVirtualNode, TwoVirtualNodes, Digraph]
+
+def fingerprint(edgelist):
+    """
+    トポロジーのfingerprintを返す
+    """
+    h = hashlib.sha1()
+    for i,j in sorted({(i,j) for i,j,cost in edgelist}):
+        h.update(repr((i,j)).encode("utf-8"))
+    return h.hexdigest()
+
+def transformation(name):
+    """
+    名前に対応する変換を返す
+    """
+    for cls in TRANSFORMATIONS:
+        if cls.name == name:
+            return cls()
+    raise ValueError("unknown transformation {}".format(name))
+
+def applicable_transformations(edgelist):
+    """
+    edgelistに使える変換の名前のリストを返す
+    """
+    return [cls.name for cls in TRANSFORMATIONS if cls().applicable(edgelist)]
+
+def sample_demands(edgelist, sample_size, seed=0):
+    """
+    trialに使うデマンドを無作為に選ぶ
+    """
+    nodes = sorted({i for i,j,cost in edgelist} | {j for i,j,cost in edgelist})
+    demands = list(permutations(nodes, 2))
+    return random.Random(seed).sample(demands, min(sample_size, len(demands)))
+
+def trial(edgelist, demands, names=None):
+    """
+    各変換でデマンドのdirected_pathsを実行し、ZDDの大きさと計算時間を記録する
+
+    arguments:
+    * edgelist(list)
+    * demands(list)
+    * names(list, optional)
+      試す変換の名前のリスト。指定しないときは使えるものすべて
+
+    returns:
+    * results(dict)
+      key: 変換の名前
+      value: {"size": dumps()の行数の合計, "time": 計算時間[s]の合計, "count": パスの本数の合計}
+    """
+    if names is None:
+        names = applicable_transformations(edgelist)
+    results = {}
+    for name in names:
+        t = transformation(name)
+        started = time.time()
+        t.prepare(edgelist)
+        GraphSet.set_universe(t.universe())
+        size, count = 0, 0
+        for s,d in demands:
+            paths = t.directed_paths(s, d)
+            size += len(paths.dumps().splitlines())
+            count += paths.len()
+        results[name] = {"size": size, "time": time.time() - started, "count": count}
+    return results
+
+def _load_decisions(cache_file):
+    if cache_file is None or not os.path.exists(cache_file):
+        return {}
+    with open(cache_file) as f:
+        return json.load(f)
+
+def _save_decision(cache_file, fp, name):
+    decisions = _load_decisions(cache_file)
+    decisions[fp] = name
+    tmp = "{}.{}.tmp".format(cache_file, os.getpid())
+    with open(tmp, "w") as f:
+        json.dump(decisions, f)
+    os.replace(tmp, cache_file)
+
+def choose(edgelist, demands=None, sample_size=5, metric="size", cache_file=None):
+    """
+    edgelistに最も安い変換を選ぶ
+
+    arguments:
+    * edgelist(list)
+    * demands(list, optional)
+      trialに使うデマンド。指定しないときはsample_size個を無作為に選ぶ
+    * sample_size(int, optional)
+    * metric(string, optional)
+      "size"または"time"
+    * cache_file(string, optional)
+      選んだ変換を保存するJSONファイル
+
+    returns:
+    * name(string)
+    """
+    fp = fingerprint(edgelist)
+    if fp not in _decisions:
+        saved = _load_decisions(cache_file)
+        if fp in saved:
+            _decisions[fp] = saved[fp]
+    if fp in _decisions:
+        return _decisions[fp]
+
+    names = applicable_transformations(edgelist)
+    if len(names) == 1:
+        name = names[0]
+    else:
+        if demands is None:
+            demands = sample_demands(edgelist, sample_size)
+        results = trial(edgelist, demands, names)
+        name = min(names, key=lambda n: (results[n][metric], results[n]["time"]))
+    _decisions[fp] = name
+    if cache_file is not None:
+        _save_decision(cache_file, fp, name)
+    return name
+
+class DirectedPaths:
+    """
+    DirectedPathsクラスは以下の属性を持つ
+    * edgelist
+    * name
+      使用する変換の名前
+    * transformation
+      変換のオブジェクト
+    * universe
+      最初に設定したときのGraphSet.universe()
+    """
+
+    def __init__(self, edgelist, name="auto", **options):
+        """
+        arguments:
+        * edgelist(list)
+        * name(string, optional)
+          "auto"のときはchoose(edgelist, **options)で選ぶ
+        """
+        if name == "auto":
+            name = choose(edgelist, **options)
+        self.edgelist = edgelist
+        self.name = name
+        self.transformation = transformation(name)
+        self.universe = None
+
+    def activate(self):
+        """
+        変換後のユニバースを設定する
+        """
+        self.transformation.prepare(self.edgelist)
+        if self.universe is None:
+            GraphSet.set_universe(self.transformation.universe())
+            self.universe = GraphSet.universe()
+        elif GraphSet.universe() != self.universe:
+            GraphSet.set_universe(self.universe, traversal="as-is")
+
+    def directed_paths(self, start_node, target_node):
+        """
+        変換後のユニバースで有向パスのグラフセットを返す
+        """
+        self.activate()
+        return self.transformation.directed_paths(start_node, target_node)
+
+    def original_paths(self, start_node, target_node):
+        """
+        有向パスを元のグラフのパスのリストで返す
+        返り値はどの変換でも同じになる
+
+        returns:
+        * paths(list)
+          スタートノードから順に並べた元のグラフの辺のリストを要素とするリスト
+        """
+        return [ordered_path(self.transformation.original_path(path), start_node)
+                for path in self.directed_paths(start_node, target_node)]
@@ -0,0 +1,259 @@
+"""
+date 2026.10.19
+branch master
+file universe_manager.py
+
+1個のプロセスで複数のトポロジーを扱えるようにする
+
+GraphSet.set_universeはプロセス全体で1個のユニバースしか持てず、
+directed_link, directed_graph, graphillion_utilsは現在のユニバースを前提に動作する
+このモジュールでは各トポロジーとユニバースを対応づけ、トポロジーが切り替わったときだけ
+ユニバースを設定し直す
+
+
+# 動作概要
+* Topologyは以下を保持する
+  * edgelist
+  * 最初に有効にしたときのGraphSet.universe()
+    2回目以降はtraversal="as-is"でこの順序のまま設定するので、辺の並べ替えを行わずに済み、
+    dumps()で直列化したグラフセットもそのまま読み込める
+  * 名前をつけて保存したグラフセット
+    トポロジーが無効になるときにdumps()で直列化し、有効になったときにloads()で復元する
+* activate(topology)は有効なトポロジーが変わるときだけユニバースを設定し直す
+  このモジュールを通さずにGraphSet.set_universeが実行されていた場合(e.g. MultiDiGraph)は
+  保存したグラフセットを破棄して設定し直す
+* with use(topology):で一時的にトポロジーを有効にする
+  ブロックを抜けると直前に有効だったトポロジーに戻す
+* TopologyPoolはトポロジーごとに1個のワーカープロセスを持ち、
+  複数のトポロジーへの問い合わせを同時に処理する
+
+
+# 使い方
+cost239 = register("cost239", Dat(cost239_dat).cost)
+nsfnet = register("nsfnet", Dat(nsfnet_dat).cost)
+with use(cost239):
+    paths = cost239.directed_paths(0, 10)
+with use(nsfnet):
+    paths = nsfnet.directed_paths(0, 13)
+"""
+
+from contextlib import contextmanager
+from multiprocessing import Pool
+
+from graphillion import GraphSet
+import proposal_packages.directed_link as dl
+
+_registry = {}
+_active = None
+
+class Topology:
+    """
+    Topologyクラスは以下の属性を持つ
+    * name
+    * edgelist
+    * universe
+      最初に有効にしたときのGraphSet.universe()。一度も有効にしていなければNone
+    """
+
+    def __init__(self, name, edgelist):
+        self.name = name
+        self.edgelist = edgelist
+        self.universe = None
+        self.__graphsets = {}
+        self.__dumped = {}
+
+    def _activate(self):
+        """
+        このトポロジーのユニバースを設定し、保存したグラフセットを復元する
+        """
+        dl.read_edgelist(self.edgelist)
+        if self.universe is None:
+            GraphSet.set_universe(dl.append_virtual_nodes())
+            self.universe = GraphSet.universe()
+        else:
+            GraphSet.set_universe(self.universe, traversal="as-is")
+        for key, data in self.__dumped.items():
+            self.__graphsets[key] = GraphSet.loads(data)
+        self.__dumped = {}
+
+    def _discard(self):
+        """
+        保存したグラフセットを破棄する
+        ユニバースが外部で設定し直されたときに使う
+        """
+        self.__graphsets = {}
+        self.__dumped = {}
+
+    def _suspend(self):
+        """
+        保存したグラフセットを直列化する
+        """
+        for key, graphset in self.__graphsets.items():
+            self.__dumped[key] = graphset.dumps()
+        self.__graphsets = {}
+
+    def is_active(self):
+        return _active is self
+
+    def store(self, key, graphset):
+        """
+        グラフセットに名前をつけて保存する
+        このトポロジーが有効なときに実行すること
+        """
+        if not self.is_active():
+            raise ValueError("topology {} is not active".format(self.name))
+        self.__graphsets[key] = graphset
+
+    def load(self, key):
+        """
+        保存したグラフセットを返す
+        保存していないときはNoneを返す
+        """
+        activate(self)
+        return self.__graphsets.get(key)
+
+    def keys(self):
+        return list(self.__graphsets.keys()) + list(self.__dumped.keys())
+
+    def directed_paths(self, start_node, target_node):
+        """
+        このトポロジーを有効にしてdirected_link.directed_pathsを実行する
+        結果は保存しておき、2回目以降は保存したものを返す
+        """
+        key = ("directed_paths", start_node, target_node)
+        paths = self.load(key)
+        if paths is None:
+            paths = dl.directed_paths(start_node, target_node)
+            self.store(key, paths)
+        return paths
+
+def register(name, edgelist):
+    """
+    トポロジーを登録する
+
+    arguments:
+    * name(string)
+    * edgelist(list)
+
+    returns:
+    * topology(Topology)
+    """
+    if name in _registry:
+        raise ValueError("topology {} is already registered".format(name))
+    _registry[name] = Topology(name, edgelist)
+    return _registry[name]
+
+def unregister(name):
+    """
+    トポロジーの登録を取り消す
+    """
+    global _active
+    topology = _registry.pop(name)
+    if _active is topology:
+        _active = None
+
+def get(name):
+    """
+    登録したトポロジーを返す
+    """
+    return _registry[name]
+
+def active():
+    """
+    有効なトポロジーを返す
+    """
+    return _active
+
+def activate(topology):
+    """
+    トポロジーを有効にする
+    すでに有効なときは何もしない
+
+    arguments:
+    * topology(Topology or string)
+    """
+    global _active
+    if not isinstance(topology, Topology):
+        topology = _registry[topology]
+    if _active is topology:
+        if GraphSet.universe() == topology.universe:
+            return topology
+        # このモジュールを通さずにユニバースが設定し直された
+        topology._discard()
+    elif _active is not None:
+        _active._suspend()
+    topology._activate()
+    _active = topology
+    return topology
+
+@contextmanager
+def use(topology):
+    """
+    with文の中でトポロジーを有効にする
+    ブロックを抜けると直前に有効だったトポロジーに戻す
+
+    arguments:
+    * topology(Topology or string)
+    """
+    previous = _active
+    topology = activate(topology)
+    try:
+        yield topology
+    finally:
+        if previous is not None and previous is not topology and previous.name in _registry:
+            activate(previous)
+
+def _init_worker(edgelist, universe):
+    dl.read_edgelist(edgelist)
+    if universe is None:
+        GraphSet.set_universe(dl.append_virtual_nodes())
+    else:
+        GraphSet.set_universe(universe, traversal="as-is")
+
+class TopologyPool:
+    """
+    トポロジーごとに1個のワーカープロセスを持つプール
+    各ワーカーは初期化時にトポロジーのユニバースを設定するので、
+    異なるトポロジーへの問い合わせを同時に処理できる
+
+    e.g.
+    with TopologyPool([cost239, nsfnet, jpn48]) as pool:
+        r1 = pool.submit("cost239", allpairs.count_paths, 0, 10)
+        r2 = pool.submit("jpn48", allpairs.count_paths, 0, 47)
+        print(r1.get(), r2.get())
+    """
+
+    def __init__(self, topologies):
+        self.pools = {}
+        for topology in topologies:
+            if not isinstance(topology, Topology):
+                topology = _registry[topology]
+            self.pools[topology.name] = Pool(1, initializer=_init_worker,
+                                             initargs=(topology.edgelist, topology.universe))
+
+    def submit(self, name, func, *args):
+        """
+        トポロジーnameのワーカーでfunc(*args)を実行する
+        funcはpickleできる関数とする
+
+        returns:
+        * result(multiprocessing.pool.AsyncResult)
+        """
+        return self.pools[name].apply_async(func, args)
+
+    def map(self, name, func, iterable):
+        """
+        トポロジーnameのワーカーでiterableの各要素についてfunc(*args)を実行する
+        """
+        return self.pools[name].starmap(func, iterable)
+
+    def close(self):
+        for pool in self.pools.values():
+            pool.close()
+            pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()